@@ -0,0 +1,36 @@
+"""
+Number of points and chord error of circles with the fixed angle resolution against the
+adaptive resolution from a maximum chord error (see set_arc_max_error), and a check that the
+adaptive resolution never gives more points than the fixed one.
+
+    python -m benchmarks.arc_resolution [max_error ...]
+"""
+import sys
+
+import numpy as np
+
+from pylayout.components.basic.polygon import regular_polygon
+
+RADII = [1, 3, 7, 10, 25, 50, 100]
+
+def chord_error(points: np.ndarray, radius: float) -> float:
+    # distance from the middle of the chords to the circle
+    middles = (points[1:] + points[:-1]) / 2
+    return radius - np.hypot(*middles.T).min()
+
+def main():
+    max_errors = [float(e) for e in sys.argv[1:]] or [1e-3, 5e-3, 20e-3]
+
+    header = f"{'radius [um]':>12} {'fixed':>14}" + "".join(f" {f'{e*1e3:g} nm':>14}" for e in max_errors)
+    print(header)
+    print(f"{'':>12}" + " {:>14}".format("points / err") * (len(max_errors) + 1))
+    for radius in RADII:
+        row = f"{radius:>12}"
+        for max_error in [None] + max_errors:
+            points = regular_polygon(0, 0, radius, 2*np.pi, max_error=max_error)
+            row += f" {len(points):>6} / {chord_error(points, radius)*1e3:>5.2f}"
+            assert len(points) <= len(regular_polygon(0, 0, radius, 2*np.pi)), (radius, max_error)
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Instance records and file size of repeated placements, one reference per copy against the
+cell arrays of pylayout.array: the squares of a dice marker, a marker frame around a die, a
+column of die markers and a row of pads.
+
+    python -m benchmarks.arrays
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import gdsfactory as gf
+
+from cornerstone import LAYER, metal_pad
+from pylayout.array import add_placements
+from pylayout.components import dice_marker
+
+def cases():
+    square = gf.components.rectangle(size=(20, 20), centered=True, layer=LAYER.METAL)
+    marker = dice_marker(layer=LAYER.METAL)
+    pad = gf.get_component(metal_pad)
+    # positions of the copies in um
+    frame = np.concatenate([
+        np.column_stack((np.arange(0, 20000, 1200), np.full(17, y))) for y in (0, 10000)
+    ] + [
+        np.column_stack((np.full(8, x), np.arange(1200, 10000, 1200))) for x in (0, 20000)
+    ])
+    return [
+        ("marker squares", square, np.stack(np.meshgrid(np.arange(10, 820, 200), 300.0 * np.arange(200)), axis=-1).reshape(-1, 2)),
+        ("marker frame", marker, frame),
+        ("marker column", marker, np.column_stack((np.zeros(40), -530.0 * np.arange(40)))),
+        ("pad rows", pad, np.array([(100.0 * i, 300.0 * j) for j in range(50) for i in range(5)])),
+    ]
+
+def build(component, positions, arrays: bool) -> gf.Component:
+    c = gf.Component()
+    if arrays:
+        add_placements(c, component, positions)
+    else:
+        for position in positions:
+            c.add_ref(component).dmove(tuple(position))
+    return c
+
+def main():
+    print(f"{'case':>16} {'copies':>7} {'refs':>6} {'arrays':>7} {'gds refs [kB]':>14} {'gds arrays [kB]':>16} {'oas refs [kB]':>14} {'oas arrays [kB]':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, component, positions in cases():
+            row = []
+            sizes = {}
+            for arrays in (False, True):
+                c = build(component, positions, arrays)
+                row.append(len(list(c.insts)))
+                for suffix, fmt in (("gds", "GDS2"), ("oas", "OASIS")):
+                    options = gf.kdb.SaveLayoutOptions()
+                    options.format = fmt
+                    filepath = Path(tmp) / f"{name}.{suffix}"
+                    c.write(filepath, save_options=options)
+                    sizes[suffix, arrays] = filepath.stat().st_size / 1024
+            print(
+                f"{name:>16} {len(positions):>7} {row[0]:>6} {row[1]:>7} {sizes['gds', False]:>14.1f} {sizes['gds', True]:>16.1f} "
+                f"{sizes['oas', False]:>14.1f} {sizes['oas', True]:>16.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
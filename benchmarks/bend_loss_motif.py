@@ -0,0 +1,67 @@
+"""
+Bend loss structures with many rings, extruded as one path per structure (default) and with
+the 360 degree bend as one cell array (motif=True). Reports the build time, the stored
+vertices, the file size and the xor of the merged geometry.
+
+    python -m benchmarks.bend_loss_motif [radius]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import gdsfactory as gf
+
+import designs.test_structures.bends as bends
+from designs.test_structures.bends import bend_loss, bend_loss_pn
+
+def build(func: callable, radius: float, no_of_rings: list, motif: bool) -> gf.Component:
+    # same order of the structures for both modes
+    bends.rng = np.random.default_rng(0)
+    c = gf.Component()
+    for i, structure in enumerate(func(radius, np.array(no_of_rings), motif=motif)):
+        ref = c.add_ref(structure)
+        ref.dymin = 150 * i
+    return c
+
+def _geometry(c: gf.Component) -> dict:
+    layout = c.kcl.layout
+    return {layer: gf.kdb.Region(c.begin_shapes_rec(layer)).merged() for layer in layout.layer_indexes()}
+
+def _vertices(c: gf.Component) -> int:
+    # vertices stored in the file: every cell of the hierarchy once
+    layout = c.kcl.layout
+    count = 0
+    for index in [c.cell_index()] + list(c._kdb_cell.called_cells()):
+        for layer in layout.layer_indexes():
+            count += sum(shape.polygon.num_points() for shape in layout.cell(index).shapes(layer).each() if shape.polygon)
+    return count
+
+def _size(c: gf.Component) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "bend_loss.gds"
+        c.write(filepath)
+        return filepath.stat().st_size
+
+def main():
+    radius = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    build(bend_loss, radius, [1], False)  # warm up the PDK and the grating coupler
+
+    print(f"{'structure':>12} {'rings':>6} {'mode':>7} {'build [s]':>10} {'vertices':>10} {'GDS [MB]':>9} {'xor [um2]':>10}")
+    for func in (bend_loss, bend_loss_pn):
+        for no_of_rings in ([10, 20], [50, 100]):
+            dies = {}
+            for motif in (False, True):
+                start = time.perf_counter()
+                c = dies[motif] = build(func, radius, no_of_rings, motif)
+                elapsed = time.perf_counter() - start
+                xor = sum((region ^ _geometry(dies[False]).get(layer, gf.kdb.Region())).area() for layer, region in _geometry(c).items())
+                print(
+                    f"{func.__name__:>12} {max(no_of_rings):>6} {'motif' if motif else 'path':>7} {elapsed:>10.2f} "
+                    f"{_vertices(c):>10} {_size(c)/1024**2:>9.2f} {xor * c.kcl.dbu**2:>10.4f}"
+                )
+
+if __name__ == "__main__":
+    main()
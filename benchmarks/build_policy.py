@@ -0,0 +1,100 @@
+"""
+Die size and write time for each build policy (see pylayout.build). Every policy is built in
+a fresh interpreter, as cells are cached by name.
+
+The die follows the RAMZI integration layout: for two ring radii and six gaps each, a column
+with a PN ring, a ring with heater and filament pads and a reference straight, all with
+grating couplers, plus the dice marker columns on both sides.
+
+    python -m benchmarks.build_policy [policy ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+DESIGN_VARS = [
+    (7, [0.2, 0.23, 0.25, 0.28, 0.3, 0.32], 0.7, 5.6, None),
+    # the RAMZI die uses dist_pn_to_wg=0.79 here, which make_even_number cannot handle yet
+    (10, [0.3, 0.35, 0.38, 0.4, 0.42, 0.45], 0.78, 7.5, None),
+]
+
+def build_die():
+    import gdsfactory as gf
+    from cornerstone import LAYER, cs_gc_silicon_1550nm, pn_450_with_metal, pn_450_with_metal_and_heater, rib_450
+    from designs.test_structures import single_ring_filament_gsgsg, straight
+    from designs.test_structures.pnring import single_ring_pn_with_gc
+    from pylayout.components import add_norm_wg, attach_grating_coupler, dice_marker, ring
+
+    spacing = 30
+    c = gf.Component()
+    xmin = 0
+    for radius, gaps, heater_percent, dist_y, dist_pn_to_wg in DESIGN_VARS:
+        ymax = 0
+        for gap in gaps:
+            kwargs = dict(wg=rib_450, radius=radius, gap=gap, int_angle=20, dist_y=dist_y, dist_pn_to_wg=dist_pn_to_wg, max_length=550)
+            pn_ring = single_ring_pn_with_gc(rc=partial(ring, pn=pn_450_with_metal, **kwargs))
+            heater_ring = single_ring_filament_gsgsg(r=partial(ring, pn=pn_450_with_metal_and_heater, heater_percent=heater_percent, **kwargs))
+            heater_ring = attach_grating_coupler(heater_ring, cs_gc_silicon_1550nm, ["o1", "o2"])
+            heater_ring = add_norm_wg(heater_ring, cs_gc_silicon_1550nm, rib_450, rpos=-40, sides="N")
+            reference = straight(length=500, gc=cs_gc_silicon_1550nm, cs=rib_450)
+
+            x = xmin
+            for com in [pn_ring, heater_ring, reference]:
+                ref = c.add_ref(com)
+                ref.dxmin, ref.dymax = x, ymax
+                x = ref.dxmax + spacing
+            ymax = c.dymin - spacing
+        xmin = c.dxmax + spacing
+
+    marker = dice_marker(layer=LAYER.METAL)
+    for x in [c.dxmin - 20 - marker.dxsize, c.dxmax + 20]:
+        for y in range(int(c.dymin), int(c.dymax), 500):
+            ref = c.add_ref(marker)
+            ref.dxmin, ref.dymin = x, y
+    return c
+
+def _run(policy: str) -> dict:
+    # runs inside the child interpreter
+    import gdsfactory as gf
+    from pylayout.build import set_build_policy
+
+    set_build_policy(policy)
+    start = time.perf_counter()
+    c = build_die()
+    result = {"policy": policy, "build [s]": time.perf_counter() - start}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix, fmt in (("gds", "GDS2"), ("oas", "OASIS")):
+            filepath = Path(tmp) / f"die.{suffix}"
+            options = gf.kdb.SaveLayoutOptions()
+            options.format = fmt
+            start = time.perf_counter()
+            c.write(filepath, save_options=options)
+            result[f"write {suffix} [s]"] = time.perf_counter() - start
+            result[f"{suffix} [MB]"] = filepath.stat().st_size / 1024**2
+    result["cells"] = len(list(c.called_cells())) + 1
+    return result
+
+def run(policy: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    code = f"import json; from benchmarks.build_policy import _run; print(json.dumps(_run({policy!r})))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    policies = sys.argv[1:] or ["flatten", "auto", "keep"]
+    results = [run(policy) for policy in policies]
+    keys = list(results[0])
+    print(" | ".join(f"{key:>14}" for key in keys))
+    for result in results:
+        print(" | ".join(f"{value:>14.3f}" if isinstance(value, float) else f"{value:>14}" for value in result.values()))
+
+if __name__ == "__main__":
+    main()
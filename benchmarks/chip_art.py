@@ -0,0 +1,67 @@
+"""
+Chip art benchmark: per-pixel components (previous implementation) against the
+run-length merged rectangles of draw_chip_art_from_image.
+
+    python -m benchmarks.chip_art [size]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+import gdsfactory as gf
+
+from pylayout.components import draw_chip_art_from_image
+from pylayout.components.advanced.chip_art import _load_image
+
+def draw_chip_art_per_pixel(filepath: Path, threshold: int=200, size: tuple=None, layer=(0, 0)) -> gf.Component:
+    # previous implementation, one component per black pixel
+    image_array = _load_image(filepath, threshold, size)
+    rows, cols = image_array.shape
+
+    c = gf.Component()
+    for row in range(rows):
+        for col in range(cols):
+            temp = gf.Component()
+            if image_array[row, col] == 0:
+                temp.add_polygon([(0,0),(0,1),(1,1),(1,0)], layer=layer)
+                c.add_ref(temp).dmove([col, rows - row])
+
+    c.flatten()
+    return c
+
+def make_logo(path: Path, size: int) -> None:
+    image = Image.new("L", (size, size), 255)
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((size*0.1, size*0.1, size*0.9, size*0.9), fill=0)
+    draw.ellipse((size*0.25, size*0.25, size*0.75, size*0.75), fill=255)
+    draw.rectangle((size*0.45, size*0.05, size*0.55, size*0.95), fill=0)
+    rng = np.random.default_rng(0)
+    for x, y in rng.integers(0, size, (size // 5, 2)):
+        draw.point((int(x), int(y)), fill=0)
+    image.save(path)
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    layer = (1, 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "logo.png"
+        make_logo(path, size)
+
+        results = {}
+        for name, func in (("per pixel", draw_chip_art_per_pixel), ("merged", draw_chip_art_from_image.__wrapped__)):
+            start = time.perf_counter()
+            c = func(path, size=None, layer=layer)
+            elapsed = time.perf_counter() - start
+            region = gf.kdb.Region(c.begin_shapes_rec(gf.get_layer(layer)))
+            vertices = sum(polygon.num_points() for polygon in region.each())
+            results[name] = region
+            print(f"{name:>10}: {elapsed:8.3f} s, {region.count():8d} polygons, {vertices:8d} vertices")
+
+        xor = results["per pixel"] ^ results["merged"]
+        print(f"{size}x{size} image, geometry identical: {xor.is_empty()}")
+
+if __name__ == "__main__":
+    main()
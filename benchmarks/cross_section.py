@@ -0,0 +1,68 @@
+"""
+gf.get_cross_section on the cornerstone specs with and without the memoized cross-section
+functions (pylayout.cross_section.memoize_cross_section), and a check of the keys of
+unhashable arguments.
+
+    python -m benchmarks.cross_section [n]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+
+from cornerstone import filament, heater_450, pn_450_with_metal, pn_450_with_metal_and_heater, rib_450
+from pylayout.cross_section import XS_CACHE
+from pylayout.cross_section.memo import spec_key
+
+SPECS = {
+    "rib_450": rib_450,
+    "filament": filament,
+    "heater_450": heater_450,
+    "pn_450_with_metal": pn_450_with_metal,
+    "pn_450_with_metal_and_heater": pn_450_with_metal_and_heater,
+}
+
+def _time(spec, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        gf.get_cross_section(spec)
+    return (time.perf_counter() - start) / n
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print(f"{'spec':>30} {'built [us]':>11} {'memoized [us]':>14} {'same object':>12}")
+    for name, spec in SPECS.items():
+        # the wrapped function of the partial rebuilds the cross-section every time
+        unwrapped = spec
+        while hasattr(unwrapped, "func"):
+            unwrapped = unwrapped.func
+        built = _time(lambda: unwrapped.__wrapped__(**spec.keywords), n)
+        memoized = _time(spec, n)
+        same = gf.get_cross_section(spec) is gf.get_cross_section(spec)
+        print(f"{name:>30} {built*1e6:>11.1f} {memoized*1e6:>14.1f} {str(same):>12}")
+
+    print(f"\n{XS_CACHE.info()}")
+    check_keys()
+
+def check_keys():
+    # arrays are keyed by their content, not by their repr (truncated above 1000 elements)
+    a, b = np.zeros(2000), np.zeros(2000)
+    b[1000] = 1
+    assert spec_key(check_keys, widths=a) != spec_key(check_keys, widths=b)
+    assert spec_key(check_keys, widths=a) == spec_key(check_keys, widths=a.copy())
+    # objects without a canonical form (e.g. a repr with a memory address) are refused
+    class Unhashable:
+        __hash__ = None
+    try:
+        spec_key(check_keys, value=Unhashable())
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("an argument without a canonical form got a key")
+    print("unhashable arguments are keyed by their content")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Centimetre long serpentine waveguides: one gf.Path built with += and extruded as one
+polygon per layer, against serpentine_waveguide (PathBuilder chunks under a vertex budget,
+extruded one at a time). Reports the build time, the largest polygon and the length.
+
+    python -m benchmarks.cutback [max_points]
+"""
+import sys
+import time
+
+import gdsfactory as gf
+
+from cornerstone import rib_450
+from designs.test_structures.cutback import serpentine_rows, serpentine_waveguide
+
+def single_path(length: float, radius: float = 10, row_length: float = 1000) -> gf.Component:
+    # the same serpentine as one path
+    rows, row = serpentine_rows(length, radius, row_length)
+    path = gf.Path()
+    for i in range(rows):
+        path += gf.path.straight(length=row)
+        if i < rows - 1:
+            path += gf.path.arc(radius=radius, angle=180 if i % 2 == 0 else -180)
+    return path.extrude(rib_450)
+
+def _max_points(c: gf.Component) -> int:
+    return max(s.polygon.num_points() for layer in c.kcl.layout.layer_indexes() for s in c.shapes(layer).each())
+
+def main():
+    max_points = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    serpentine_waveguide(100, wg=rib_450), single_path(100)  # warm up the PDK
+
+    print(f"{'length [mm]':>12} {'mode':>11} {'build [ms]':>11} {'max vertices':>13} {'length [um]':>12}")
+    for length in (1e4, 3e4, 1e5):
+        for name, func in (("single path", lambda: single_path(length)), ("chunked", lambda: serpentine_waveguide(length, wg=rib_450, max_points=max_points))):
+            start = time.perf_counter()
+            c = func()
+            elapsed = time.perf_counter() - start
+            print(f"{length/1e3:>12.0f} {name:>11} {elapsed*1e3:>11.1f} {_max_points(c):>13} {c.info['length']:>12}")
+
+if __name__ == "__main__":
+    main()
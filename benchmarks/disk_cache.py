@@ -0,0 +1,118 @@
+"""
+Build time of cells from their functions and from the on-disk cache (see pylayout.cache), in a
+fresh interpreter each, and a check that a cache hit gives the same cell as a fresh build:
+no XOR difference, the same cell tree and the same cache key for the cells built from it.
+
+    python -m benchmarks.disk_cache
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+def build(policy: str):
+    from cornerstone import cs_gc_silicon_1550nm, pn_450_with_metal, rib_450
+    from pylayout.array import grid_array
+    from pylayout.build import build_policy
+    from pylayout.components import attach_grating_coupler
+    from pylayout.components.advanced.ring import ring
+    from cornerstone import metal_pad
+
+    with build_policy(policy):
+        r = ring(wg=rib_450, pn=pn_450_with_metal, radius=5, gap=0.2, int_angle=16, dist_y=2, max_length=550)
+        return {
+            "pn ring": r,
+            "ring with gc": attach_grating_coupler(r, cs_gc_silicon_1550nm, ["o1", "o2"], shared=True),
+            "pads": grid_array(metal_pad, columns=3, spacing=(25, 25)),
+        }
+
+def _tree(c) -> list:
+    return sorted(c.kcl[ci].name for ci in c._kdb_cell.called_cells())
+
+def _polygons(c) -> dict:
+    # flat merged polygons by layer, as exact strings: a GDS or OASIS file would split the
+    # polygons with holes of both builds the same way
+    import gdsfactory as gf
+
+    layout = c.kcl.layout
+    polygons = {}
+    for li in layout.layer_indexes():
+        region = gf.kdb.Region(c.begin_shapes_rec(li)).merged()
+        if not region.is_empty():
+            info = layout.get_info(li)
+            polygons[f"{info.layer}/{info.datatype}"] = [str(p) for p in region.each()]
+    return polygons
+
+def _run(cache_dir: str, policy: str) -> dict:
+    # runs inside the child interpreter
+    from pylayout import cache
+    from pylayout.routing import route_pads_to_ring
+
+    cache.set_cache_dir(cache_dir)
+    start = time.perf_counter()
+    cells = build(policy)
+    elapsed = time.perf_counter() - start
+
+    route = route_pads_to_ring.__wrapped__.__wrapped__
+    return {
+        "time [s]": elapsed,
+        "polygons": {name: _polygons(c) for name, c in cells.items()},
+        "trees": {name: _tree(c) for name, c in cells.items()},
+        "route key": cache.cache_key(route, cells["pn ring"], cells["pads"], {"0_0_e4": "METAL_BOT_p2"}),
+    }
+
+def run(cache_dir: str, policy: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    code = f"import json; from benchmarks.disk_cache import _run; print(json.dumps(_run({cache_dir!r}, {policy!r})))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def xor_count(polygons1: dict, polygons2: dict) -> int:
+    import gdsfactory as gf
+
+    count = 0
+    for name in polygons1.keys() | polygons2.keys():
+        for layer in polygons1.get(name, {}).keys() | polygons2.get(name, {}).keys():
+            a, b = (gf.kdb.Region([gf.kdb.Polygon.from_s(p) for p in polygons.get(name, {}).get(layer, [])]) for polygons in (polygons1, polygons2))
+            count += (a ^ b).count()
+    return count
+
+def main():
+    # flattened cells and cells with their references (and the shared grating coupler)
+    for policy in ("flatten", "keep"):
+        with tempfile.TemporaryDirectory() as tmp:
+            fresh = run(tmp, policy)
+            cached = run(tmp, policy)
+        xor = xor_count(fresh["polygons"], cached["polygons"])
+
+        print(f"{policy:>8}: fresh build {fresh['time [s]']:.2f} s, from the cache {cached['time [s]']:.2f} s")
+        assert xor == 0, f"{xor} XOR differences between the fresh build and the cache hit"
+        assert fresh["trees"] == cached["trees"], (fresh["trees"], cached["trees"])
+        assert fresh["route key"] == cached["route key"], "cells built from a cache hit get another key"
+    print("cache hits: no XOR difference, same cell tree and same downstream key")
+    check_policy_key()
+
+def check_policy_key():
+    # cells built with another build policy have other content, so they must not be read back
+    from cornerstone import rib_450
+    from pylayout import cache
+    from pylayout.build import build_policy
+    from pylayout.components.advanced.ring import ring
+
+    function = ring.__wrapped__
+    keys = {}
+    for policy in ("flatten", "keep", "auto"):
+        with build_policy(policy):
+            keys[policy] = cache.cache_key(function, wg=rib_450, radius=5, gap=0.2)
+    with build_policy("auto", max_polygons=4):
+        keys["auto 4"] = cache.cache_key(function, wg=rib_450, radius=5, gap=0.2)
+    assert len(set(keys.values())) == len(keys), "the build policy is not part of the cache key"
+    print("the build policy and its polygon limit are part of the cache key")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Path extrusion with gdsfactory (offset curves computed per section) against extrude_sections
+(tangents computed once, every section offset in one NumPy operation) for the multi-section
+cornerstone cross-sections on heater-arm paths.
+
+    python -m benchmarks.extrude [n]
+"""
+import sys
+import time
+
+import gdsfactory as gf
+
+from cornerstone import filament, heater_450, pn_450_with_metal_and_heater, rib_450
+from pylayout.extrude import extrude_sections
+
+def heater_arm(length: float) -> gf.Path:
+    # U-shaped heater path of straight_with_filament
+    return gf.Path([
+        gf.path.straight(length=1),
+        gf.path.arc(radius=4, angle=-90),
+        gf.path.straight(length=length),
+        gf.path.arc(radius=4, angle=-90),
+        gf.path.straight(length=1),
+    ])
+
+def _polygons(c: gf.Component) -> list:
+    return sorted(str(s.polygon) for layer in c.kcl.layout.layer_indexes() for s in c.shapes(layer).each())
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    paths = {"arm 500": heater_arm(500), "arm 2000": heater_arm(2000), "ring r=10": gf.path.arc(radius=10, angle=360)}
+    xss = {"rib_450": rib_450(), "filament": filament(), "heater_450": heater_450(), "pn_450_w_m_h": pn_450_with_metal_and_heater()}
+
+    print(f"{'path':>10} {'cross-section':>14} {'sections':>9} {'gdsfactory [ms]':>16} {'batched [ms]':>13} {'identical':>10}")
+    for path_name, path in paths.items():
+        for xs_name, xs in xss.items():
+            timings = []
+            for func in (lambda: path.extrude(xs), lambda: extrude_sections(path, xs)):
+                start = time.perf_counter()
+                for _ in range(n):
+                    func()
+                timings.append((time.perf_counter() - start) / n)
+            identical = _polygons(path.extrude(xs)) == _polygons(extrude_sections(path, xs))
+            print(f"{path_name:>10} {xs_name:>14} {len(xs.sections):>9} {timings[0]*1e3:>16.2f} {timings[1]*1e3:>13.2f} {identical!s:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Build time of gen_objects serially and across a process pool, and a check that the cells sent
+back by the workers have the geometry of a serial build. A cell of the parent with the name of
+a worker result (e.g. unnamed cells numbered by each worker) is only reused if it has the same
+content, otherwise the result is imported under a new name.
+
+    python -m benchmarks.gen_objects [n] [processes]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+
+from pylayout.methods import gen_objects
+from pylayout.serialization import geometry_hash
+
+def _rectangle(width: float) -> gf.Component:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (width, 0), (width, 1), (0, 1)], layer=(1, 0))
+    return c
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    gaps = list(np.round(np.linspace(0.1, 0.5, n), 3))
+
+    start = time.perf_counter()
+    parallel = gen_objects(gf.components.coupler, gap=gaps, length=20, processes=processes)
+    elapsed = time.perf_counter() - start
+    print(f"{n} couplers with {processes} processes: {elapsed:.2f} s")
+
+    # the same couplers with another length, built in this process
+    start = time.perf_counter()
+    gen_objects(gf.components.coupler, gap=gaps, length=21)
+    print(f"{n} couplers serially: {time.perf_counter() - start:.2f} s")
+
+    serial = gen_objects(gf.components.coupler, gap=gaps, length=20)
+    assert [geometry_hash(c) for c in parallel] == [geometry_hash(c) for c in serial]
+    # the serial build finds the cells imported from the workers (same name and content)
+    assert all(a is b for a, b in zip(parallel, serial))
+
+    # unnamed cells of different workers (or of the parent) get the same names, e.g.
+    # Unnamed_12, so a result is only mapped to an existing cell if the content is the same
+    widths = [1, 2, 3, 4, 5, 6, 7, 8]
+    rectangles = gen_objects(_rectangle, width=widths, processes=4)
+    assert [c.dxsize for c in rectangles] == widths, [c.dxsize for c in rectangles]
+    print("results match the serial build, cells with the same name and other content are kept apart")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+grating_coupler_elliptical_trenches: one grating_tooth_points call and polygon per tooth
+(previous implementation) against all the teeth from one NumPy batch inserted as one region,
+and the cell cache across equivalent cross-section specs.
+
+    python -m benchmarks.grating_coupler [n]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.components.grating_coupler_elliptical import grating_tooth_points
+
+from cornerstone import rib_450
+from cornerstone.layer import LAYER
+from pylayout.components import gc_silicon_1550nm
+from pylayout.components.basic.gc import _grating_teeth
+
+def teeth_per_tooth(a: float, b: float, x: float, p: np.ndarray, width: float, taper_angle: float) -> gf.Component:
+    # previous implementation, one polygon per tooth
+    c = gf.Component()
+    for i in p:
+        c.add_polygon(grating_tooth_points(i*a, i*b, i*x, width=width, taper_angle=taper_angle), layer=(1, 0))
+    return c
+
+def teeth_batched(a: float, b: float, x: float, p: np.ndarray, width: float, taper_angle: float) -> gf.Component:
+    c = gf.Component()
+    teeth = _grating_teeth(p*a, p*b, p*x, width=width, taper_angle=taper_angle)
+    region = gf.kdb.Region([gf.kdb.Polygon(tooth) for tooth in np.round(teeth / c.kcl.dbu).astype(np.int64).tolist()])
+    c.add_polygon(region, layer=(1, 0))
+    return c
+
+def _geometry(c: gf.Component) -> gf.kdb.Region:
+    return gf.kdb.Region(c.begin_shapes_rec(c.kcl.layer(1, 0))).merged()
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # ellipse parameters of the silicon 1550 nm grating
+    a, b, x, width, taper_angle = 0.594, 0.564, 0.108, 0.359, 39
+
+    print(f"{'teeth':>6} {'per tooth [ms]':>15} {'batched [ms]':>13} {'xor [dbu2]':>11}")
+    for n_periods in (15, 30, 60):
+        p = np.arange(26, 26 + n_periods + 1)
+        timings = []
+        for func in (teeth_per_tooth, teeth_batched):
+            start = time.perf_counter()
+            for _ in range(n):
+                func(a, b, x, p, width, taper_angle)
+            timings.append((time.perf_counter() - start) / n)
+        xor = (_geometry(teeth_per_tooth(a, b, x, p, width, taper_angle)) ^ _geometry(teeth_batched(a, b, x, p, width, taper_angle))).area()
+        print(f"{len(p):>6} {timings[0]*1e3:>15.2f} {timings[1]*1e3:>13.2f} {xor:>11}")
+
+    # the cell is keyed on the resolved cross-section and layer, so these specs share one cell
+    specs = [dict(cross_section=rib_450, layer_trench=LAYER.GRATING), dict(cross_section=rib_450(), layer_trench=tuple(LAYER.GRATING))]
+    cells = {gc_silicon_1550nm(**spec).name for spec in specs}
+    print(f"\n{len(specs)} equivalent specs -> {len(cells)} cell")
+
+if __name__ == "__main__":
+    main()
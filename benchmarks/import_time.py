@@ -0,0 +1,40 @@
+"""
+Import-time benchmark for the cornerstone PDK. Every case runs in a fresh interpreter,
+from a temporary directory to check that nothing depends on the working directory.
+
+    python -m benchmarks.import_time [repeats]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+CASES = {
+    "python": "pass",
+    "gdsfactory": "import gdsfactory",
+    "cornerstone": "import cornerstone",
+    "cornerstone.LAYER": "import cornerstone; cornerstone.LAYER",
+    "cornerstone.rib_450()": "import cornerstone; cornerstone.rib_450()",
+    "cornerstone.LAYER_STACK": "from cornerstone.layer import LAYER_STACK",
+    "cs_gc_silicon_1550nm()": "import cornerstone; cornerstone.cs_gc_silicon_1550nm()",
+}
+
+def run(code: str, cwd: str) -> float:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with tempfile.TemporaryDirectory() as cwd:
+        for name, code in CASES.items():
+            best = min(run(code, cwd) for _ in range(repeats))
+            print(f"{name:>25}: {best*1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
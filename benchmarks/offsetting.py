@@ -0,0 +1,69 @@
+"""
+offsetting of a component made of many references to a library cell: flat, tiled (threads)
+and deep (hierarchical) modes, with the time, the xor of the merged results against the flat
+mode and checks that every mode offsets the component in place, that the shared library cell
+(and so every other parent) is unchanged and that no written cell name is reused for other
+geometry.
+
+    python -m benchmarks.offsetting [n]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import gdsfactory as gf
+
+from pylayout.methods import offsetting
+
+LAYER_FROM, LAYER_TO = (1, 0), (2, 0)
+
+def build(n: int) -> gf.Component:
+    c = gf.Component()
+    for i in range(n):
+        ref = c.add_ref(gf.components.rectangle(size=(10, 10), layer=LAYER_FROM))
+        ref.dmove((20 * (i % 50), 20 * (i // 50)))
+    return c
+
+def _shapes(c: gf.Component) -> dict:
+    layout = c.kcl.layout
+    return {layer: sorted(str(s) for s in c.shapes(layer).each()) for layer in layout.layer_indexes()}
+
+def _check_names(c: gf.Component) -> None:
+    # the cells of the written file, by name without the "$n" KLayout adds to clashing names
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "offset.gds"
+        c.write_gds(filepath)
+        layout = gf.kdb.Layout()
+        layout.read(str(filepath))
+    names = [layout.cell_name(ci).split("$")[0] for ci in range(layout.cells())]
+    assert len(names) == len(set(names)), f"cell names reused for other geometry: {sorted(names)}"
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2500
+    child = gf.components.rectangle(size=(10, 10), layer=LAYER_FROM)
+    # another parent of the same library cell
+    sibling = gf.Component()
+    sibling.add_ref(child)
+    before = (_shapes(child), gf.kdb.Region(sibling.begin_shapes_rec(sibling.kcl.layer(*LAYER_TO))).area())
+
+    layer_to = gf.get_layer(LAYER_TO)
+    results = {}
+    print(f"{'mode':>6} {'time [ms]':>10} {'xor [dbu2]':>11}")
+    for mode, kwargs in (("flat", {}), ("tiled", dict(threads=4, tile_size=200)), ("deep", dict(deep=True))):
+        c = build(n)
+        start = time.perf_counter()
+        out = offsetting(c, LAYER_FROM, LAYER_TO, offset=2, **kwargs)
+        elapsed = time.perf_counter() - start
+        assert out is c, f"{mode} mode did not offset the component in place"
+        _check_names(c)
+        results[mode] = gf.kdb.Region(out.begin_shapes_rec(layer_to)).merged()
+        xor = (results[mode] ^ results["flat"]).area()
+        print(f"{mode:>6} {elapsed*1e3:>10.1f} {xor:>11}")
+
+    after = (_shapes(child), gf.kdb.Region(sibling.begin_shapes_rec(sibling.kcl.layer(*LAYER_TO))).area())
+    assert before == after, "offsetting modified a shared library cell"
+    print("\nshared library cell and its other parents unchanged")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Path of a bend_loss structure with 100 rings (and more): gf.Path += per segment (previous
+implementation, the point array is concatenated for every ring) against PathBuilder, then
+the extrusion of the path.
+
+    python -m benchmarks.path_builder [radius]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+
+from cornerstone import rib_450
+from pylayout.extrude import extrude_sections
+from pylayout.path import PathBuilder
+
+def _bend_360(radius: float) -> gf.Path:
+    path = gf.Path()
+    for angle in (90, -90, -90, 90):
+        path += gf.path.arc(radius=radius, angle=angle)
+    return path
+
+def path_concatenated(radius: float, rings: int, st_len: float = 100) -> gf.Path:
+    # previous bend_loss path
+    path = gf.Path()
+    path += gf.path.straight(length=st_len)
+    for _ in range(rings):
+        path += _bend_360(radius)
+    path += gf.path.straight(length=st_len)
+    return path
+
+def path_builder(radius: float, rings: int, st_len: float = 100) -> gf.Path:
+    path = PathBuilder()
+    path += gf.path.straight(length=st_len)
+    bend = _bend_360(radius)
+    for _ in range(rings):
+        path += bend
+    path += gf.path.straight(length=st_len)
+    return path.path()
+
+def main():
+    radius = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    xs = gf.get_cross_section(rib_450)
+    # warm up (arcs, layers) outside of the timed loop
+    extrude_sections(path_builder(radius, 1), xs)
+
+    print(f"{'rings':>6} {'points':>8} {'gf.Path += [ms]':>16} {'PathBuilder [ms]':>17} {'extrude [ms]':>13} {'identical':>10}")
+    for rings in (10, 100, 300):
+        timings = []
+        for func in (path_concatenated, path_builder):
+            start = time.perf_counter()
+            path = func(radius, rings)
+            timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        extrude_sections(path, xs)
+        extruded = time.perf_counter() - start
+
+        a, b = path_concatenated(radius, rings), path_builder(radius, rings)
+        identical = np.array_equal(a.points, b.points) and a.end_angle == b.end_angle
+        print(f"{rings:>6} {len(b.points):>8} {timings[0]*1e3:>16.1f} {timings[1]*1e3:>17.1f} {extruded*1e3:>13.1f} {identical!s:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Gap sweep of rings with and without the path cache and the shared extrusion cells (see
+pylayout.extrude and ring_coupler_path), with the hit and miss counters of the path cache and
+the number of extruded cells.
+
+    python -m benchmarks.ring_gap_sweep [n_gaps]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+
+from cornerstone import rib_450
+from pylayout.components import ring
+from pylayout.components.basic.coupler import PATH_CACHE
+
+def sweep(radii, gaps, cached: bool, offset: float) -> float:
+    start = time.perf_counter()
+    for i, radius in enumerate(radii):
+        for j, gap in enumerate(gaps):
+            if not cached:
+                PATH_CACHE.clear()
+                # a radius per ring (0.1 nm apart, the precision of the path hash), so that no
+                # ring path is extruded twice
+                radius += 1e-4
+            # the offset gives new cell names, so nothing comes from the cell cache
+            ring(wg=rib_450(), radius=radius + offset, gap=gap, int_angle=20)
+    return time.perf_counter() - start
+
+def _extruded() -> list:
+    return [gf.kcl[cell.cell_index()] for cell in gf.kcl.each_cell() if cell.name.startswith("extrude_")]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    radii = [5, 10, 20, 40]
+    gaps = np.round(np.linspace(0.15, 0.4, n), 3)
+
+    # loads the PDK and the cross-sections outside of the timings
+    sweep(radii[:1], gaps[:1], cached=False, offset=0)
+    uncached = sweep(radii, gaps, cached=False, offset=1e-3)
+    PATH_CACHE.clear()
+    cells = len(_extruded())
+    cached = sweep(radii, gaps, cached=True, offset=0.1)
+
+    print(f"{len(radii)} radii x {n} gaps")
+    print(f"uncached: {uncached:.2f} s")
+    print(f"cached:   {cached:.2f} s ({uncached/cached:.1f}x)")
+    print(f"paths:      {PATH_CACHE.info()}")
+    print(f"extrusions: {len(_extruded()) - cells} cells for {len(radii) * n} rings")
+    # one ring per radius and one bus per gap and radius, shared by the rings and locked
+    assert len(_extruded()) - cells == len(radii) * (n + 1)
+    assert all(cell._locked for cell in _extruded())
+
+if __name__ == "__main__":
+    main()
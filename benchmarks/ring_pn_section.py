@@ -0,0 +1,79 @@
+"""
+ring_pn_section benchmark: one sub-component per section (previous implementation) against
+the batched per-layer builder, on the PN cross-sections of the RAMZI rings.
+
+    python -m benchmarks.ring_pn_section [n]
+"""
+import sys
+import time
+
+import gdsfactory as gf
+
+from cornerstone import pn_450_with_metal, pn_450_with_metal_and_heater
+from pylayout.components import ring_pn_section
+from pylayout.components.basic.truncated_circle import truncated_circle_bool
+
+def ring_pn_section_per_section(radius: float, pn, y: float, heater_percent: float=0.7) -> gf.Component:
+    # previous implementation, one boolean truncated circle or extruded arc per section
+    c = gf.Component()
+    for sec in pn.sections:
+        if gf.get_layer(sec.layer) == 3 or gf.get_layer(sec.layer) == 5:
+            continue
+        if "heater_metal".upper() in sec.name.upper():
+            continue
+
+        outer_r = radius - sec.offset + sec.width/2
+        inner_r = radius - sec.offset - sec.width/2
+        if "heater".upper() in sec.name.upper():
+            arc = gf.path.arc(radius=radius, angle=heater_percent*360, start_angle=90+(1-heater_percent)*180)
+            arc = arc.extrude(gf.cross_section.CrossSection(sections=[sec]))
+            ref = c.add_ref(arc)
+            ref.dx, ref.dymin = 0, -radius-sec.width/2
+            c.add_port("HEATER_p2", ref.ports["e1"])
+            c.add_port("HEATER_p1", ref.ports["e2"])
+        else:
+            ref = c.add_ref(truncated_circle_bool(inner_r, outer_r, y, sec.layer, port_prefix=sec.name))
+            c.add_ports(ref.ports)
+
+    c.flatten()
+    return c
+
+def _signature(c: gf.Component) -> tuple:
+    layout = c.kcl.layout
+    geometry = {}
+    for layer in layout.layer_indexes():
+        region = gf.kdb.Region(c.begin_shapes_rec(layer)).merged()
+        if not region.is_empty():
+            geometry[layer] = region
+    # ports of cells are snapped to the grid, the previous implementation is not a cell
+    ports = sorted((p.name, tuple(round(v, 3) for v in p.dcenter), p.dwidth, p.orientation, p.layer) for p in c.ports)
+    return geometry, ports
+
+# (name, pn, radius, y, heater_percent)
+CASES = [
+    ("metal, r=7", pn_450_with_metal, 7, 5.6, 0.7),
+    ("metal+heater, r=7", pn_450_with_metal_and_heater, 7, 5.6, 0.7),
+    ("metal+heater, r=10", pn_450_with_metal_and_heater, 10, 7.5, 0.78),
+]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'case':>20} {'per section [ms]':>17} {'batched [ms]':>13} {'xor [dbu2]':>11} {'ports':>6}")
+    for name, pn, radius, y, heater_percent in CASES:
+        pn = pn()
+        timings = []
+        for func in (ring_pn_section_per_section, ring_pn_section):
+            start = time.perf_counter()
+            for i in range(n):
+                # a different y every time, so nothing comes from the cell cache
+                c = func(radius=radius, pn=pn, y=y + 1e-3*i, heater_percent=heater_percent)
+            timings.append((time.perf_counter() - start) / n)
+
+        (ga, pa), (gb, pb) = [_signature(func(radius=radius, pn=pn, y=y, heater_percent=heater_percent))
+                              for func in (ring_pn_section_per_section, ring_pn_section)]
+        xor = sum((ga[layer] ^ gb.get(layer, gf.kdb.Region())).area() for layer in ga)
+        print(f"{name:>20} {timings[0]*1e3:>17.1f} {timings[1]*1e3:>13.1f} {xor:>11} {str(pa == pb):>6}")
+
+if __name__ == "__main__":
+    main()
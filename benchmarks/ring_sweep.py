@@ -0,0 +1,103 @@
+"""
+Ring matrix of designs/test_structures/ring.py (7 radii x 25 gaps, with grating couplers),
+built with one flat ring per gap in a loop against ring_sweep, which shares the ring bodies and
+the grating coupler. Every mode is built in a fresh interpreter, as cells are cached by name.
+
+    python -m benchmarks.ring_sweep [mode ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+STEP = 0.005
+# radius: (interaction angle, first gap)
+GAP_DICT = {4.5: (18, 0.2), 5: (18, 0.2), 6: (18, 0.2), 7: (18, 0.278), 8: (18, 0.308), 9: (18, 0.338), 10: (18, 0.378)}
+MAX_LENGTH = 675
+CLADDING_WIDTH = 8
+WIDTH = 0.45
+
+def _specs():
+    import numpy as np
+    from gdsfactory.cross_section import cross_section, Section
+    from cornerstone import Spec, LAYER
+    from pylayout.components import gc_silicon_1550nm
+
+    wg = partial(cross_section, width=WIDTH, offset=0, radius_min=Spec.r_min, layer=LAYER.WG, cladding_layers=(LAYER.WG_ETCH,), cladding_offsets=(5.5,))
+    ring_wgs = {
+        radius: partial(cross_section, width=WIDTH, offset=0, radius_min=Spec.r_min, layer=LAYER.WG, sections=[
+            Section(width=radius, offset=-radius/2, layer=LAYER.WG_ETCH),
+            Section(name="ring", width=CLADDING_WIDTH + WIDTH/2, offset=(CLADDING_WIDTH + WIDTH/2)/2, layer=LAYER.WG_ETCH),
+        ]) for radius in GAP_DICT
+    }
+    gaps = {radius: [float(g) for g in np.round(np.arange(start, start + 0.12 + STEP, STEP), 4)] for radius, (_, start) in GAP_DICT.items()}
+    gc = partial(gc_silicon_1550nm, layer_trench=LAYER.GRATING, cross_section=wg)
+    return wg, ring_wgs, gaps, gc
+
+def build_loop():
+    import gdsfactory as gf
+    from pylayout.components import ring, attach_grating_coupler
+
+    wg, ring_wgs, gaps, gc = _specs()
+    rings = []
+    for radius, (angle, _) in GAP_DICT.items():
+        for gap in gaps[radius]:
+            c = ring(wg=wg, ring_wg=ring_wgs[radius], radius=radius, gap=gap, int_angle=angle, max_length=MAX_LENGTH, cladding_rfill=True)
+            c = attach_grating_coupler(c, gc, ["o1", "o2"])
+            base = gf.Component()
+            base.add_ref(c).drotate(90)
+            rings.append(base)
+    return gf.grid(rings, shape=(len(GAP_DICT), len(rings) // len(GAP_DICT)), spacing=(101, 290), align_x="xmin")
+
+def build_sweep():
+    from pylayout.components import ring_sweep
+
+    wg, ring_wgs, gaps, gc = _specs()
+    return ring_sweep(
+        radii=list(GAP_DICT), gaps=gaps, wg=wg, ring_wg=ring_wgs,
+        int_angle={radius: angle for radius, (angle, _) in GAP_DICT.items()},
+        max_length=MAX_LENGTH, cladding_rfill=True, gc=gc,
+    )
+
+def _run(mode: str) -> dict:
+    # runs inside the child interpreter
+    import gdsfactory as gf
+
+    start = time.perf_counter()
+    c = {"loop": build_loop, "sweep": build_sweep}[mode]()
+    result = {"mode": mode, "build [s]": time.perf_counter() - start}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix, fmt in (("gds", "GDS2"), ("oas", "OASIS")):
+            filepath = Path(tmp) / f"rings.{suffix}"
+            options = gf.kdb.SaveLayoutOptions()
+            options.format = fmt
+            start = time.perf_counter()
+            c.write(filepath, save_options=options)
+            result[f"write {suffix} [s]"] = time.perf_counter() - start
+            result[f"{suffix} [MB]"] = filepath.stat().st_size / 1024**2
+    result["cells"] = len(list(c.called_cells())) + 1
+    return result
+
+def run(mode: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    code = f"import json; from benchmarks.ring_sweep import _run; print(json.dumps(_run({mode!r})))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    modes = sys.argv[1:] or ["loop", "sweep"]
+    results = [run(mode) for mode in modes]
+    keys = list(results[0])
+    print(" | ".join(f"{key:>14}" for key in keys))
+    for result in results:
+        print(" | ".join(f"{value:>14.3f}" if isinstance(value, float) else f"{value:>14}" for value in result.values()))
+
+if __name__ == "__main__":
+    main()
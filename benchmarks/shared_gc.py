@@ -0,0 +1,68 @@
+"""
+Die of ring and straight test structures with grating couplers and normalisation waveguides,
+with the grating couplers copied into every structure (default) and kept as one shared cell
+(set_shared_gc). Reports the stored vertices, the file size and the build time.
+
+    python -m benchmarks.shared_gc [n]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import gdsfactory as gf
+
+from cornerstone import cs_gc_silicon_1550nm, rib_450
+from pylayout.components import add_norm_wg, attach_grating_coupler
+
+def build_die(n: int, shared: bool) -> gf.Component:
+    die = gf.Component()
+    for i in range(n):
+        ring = gf.components.ring_single(radius=5 + i % 5, gap=0.2 + 0.01*i, cross_section=rib_450)
+        c = attach_grating_coupler(ring, cs_gc_silicon_1550nm, ["o1", "o2"], shared=shared)
+        c = add_norm_wg(c, cs_gc_silicon_1550nm, rib_450, rpos=-40, sides="N", shared=shared)
+        ref = die.add_ref(c)
+        ref.dxmin, ref.dymin = 0, 150*i
+    return die
+
+def _geometry(c: gf.Component) -> dict:
+    layout = c.kcl.layout
+    return {layer: gf.kdb.Region(c.begin_shapes_rec(layer)).merged() for layer in layout.layer_indexes()}
+
+def _vertices(c: gf.Component) -> int:
+    # vertices stored in the file: every cell of the hierarchy once
+    layout = c.kcl.layout
+    count = 0
+    for index in [c.cell_index()] + list(c._kdb_cell.called_cells()):
+        for layer in layout.layer_indexes():
+            count += sum(shape.polygon.num_points() for shape in layout.cell(index).shapes(layer).each() if shape.polygon)
+    return count
+
+def _size(c: gf.Component) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "die.gds"
+        c.write(filepath)
+        return filepath.stat().st_size
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    gf.components.ring_single(cross_section=rib_450)  # warm up the PDK
+
+    dies = {}
+    print(f"{'mode':>8} {'build [s]':>10} {'vertices':>10} {'GDS [MB]':>9}")
+    for shared in (False, True):
+        start = time.perf_counter()
+        die = dies[shared] = build_die(n, shared)
+        elapsed = time.perf_counter() - start
+        print(f"{'shared' if shared else 'copied':>8} {elapsed:>10.2f} {_vertices(die):>10} {_size(die)/1024**2:>9.2f}")
+
+    a, b = _geometry(dies[False]), _geometry(dies[True])
+    xor = sum((a[layer] ^ b[layer]).area() for layer in a)
+    print(f"\nxor: {xor} dbu2")
+
+    # sharing is per call: a copied die built after the shared one is the same as before
+    assert _vertices(build_die(n, False)) == _vertices(dies[False]), "the shared die changed a later copied build"
+    print("copied die unchanged after the shared build")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Straight waveguides with gf.path.straight(length).extrude(cs) against extrude_straight (one
+rectangle per section, a cell named by length and cross-section), for a set of lengths built once
+and built again as in a test structure sweep.
+
+    python -m benchmarks.straight [lengths]
+"""
+import sys
+import time
+
+import numpy as np
+
+import gdsfactory as gf
+
+from cornerstone import heater_450, pn_450_with_metal_and_heater, rib_450
+from pylayout.extrude import _straight, extrude_straight
+
+def _polygons(c: gf.Component) -> list:
+    return sorted(str(s.polygon) for layer in c.kcl.layout.layer_indexes() for s in c.shapes(layer).each())
+
+def _ports(c: gf.Component) -> list:
+    return [(p.name, tuple(p.dcenter), p.dwidth, p.orientation) for p in c.ports]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lengths = np.round(np.linspace(50, 1000, n), 3)
+
+    print(f"{'cross-section':>14} {'path [ms]':>10} {'rectangles [ms]':>16} {'cached [ms]':>12} {'identical':>10}")
+    for name, xs in {"rib_450": rib_450(), "heater_450": heater_450(), "pn_450_w_m_h": pn_450_with_metal_and_heater()}.items():
+        # warm up (layers, port types) outside of the timed loop
+        _straight(1.0, xs)
+        timings = []
+        for func in (lambda length: gf.path.straight(length=length).extrude(xs), lambda length: _straight(length, xs), lambda length: extrude_straight(length, xs)):
+            start = time.perf_counter()
+            # twice each length, the second one is a cache hit for extrude_straight
+            for length in (*lengths, *lengths):
+                func(length)
+            timings.append((time.perf_counter() - start) / (2 * n))
+        identical = all(
+            (_polygons(a), _ports(a)) == (_polygons(b), _ports(b))
+            for a, b in ((gf.path.straight(length=length).extrude(xs), extrude_straight(length, xs)) for length in lengths)
+        )
+        print(f"{name:>14} {timings[0]*1e3:>10.3f} {timings[1]*1e3:>16.3f} {timings[2]*1e3:>12.3f} {identical!s:>10}")
+
+if __name__ == "__main__":
+    main()
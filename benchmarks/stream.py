@@ -0,0 +1,106 @@
+"""
+Peak memory of a die build with and without the streaming writer (see pylayout.stream), for
+a growing number of structures. Every run is done in a fresh interpreter.
+
+    python -m benchmarks.stream [n ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+def build_block(i: int):
+    import gdsfactory as gf
+    from cornerstone import cs_gc_silicon_1550nm, rib_450
+    from designs.test_structures import straight
+    from pylayout.components import attach_grating_coupler
+
+    # a unique block per index, like the gap variants of a die
+    c = gf.Component()
+    c.add_ref(straight(length=200 + i, gc=cs_gc_silicon_1550nm, cs=rib_450))
+    for j in range(4):
+        rings = attach_grating_coupler(gf.components.ring_single(radius=5 + j, gap=0.2 + 0.001*i, cross_section=rib_450), cs_gc_silicon_1550nm, ["o1", "o2"])
+        ref = c.add_ref(rings)
+        ref.dymax, ref.dxmin = -40 - 60*j, 0
+    return c
+
+def _run(n: int, streaming: bool) -> dict:
+    # runs inside the child interpreter
+    import resource
+    import gdsfactory as gf
+    from pylayout.stream import StreamWriter
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "die.oas"
+        if streaming:
+            with StreamWriter(filepath, top="DIE") as sink:
+                for i in range(n):
+                    block = build_block(i)
+                    sink.place(block, (0, sink.dbbox().bottom - 30 - block.dymax if i else 0))
+        else:
+            die = gf.Component()
+            for i in range(n):
+                ref = die.add_ref(build_block(i))
+                if i:
+                    ref.dymax = die.dymin - 30
+            options = gf.kdb.SaveLayoutOptions()
+            options.format = "OASIS"
+            die.write(filepath, save_options=options)
+        size = filepath.stat().st_size
+
+    return {
+        "structures": n,
+        "mode": "stream" if streaming else "memory",
+        "time [s]": time.perf_counter() - start,
+        "peak RSS [MB]": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "file [MB]": size / 1024**2,
+    }
+
+def run(n: int, streaming: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    code = f"import json; from benchmarks.stream import _run; print(json.dumps(_run({n}, {streaming})))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def check_released_names():
+    """
+    An unlocked cell rebuilt under the name of a released one is written as a new structure,
+    not placed as the released one.
+    """
+    import gdsfactory as gf
+    from pylayout.stream import StreamWriter
+
+    def block(width: float) -> gf.Component:
+        c = gf.Component()
+        c.add_polygon([(0, 0), (width, 0), (width, 1), (0, 1)], layer=(1, 0))
+        c.name = "BLOCK"
+        return c
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "die.oas"
+        with StreamWriter(filepath, top="DIE") as sink:
+            sink.place(block(1), (0, 0))
+            sink.place(block(2), (0, 10))
+        layout = gf.kdb.Layout()
+        layout.read(str(filepath))
+        top = layout.cell("DIE")
+        widths = sorted(inst.cell.dbbox().width() for inst in top.each_inst())
+    assert widths == [1, 2], widths
+
+def main():
+    check_released_names()
+    sizes = [int(n) for n in sys.argv[1:]] or [10, 40, 120]
+    results = [run(n, streaming) for n in sizes for streaming in (False, True)]
+    keys = list(results[0])
+    print(" | ".join(f"{key:>14}" for key in keys))
+    for result in results:
+        print(" | ".join(f"{value:>14.3f}" if isinstance(value, float) else f"{value:>14}" for value in result.values()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+truncated_circle_bool (boolean operations) against truncated_circle_analytic (one polygon from
+NumPy), on the PN sections of the rings used in the designs.
+
+    python -m benchmarks.truncated_circle [n]
+"""
+import sys
+import time
+
+import gdsfactory as gf
+
+from pylayout.components.basic.truncated_circle import truncated_circle_analytic, truncated_circle_bool
+
+# (inner_r, outer_r, y) of the doping, via and metal rings of 5-10 um radius rings
+CASES = [
+    (5.5, 6.5, 2.0),
+    (6.775, 7.225, 5.6),
+    (9.3, 10.4, 7.5),
+    (3, 7, 4),
+    (0, 7, 2),
+    (6, 7, 8),
+]
+
+def _geometry(c: gf.Component, layer) -> gf.kdb.Region:
+    return gf.kdb.Region(c.begin_shapes_rec(gf.get_layer(layer))).merged()
+
+def _ports(c: gf.Component) -> list:
+    return [(p.name, tuple(p.dcenter), p.dwidth, p.orientation) for p in c.ports]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    layer = (1, 0)
+
+    timings = {}
+    for name, func in [("bool", truncated_circle_bool), ("analytic", truncated_circle_analytic)]:
+        start = time.perf_counter()
+        for i in range(n):
+            for inner_r, outer_r, y in CASES:
+                # a different y every time, so nothing comes from the cell cache
+                func(inner_r, outer_r, y + 1e-3*i, layer, port_prefix="PN")
+        timings[name] = (time.perf_counter() - start) / (n * len(CASES))
+
+    print(f"{'inner_r':>8} {'outer_r':>8} {'y':>6} {'area [um2]':>12} {'xor [um2]':>12} {'ports':>6}")
+    for inner_r, outer_r, y in CASES:
+        a = truncated_circle_bool(inner_r, outer_r, y, layer, port_prefix="PN")
+        b = truncated_circle_analytic(inner_r, outer_r, y, layer, port_prefix="PN")
+        ga, gb = _geometry(a, layer), _geometry(b, layer)
+        dbu2 = gf.kcl.dbu**2
+        print(
+            f"{inner_r:>8} {outer_r:>8} {y:>6} {ga.area()*dbu2:>12.4f} {(ga ^ gb).area()*dbu2:>12.2e} "
+            f"{str(_ports(a) == _ports(b)):>6}"
+        )
+
+    print(f"\nbool:     {timings['bool']*1e3:.2f} ms per cell")
+    print(f"analytic: {timings['analytic']*1e3:.2f} ms per cell ({timings['bool']/timings['analytic']:.1f}x)")
+
+if __name__ == "__main__":
+    main()
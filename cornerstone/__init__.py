@@ -1,32 +1,42 @@
-from .layer import LAYER
-from .models import(
-    SOI220nm_1550nm_TE_MZI_Modulator,
-    SOI220nm_1550nm_TE_RIB_2x1_MMI,
-    SOI220nm_1550nm_TE_RIB_2x2_MMI,
-    SOI220nm_1550nm_TE_RIB_90_Degree_Bend,
-    SOI220nm_1550nm_TE_RIB_Waveguide,
-    SOI220nm_1550nm_TE_RIB_Waveguide_Crossing,
-    SOI220nm_1550nm_TE_STRIP_2x1_MMI,
-    SOI220nm_1550nm_TE_STRIP_2x2_MMI,
-    SOI220nm_1550nm_TE_RIB_Grating_Coupler,
-    SOI220nm_1550nm_TE_STRIP_90_Degree_Bend,
-    cs_gc_silicon_1550nm
-)
-from .cross_section import (
-    Spec,
-    heater,
-    heater_450,
-    metal_pad,
-    heater_pad,
-    pn,
-    pn_450_with_metal_and_heater,
-    pn_450_with_heater,
-    pn_450_with_metal,
-    metal,
-    filament,
-    rib,
-    rib_450
-)
+# Everything is imported on first use, so that importing cornerstone (e.g. in a worker
+# process or a short CLI run) does not parse the specs or build the layer stack up front.
+import os
+from importlib import import_module
+
+# the code and the specification files (cross_section/cs_spec.yml) of the PDK are part of
+# every pylayout.cache key once cornerstone is imported, see pylayout.cache._dependencies
+CACHE_DEPENDENCIES = [os.path.dirname(__file__)]
+
+_LAZY = {
+    "LAYER": ".layer",
+    "LAYER_STACK": ".layer",
+    "LAYER_VIEWS": ".layer",
+    "SOI220nm_1550nm_TE_MZI_Modulator": ".models",
+    "SOI220nm_1550nm_TE_RIB_2x1_MMI": ".models",
+    "SOI220nm_1550nm_TE_RIB_2x2_MMI": ".models",
+    "SOI220nm_1550nm_TE_RIB_90_Degree_Bend": ".models",
+    "SOI220nm_1550nm_TE_RIB_Waveguide": ".models",
+    "SOI220nm_1550nm_TE_RIB_Waveguide_Crossing": ".models",
+    "SOI220nm_1550nm_TE_STRIP_2x1_MMI": ".models",
+    "SOI220nm_1550nm_TE_STRIP_2x2_MMI": ".models",
+    "SOI220nm_1550nm_TE_RIB_Grating_Coupler": ".models",
+    "SOI220nm_1550nm_TE_STRIP_90_Degree_Bend": ".models",
+    "cs_gc_silicon_1550nm": ".models",
+    "Spec": ".cross_section",
+    "heater": ".cross_section",
+    "heater_450": ".cross_section",
+    "metal_pad": ".cross_section",
+    "heater_pad": ".cross_section",
+    "pn": ".cross_section",
+    "pn_450_with_metal_and_heater": ".cross_section",
+    "pn_450_with_heater": ".cross_section",
+    "pn_450_with_metal": ".cross_section",
+    "metal": ".cross_section",
+    "filament": ".cross_section",
+    "rib": ".cross_section",
+    "rib_450": ".cross_section",
+    "run_drc": ".drc",
+}
 
 __all__ = [
     "LAYER",
@@ -40,4 +50,14 @@ __all__ = [
     "SOI220nm_1550nm_TE_STRIP_2x2_MMI",
     "SOI220nm_1550nm_TE_RIB_Grating_Coupler",
     "SOI220nm_1550nm_TE_STRIP_90_Degree_Bend"
-]
\ No newline at end of file
+]
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
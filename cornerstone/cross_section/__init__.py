@@ -1,18 +1,54 @@
-import yaml
-import os
+from functools import cache
+from importlib import import_module
 from pathlib import Path
 
-from dataclasses import dataclass
-from pylayout.cross_section import CrossSectionSpecs
+# default to the cs_spec.yml next to this file, independent of the working directory
+filepath = Path(__file__).parent / 'cs_spec.yml'
 
-# default to the cs_spec.yml
-filepath = os.curdir / Path(r'cornerstone/cross_section/cs_spec.yml')
-with open(filepath, 'r', encoding="utf-8") as f:
-    data = yaml.load(f, Loader=yaml.FullLoader)
-Spec = CrossSectionSpecs(**data)
+_LAZY = {
+    "heater": ".heater",
+    "heater_450": ".heater",
+    "metal_pad": ".pads",
+    "heater_pad": ".pads",
+    "metal_pad_array": ".pads",
+    "heater_pad_array": ".pads",
+    "pn": ".pn",
+    "pn_450_with_metal_and_heater": ".pn",
+    "pn_450_with_heater": ".pn",
+    "pn_450_with_metal": ".pn",
+    "metal": ".trace",
+    "filament": ".trace",
+    "rib": ".wg",
+    "rib_450": ".wg",
+}
 
-from .heater import heater, heater_450
-from .pads import metal_pad, heater_pad
-from .pn import pn, pn_450_with_metal_and_heater, pn_450_with_heater, pn_450_with_metal
-from .trace import metal, filament
-from .wg import rib, rib_450
+@cache
+def load_spec(path: Path = filepath):
+    """
+    Parse the cross-section specification file, once per path.
+
+    Args:
+        path [Path]: yaml file with the CrossSectionSpecs fields
+    """
+    import yaml
+    from pylayout.cross_section import CrossSectionSpecs
+    from pylayout.cache import register_dependency
+
+    with open(path, 'r', encoding="utf-8") as f:
+        data = yaml.load(f, Loader=yaml.FullLoader)
+
+    # cached cells depend on the specification and on the PDK code
+    register_dependency(path, Path(__file__).parents[1])
+    return CrossSectionSpecs(**data)
+
+def __getattr__(name: str):
+    if name == "Spec":
+        return load_spec()
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | {"Spec"})
@@ -19,7 +19,7 @@ heater_pad = partial(
 
 metal_pad_array = partial(
     gf.components.array,
-    component=metal_pad(),
+    component=metal_pad,
     spacing=(MSpec.pad_width, MSpec.pad_height),
     rows=1,
     centered=True,
@@ -27,7 +27,7 @@ metal_pad_array = partial(
 
 heater_pad_array = partial(
     gf.components.array,
-    component=heater_pad(),
+    component=heater_pad,
     spacing=(MSpec.pad_spacing, MSpec.pad_spacing),
     rows=1,
     centered=True,
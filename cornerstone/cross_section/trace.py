@@ -1,9 +1,13 @@
 from functools import partial
 
-from gdsfactory.cross_section import cross_section
+from gdsfactory.cross_section import cross_section as gf_cross_section
+from pylayout.cross_section import memoize_cross_section
 from cornerstone.cross_section import Spec
 from cornerstone import LAYER
 
+# the same spec resolves to the same CrossSection object
+cross_section = memoize_cross_section(gf_cross_section)
+
 metal = partial(
     cross_section,
     offset=0,
@@ -0,0 +1,468 @@
+"""
+Headless DRC for the CORNERSTONE SOI platform. The rules mirror CORNERSTONE_DRC_SOI_v2_0.lydrc
+(grid, design area, minimum width and minimum gap) and run on klayout.db regions, so that
+generated structures can be checked from a script without opening the KLayout GUI.
+
+    >> from cornerstone.drc import run_drc
+    >> report = run_drc(component)
+    >> report.passed, report.count_by_rule()
+
+It can also be run on a file:
+
+    python -m cornerstone.drc chip.gds [--full-block | --half-block] [--rdb chip.lyrdb]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import gdsfactory as gf
+from gdsfactory.typings import Component, Dict, List, Tuple, Union
+
+from pylayout import cache
+
+DESIGN_GRID = 0.001 # um
+ANGLE_LIMIT = 1 # degree
+MAX_FEATURE_LENGTH_ETCH1 = 20.01 # um
+FULL_BLOCK_AREA = 4900.0*11470.0 # um2
+HALF_BLOCK_AREA = 4900.0*5500.0 # um2
+DESIGN_AREA_LAYER = (99, 0)
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A single DRC rule.
+
+    Args:
+        name [str]: short unique name of the rule
+        layer [Tuple[int, int]]: GDS layer and datatype
+        kind [str]: "width", "space" or "grid"
+        value [float]: minimum width/space or grid in um
+        description [str]: message of the rule in the rule deck
+        min_area [float]: only report violations whose marker is at least this area in um2 (0 reports all)
+    """
+    name: str
+    layer: Tuple[int, int]
+    kind: str
+    value: float
+    description: str
+    min_area: float = 0
+
+def _width_space(name: str, layer: Tuple[int, int], width: float, space: float, width_msg: str, space_msg: str) -> List[Rule]:
+    return [
+        Rule(f"{name}.width", layer, "width", width, width_msg),
+        Rule(f"{name}.space", layer, "space", space, space_msg),
+    ]
+
+RULES: List[Rule] = [
+    *_width_space("etch1_dark", (6, 0), 0.20, 0.25,
+        "Minimum feature size violation (GDS6<200nm)", "Minimum gap violation (GDS6< 250nm)"),
+    Rule("etch1_dark.space_long", (6, 0), "space", 0.35,
+        "Minimum gap violation (GDS6< 350nm and shorter than < max. length)",
+        min_area=MAX_FEATURE_LENGTH_ETCH1*0.25),
+    *_width_space("etch2_light", (3, 0), 0.35, 0.20,
+        "Minimum feature size violation (GDS3<350 nm)", "Minimum gap violation (GDS3 < 200 nm)"),
+    *_width_space("etch2_dark", (4, 0), 0.20, 0.35,
+        "Minimum feature size violation (GDS4<200 nm)", "Minimum gap violation (GDS4 < 350 nm)"),
+    *_width_space("etch3_light", (5, 0), 0.25, 0.25,
+        "Minimum feature size violation (GDS5<250 nm)", "Minimum gap violation (GDS5 < 250 nm)"),
+    *_width_space("filament", (39, 0), 0.6, 10.0,
+        "Minimum width violation (GDS39 < 600 nm)", "Minimum gap violation (GDS39 < 10 um)"),
+    *_width_space("pad", (41, 0), 2.0, 10.0,
+        "Minimum width violation (GDS41 < 2 um)", "Minimum gap violation (GDS41 < 10 um)"),
+    *_width_space("label", (100, 0), 0.25, 0.25,
+        "Minimum width violation (GDS100 < 250nm)", "Minimum gap violation (GDS100 < 250nm)"),
+    # active run layers
+    *_width_space("p_low_implant", (7, 0), 0.5, 0.5,
+        "Minimum width violation (GDS7 < 500 nm)", "Minimum gap violation (GDS7 < 500 nm)"),
+    *_width_space("n_low_implant", (8, 0), 0.5, 0.5,
+        "Minimum width violation (GDS8 < 500 nm)", "Minimum gap violation (GDS8 < 500 nm)"),
+    *_width_space("p_high_implant", (9, 0), 0.5, 0.5,
+        "Minimum width violation (GDS9 < 500 nm)", "Minimum gap violation (GDS9 < 500 nm)"),
+    *_width_space("n_high_implant", (11, 0), 0.5, 0.5,
+        "Minimum width violation (GDS11 < 500 nm)", "Minimum gap violation (GDS11< 500 nm)"),
+    *_width_space("vias", (12, 0), 3.0, 5.0,
+        "Minimum width violation (GDS12 < 3 um)", "Minimum gap violation (GDS12 < 5 um)"),
+    *_width_space("electrodes", (13, 0), 3.0, 5.0,
+        "Minimum width violation (GDS13 < 3 um)", "Minimum gap violation (GDS13 < 5 um)"),
+    *_width_space("defect", (23, 0), 5.0, 5.0,
+        "Minimum width violation (GDS23 < 5 um)", "Minimum gap violation (GDS23 < 5 um)"),
+]
+
+# tiling processor scripts, "a" is the input layer
+_EXPRESSIONS = {
+    "width": "a.width_check(d, false, Metrics.Euclidian, alim)",
+    "space": "a.space_check(d, false, Metrics.Euclidian, alim)",
+    "grid": "a.grid_check(d, d)",
+}
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    A DRC violation.
+
+    Args:
+        rule [str]: name of the violated rule
+        description [str]: message of the violated rule
+        layer [Tuple[int, int]]: GDS layer and datatype
+        marker [gf.kdb.DPolygon]: marker of the violation in um
+    """
+    rule: str
+    description: str
+    layer: Tuple[int, int]
+    marker: gf.kdb.DPolygon
+
+    @property
+    def bbox(self) -> gf.kdb.DBox:
+        return self.marker.bbox()
+
+@dataclass
+class DRCReport:
+    """
+    Result of a DRC run.
+
+    Args:
+        cell [str]: name of the checked top cell
+        violations [List[Violation]]: all violations found
+    """
+    cell: str
+    violations: List[Violation] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    def count_by_rule(self) -> Dict[str, int]:
+        return dict(Counter(v.rule for v in self.violations))
+
+    def by_rule(self, rule: str) -> List[Violation]:
+        return [v for v in self.violations if v.rule == rule]
+
+    def write_rdb(self, filepath: Path) -> None:
+        """
+        Save the violations as a KLayout marker database (.lyrdb) to be inspected in the GUI.
+        """
+        from klayout import rdb
+
+        db = rdb.ReportDatabase("DRC_SOI")
+        top = db.create_cell(self.cell)
+        categories = {}
+        for v in self.violations:
+            if v.rule not in categories:
+                categories[v.rule] = db.create_category(v.description)
+            db.create_item(top.rdb_id(), categories[v.rule].rdb_id()).add_value(v.marker)
+        db.save(str(filepath))
+
+    def __str__(self) -> str:
+        if self.passed:
+            return f"{self.cell}: DRC clean"
+        lines = [f"{self.cell}: {len(self.violations)} violation(s)"]
+        lines += [f"  {rule}: {count}" for rule, count in sorted(self.count_by_rule().items())]
+        return "\n".join(lines)
+
+def _open(target: Union[Component, Path, str], top_cell: str = None) -> Tuple[gf.kdb.Layout, gf.kdb.Cell]:
+    if isinstance(target, gf.Component):
+        return target.kcl.layout, target._kdb_cell
+
+    layout = gf.kdb.Layout()
+    layout.read(str(target))
+    cell = layout.cell(top_cell) if top_cell else layout.top_cell()
+    if cell is None:
+        raise ValueError(f"Cannot find the top cell {top_cell or ''} in {target}")
+    return layout, cell
+
+def _check_shapes(
+    shapes: gf.kdb.RecursiveShapeIterator,
+    dbu: float,
+    rule: Rule,
+    tiles: float = None,
+    threads: int = 1,
+) -> gf.kdb.EdgePairs:
+    tp = gf.kdb.TilingProcessor()
+    tp.input("a", shapes)
+    tp.dbu = dbu
+    tp.threads = threads
+    if tiles is not None:
+        tp.tile_size(tiles, tiles)
+        tp.tile_border(rule.value, rule.value)
+
+    result = gf.kdb.EdgePairs()
+    tp.output("o", result)
+    tp.var("d", int(round(rule.value/dbu)))
+    tp.var("alim", float(ANGLE_LIMIT))
+    tp.queue(f"_output(o, {_EXPRESSIONS[rule.kind]})")
+    tp.execute(rule.name)
+
+    # a violation close to a tile boundary is reported by every tile it touches
+    result = gf.kdb.EdgePairs(list(set(result.each())))
+    if rule.min_area:
+        result = result.with_area(0, int(round(rule.min_area/dbu**2)), True)
+    return result
+
+def check_rule(
+    layout: gf.kdb.Layout,
+    cell: gf.kdb.Cell,
+    rule: Rule,
+    tiles: float = 1000,
+    threads: int = 4,
+) -> gf.kdb.EdgePairs:
+    """
+    Run a single width/space/grid rule on a cell and return the violations in database units.
+
+    Args:
+        layout [gf.kdb.Layout]: layout holding the cell
+        cell [gf.kdb.Cell]: cell to be checked, including its children
+        rule [Rule]: rule to be checked
+        tiles [float]: tile size in um, None checks the cell in one piece
+        threads [int]: number of threads
+    """
+    layer = layout.find_layer(*rule.layer)
+    if layer is None:
+        return gf.kdb.EdgePairs()
+    return _check_shapes(cell.begin_shapes_rec(layer), layout.dbu, rule, tiles, threads)
+
+# version of the cached cell verdicts, bump it whenever the checks change
+_CACHE_VERSION = 1
+# verdicts of the unique cells checked in this process, keyed like the files on disk
+_cell_results: Dict[str, Dict[str, gf.kdb.EdgePairs]] = {}
+
+def _cell_hash(layout: gf.kdb.Layout, cell: gf.kdb.Cell, hashes: Dict[int, str]) -> str:
+    h = hashlib.sha256()
+    for layer in layout.layer_indexes():
+        shapes = cell.shapes(layer)
+        if shapes.is_empty():
+            continue
+        info = layout.get_info(layer)
+        h.update(f"L{info.layer}/{info.datatype}".encode())
+        for shape in sorted(str(shape) for shape in shapes.each()):
+            h.update(shape.encode())
+
+    instances = []
+    for inst in cell.each_inst():
+        array = inst.cell_inst
+        placement = f"{array.cplx_trans}"
+        if array.is_regular_array():
+            placement += f" {array.a} {array.b} {array.na} {array.nb}"
+        instances.append(f"{hashes[inst.cell_index]} {placement}")
+    for inst in sorted(instances):
+        h.update(inst.encode())
+    return h.hexdigest()
+
+def _rule_key(rule: Rule, dbu: float) -> str:
+    return f"{rule!r} {ANGLE_LIMIT} {dbu}"
+
+def _overlapping_boxes(boxes: List[gf.kdb.Box]) -> List[gf.kdb.Box]:
+    # sweep along x, only boxes whose x ranges overlap are compared
+    boxes = sorted(boxes, key=lambda box: box.left)
+    overlaps, active = [], []
+    for box in boxes:
+        active = [other for other in active if other.right > box.left]
+        overlaps += [box & other for other in active if box.overlaps(other)]
+        active.append(box)
+    return overlaps
+
+def _interaction_zone(layout: gf.kdb.Layout, cell: gf.kdb.Cell, layer: int, distance: int) -> gf.kdb.Region:
+    """
+    Areas of a cell where its verdict cannot be taken from the children alone: around its
+    own shapes and where two child instances (or array elements) come within distance.
+    """
+    zone = gf.kdb.Region()
+    for shape in cell.shapes(layer).each():
+        zone.insert(shape.bbox().enlarged(distance, distance))
+
+    boxes = []
+    for inst in cell.each_inst():
+        bbox = layout.cell(inst.cell_index).bbox(layer)
+        if bbox.empty():
+            continue
+        boxes += [bbox.transformed(trans).enlarged(distance, distance) for trans in inst.cell_inst.each_cplx_trans()]
+    for box in _overlapping_boxes(boxes):
+        zone.insert(box)
+    return zone.merged()
+
+def _load_verdict(key: str) -> Dict[str, gf.kdb.EdgePairs]:
+    if key in _cell_results:
+        return _cell_results[key]
+    if cache.CACHE_DIR is None:
+        return None
+
+    filepath = cache.CACHE_DIR / "drc" / f"{key}.json"
+    try:
+        data = json.loads(filepath.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    os.utime(filepath)  # mark as recently used for the LRU eviction
+    verdict = {rule: gf.kdb.EdgePairs([gf.kdb.EdgePair.from_s(ep) for ep in edge_pairs]) for rule, edge_pairs in data.items()}
+    _cell_results[key] = verdict
+    return verdict
+
+def _store_verdict(key: str, verdict: Dict[str, gf.kdb.EdgePairs]) -> None:
+    _cell_results[key] = verdict
+    if cache.CACHE_DIR is None:
+        return
+
+    directory = cache.CACHE_DIR / "drc"
+    directory.mkdir(parents=True, exist_ok=True)
+    data = {rule: [str(ep) for ep in edge_pairs.each()] for rule, edge_pairs in verdict.items()}
+    tmp = directory / f"{key}.json.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, directory / f"{key}.json")
+    cache._evict(cache.CACHE_DIR, cache.CACHE_MAX_BYTES)
+
+def _check_cell(
+    layout: gf.kdb.Layout,
+    cell: gf.kdb.Cell,
+    rules: List[Rule],
+    hashes: Dict[int, str],
+    verdicts: Dict[int, Dict[str, gf.kdb.EdgePairs]],
+) -> None:
+    for child in cell.each_child_cell():
+        if child not in verdicts:
+            _check_cell(layout, layout.cell(child), rules, hashes, verdicts)
+
+    hashes[cell.cell_index()] = _cell_hash(layout, cell, hashes)
+    rules = [
+        (rule, layout.find_layer(*rule.layer)) for rule in rules
+        if layout.find_layer(*rule.layer) is not None and not cell.bbox(layout.find_layer(*rule.layer)).empty()
+    ]
+    key = hashlib.sha256(
+        " ".join([str(_CACHE_VERSION), hashes[cell.cell_index()]] + [_rule_key(rule, layout.dbu) for rule, _ in rules]).encode()
+    ).hexdigest()
+
+    verdict = _load_verdict(key)
+    if verdict is None:
+        verdict = {}
+        for rule, layer in rules:
+            # violations of the children hold wherever nothing else comes close to them
+            inherited = gf.kdb.EdgePairs()
+            for inst in cell.each_inst():
+                child = verdicts[inst.cell_index].get(rule.name)
+                if child is None or child.is_empty():
+                    continue
+                for trans in inst.cell_inst.each_cplx_trans():
+                    inherited.insert(child.transformed(trans))
+
+            distance = int(round(rule.value/layout.dbu))
+            zone = _interaction_zone(layout, cell, layer, distance)
+            if not zone.is_empty():
+                inherited = inherited.not_interacting(zone)
+                shapes = gf.kdb.RecursiveShapeIterator(layout, cell, layer, zone.sized(2*distance), False)
+                inherited += _check_shapes(shapes, layout.dbu, rule).interacting(zone)
+            verdict[rule.name] = inherited
+        _store_verdict(key, verdict)
+    verdicts[cell.cell_index()] = verdict
+
+def check_hierarchical(
+    layout: gf.kdb.Layout,
+    cell: gf.kdb.Cell,
+    rules: List[Rule],
+) -> Dict[str, gf.kdb.EdgePairs]:
+    """
+    Check every unique cell of the hierarchy once, bottom up. A cell inherits the violations of
+    its children and only the zones where its own shapes or two placements interact are checked
+    again. Verdicts are cached by a geometry hash of the cell (and the rules), in memory and
+    under the pylayout cache directory when it is set, so unchanged cells are never re-checked.
+
+    Args:
+        layout [gf.kdb.Layout]: layout holding the cell
+        cell [gf.kdb.Cell]: top cell to be checked
+        rules [List[Rule]]: rules to be checked
+
+    Returns:
+        Dict[str, gf.kdb.EdgePairs]: violations of the top cell in database units, by rule name
+    """
+    verdicts = {}
+    _check_cell(layout, cell, rules, {}, verdicts)
+    return verdicts[cell.cell_index()]
+
+def _grid_rules(layout: gf.kdb.Layout) -> List[Rule]:
+    rules = []
+    for layer in layout.layer_indexes():
+        info = layout.get_info(layer)
+        rules.append(Rule(
+            f"grid.{info.layer}.{info.datatype}", (info.layer, info.datatype), "grid", DESIGN_GRID,
+            f"{info.layer}/{info.datatype} grid violations",
+        ))
+    return rules
+
+def _design_area_violations(layout: gf.kdb.Layout, cell: gf.kdb.Cell, design_area: float) -> List[Violation]:
+    layer = layout.find_layer(*DESIGN_AREA_LAYER)
+    if layer is None:
+        return []
+    area = int(round(design_area/layout.dbu**2))
+    region = gf.kdb.Region(cell.begin_shapes_rec(layer)).with_area(area, area + 1, True)
+    return [
+        Violation("design_area", "Correct desing area violation", DESIGN_AREA_LAYER, polygon.to_dtype(layout.dbu))
+        for polygon in region.each()
+    ]
+
+def _to_violations(rule: Rule, edge_pairs: gf.kdb.EdgePairs, dbu: float) -> List[Violation]:
+    return [
+        Violation(rule.name, rule.description, rule.layer, ep.polygon(0).to_dtype(dbu))
+        for ep in edge_pairs.each()
+    ]
+
+def run_drc(
+    target: Union[Component, Path, str],
+    rules: List[Rule] = None,
+    full_block: bool = True,
+    tiles: float = 1000,
+    threads: int = 4,
+    top_cell: str = None,
+    hierarchical: bool = False,
+) -> DRCReport:
+    """
+    Run the CORNERSTONE SOI pre-DRC on a component or a GDS/OASIS file.
+
+    Args:
+        target [Component | Path]: component or layout file to be checked
+        rules [List[Rule]]: width/space rules, defaults to RULES. The grid and design area rules are always checked.
+        full_block [bool]: full block (4900 x 11470 um) or half block (4900 x 5500 um) design area
+        tiles [float]: tile size in um, None checks the layout in one piece
+        threads [int]: number of threads
+        top_cell [str]: top cell to be checked in a layout file, defaults to the single top cell
+        hierarchical [bool]: check each unique cell once and reuse cached verdicts, see check_hierarchical. tiles and threads are not used.
+
+    Returns:
+        DRCReport: violations found, with markers in um
+    """
+    layout, cell = _open(target, top_cell)
+    rules = RULES if rules is None else rules
+
+    report = DRCReport(cell.name)
+    report.violations += _design_area_violations(layout, cell, FULL_BLOCK_AREA if full_block else HALF_BLOCK_AREA)
+    rules = _grid_rules(layout) + list(rules)
+    if hierarchical:
+        verdict = check_hierarchical(layout, cell, rules)
+        for rule in rules:
+            report.violations += _to_violations(rule, verdict.get(rule.name, gf.kdb.EdgePairs()), layout.dbu)
+        return report
+
+    for rule in rules:
+        report.violations += _to_violations(rule, check_rule(layout, cell, rule, tiles, threads), layout.dbu)
+    return report
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="CORNERSTONE SOI pre-DRC")
+    parser.add_argument("filepath", type=Path, help="GDS or OASIS file")
+    parser.add_argument("--top-cell", default=None)
+    parser.add_argument("--half-block", action="store_true", help="check against the half block design area")
+    parser.add_argument("--tiles", type=float, default=1000, help="tile size in um")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--hierarchical", action="store_true", help="check each unique cell once, with cached verdicts")
+    parser.add_argument("--rdb", type=Path, default=None, help="save the markers as a KLayout marker database")
+    args = parser.parse_args(argv)
+
+    report = run_drc(args.filepath, full_block=not args.half_block, tiles=args.tiles, threads=args.threads,
+        top_cell=args.top_cell, hierarchical=args.hierarchical)
+    print(report)
+    if args.rdb is not None:
+        report.write_rdb(args.rdb)
+    return 0 if report.passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -103,8 +103,18 @@ def get_layer_stack(
     )
 
 
-LAYER_STACK = get_layer_stack()
-LAYER_VIEWS = gf.technology.LayerViews(f"{Path().absolute()}/cornerstone/layers.yaml")
+LAYER_VIEWS_PATH = Path(__file__).parent / "layers.yaml"
+
+def __getattr__(name: str):
+    # the layer stack and views are only built when they are first used
+    if name == "LAYER_STACK":
+        value = get_layer_stack()
+    elif name == "LAYER_VIEWS":
+        value = gf.technology.LayerViews(LAYER_VIEWS_PATH)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
 class Tech:
@@ -1,6 +1,7 @@
 from os.path import dirname
 from pathlib import Path
-from functools import partial
+from functools import cache, partial
+from typing import NamedTuple
 
 import gdsfactory as gf
 
@@ -10,6 +11,9 @@ from cornerstone.layer import LAYER
 from cornerstone.cross_section import rib_450
 
 GDS_PATH = Path(dirname(__file__)) / 'GDSII_2022.gds'
+OAS_PATH = Path(dirname(__file__)) / 'GDSII_2022.oas'
+# the OASIS copy holds the same cells and is the faster of the two to read
+LIBRARY_PATH = OAS_PATH
 
 add_ports_optical = partial(
     gf.add_ports.add_ports_from_markers_inside, pin_layer=(3,0), port_layer=(3,0)
@@ -17,88 +21,157 @@ add_ports_optical = partial(
 add_ports = gf.compose(add_ports_optical)
 import_gds = partial(gf.import_gds, post_process=add_ports)
 
+
+class FoundryPort(NamedTuple):
+    """
+    Port of a foundry cell. x and y are measured from the centre of the cell bounding box,
+    or from its east/west edge for x if anchor is "east"/"west".
+    """
+    name: str
+    x: float
+    y: float
+    orientation: float
+    width: float = 0.45
+    anchor: str = "center"
+
+
+MMI_2X1_LENGTH, MMI_2X1_SEP = 92.7, 2.69
+MMI_2X2_LENGTH, MMI_2X2_SEP = 104.8, 1.58
+STRIP_GC_LENGTH = 392.0
+WG_WIDTH = 0.45
+
+# ports of the foundry cells, added when a cell is copied out of the library
+FOUNDRY_PORTS = {
+    'SOI220nm_1550nm_TE_RIB_2x1_MMI': (
+        FoundryPort('o1', MMI_2X1_LENGTH/2, 0, 0),
+        FoundryPort('o2', -MMI_2X1_LENGTH/2, (MMI_2X1_SEP + WG_WIDTH)/2, 180),
+        FoundryPort('o3', -MMI_2X1_LENGTH/2, -(MMI_2X1_SEP + WG_WIDTH)/2, 180),
+    ),
+    'SOI220nm_1550nm_TE_RIB_2x2_MMI': (
+        FoundryPort('o1', -MMI_2X2_LENGTH/2, (MMI_2X2_SEP + WG_WIDTH)/2, 180),
+        FoundryPort('o2', -MMI_2X2_LENGTH/2, -(MMI_2X2_SEP - WG_WIDTH)/2, 180),
+        FoundryPort('o3', MMI_2X2_LENGTH/2, -(MMI_2X2_SEP + WG_WIDTH)/2, 0),
+        FoundryPort('o4', MMI_2X2_LENGTH/2, (MMI_2X2_SEP - WG_WIDTH)/2, 0),
+    ),
+    'SOI220nm_1550nm_TE_RIB_Grating_Coupler': (
+        FoundryPort('o1', 0, 0, 0, anchor='east'),
+    ),
+    'SOI220nm_1550nm_TE_STRIP_Grating_Coupler': (
+        FoundryPort('o1', STRIP_GC_LENGTH/2, 0, 180),
+        FoundryPort('o2', -STRIP_GC_LENGTH/2, 0, 0, width=10.0),
+    ),
+}
+
+# cells that carry their ports as pin markers instead
+FOUNDRY_MARKER_PORTS = {'SOI220nm_1550nm_TM_STRIP_Grating_Coupler'}
+
+
+@cache
+def foundry_library(path: Path = None) -> gf.kdb.Layout:
+    """
+    Read the foundry GDS/OASIS library once per process.
+
+    Args:
+        path [Path]: library file, defaults to LIBRARY_PATH
+
+    Returns:
+        gf.kdb.Layout: layout holding every foundry cell
+    """
+    layout = gf.kdb.Layout()
+    layout.read(str(path or LIBRARY_PATH))
+    return layout
+
+
+def foundry_cell(cellname: str, path: Path = None) -> gf.Component:
+    """
+    Copy a cell out of the shared foundry library and add its ports from FOUNDRY_PORTS.
+
+    Args:
+        cellname [str]: name of the foundry cell
+        path [Path]: library file, defaults to LIBRARY_PATH
+
+    Returns:
+        gf.Component: copy of the foundry cell
+    """
+    library = foundry_library(path)
+    if not library.has_cell(cellname):
+        raise ValueError(f"{cellname} is not in the foundry library {path or LIBRARY_PATH}")
+
+    c = gf.Component()
+    c._kdb_cell.copy_tree(library.cell(cellname))
+    c.rebuild()
+
+    box = c.dbbox()
+    anchors = {'center': box.center().x, 'east': box.right, 'west': box.left}
+    for port in FOUNDRY_PORTS.get(cellname, ()):
+        c.add_port(
+            name=port.name,
+            center=(anchors[port.anchor] + port.x, box.center().y + port.y),
+            width=port.width,
+            orientation=port.orientation,
+            layer=LAYER.WG,
+        )
+
+    if cellname in FOUNDRY_MARKER_PORTS:
+        add_ports(c)
+    return c
+
+
 @gf.cell
 def SOI220nm_1550nm_TE_MZI_Modulator() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_MZI_Modulator')
+    return foundry_cell('SOI220nm_1550nm_TE_MZI_Modulator')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_2x1_MMI() -> gf.Component:
-    c = gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_2x1_MMI')
-    x, y = c.dx, c.dy
-    length = 92.7
-    sep = 2.69
-    wg_width = 0.45
-    c.add_port(name='o1', center=(x+length/2, y), width=wg_width, orientation=0, layer=LAYER.WG)
-    c.add_port(name='o2', center=(x-length/2, y+(sep+wg_width)/2), width=wg_width, orientation=180, layer=LAYER.WG)
-    c.add_port(name='o3', center=(x-length/2, y-(sep+wg_width)/2), width=wg_width, orientation=180, layer=LAYER.WG)
-    return c
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_2x1_MMI')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_2x2_MMI() -> gf.Component:
-    c = gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_2x2_MMI')
-    x, y = c.dx, c.dy
-    length = 104.8
-    sep = 1.58
-    wg_width = 0.45
-    c.add_port(name='o1', center=(x-length/2, y+(sep+wg_width)/2), width=wg_width, orientation=180, layer=LAYER.WG)
-    c.add_port(name='o2', center=(x-length/2, y-(sep-wg_width)/2), width=wg_width, orientation=180, layer=LAYER.WG)
-    c.add_port(name='o3', center=(x+length/2, y-(sep+wg_width)/2), width=wg_width, orientation=0, layer=LAYER.WG)
-    c.add_port(name='o4', center=(x+length/2, y+(sep-wg_width)/2), width=wg_width, orientation=0, layer=LAYER.WG)
-    return c
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_2x2_MMI')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_90_Degree_Bend() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_90_Degree_Bend')
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_90_Degree_Bend')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_Waveguide() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_Waveguide')
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_Waveguide')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_Waveguide_Crossing() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_Waveguide_Crossing')
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_Waveguide_Crossing')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_2x1_MMI() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_2x1_MMI')
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_2x1_MMI')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_2x2_MMI() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_2x2_MMI')
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_2x2_MMI')
 
 @gf.cell
 def SOI220nm_1550nm_TE_RIB_Grating_Coupler() -> gf.Component:
-    c = gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_RIB_Grating_Coupler')
-    c.add_port(name='o1', center=(c.dxmax, c.dy), width=0.45, orientation=0, layer=LAYER.WG)
-    return c
+    return foundry_cell('SOI220nm_1550nm_TE_RIB_Grating_Coupler')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_90_Degree_Bend() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_90_Degree_Bend')
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_90_Degree_Bend')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_Waveguide() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_Waveguide')
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_Waveguide')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_Waveguide_Crossing() -> gf.Component:
-    return gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_Waveguide_Crossing')
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_Waveguide_Crossing')
 
 @gf.cell
 def SOI220nm_1550nm_TE_STRIP_Grating_Coupler() -> gf.Component:
-    c = gf.import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TE_STRIP_Grating_Coupler')
-    
-    length = 392.0
-    width = 10.0
-    wg_width = 0.45
-    c.add_port(name='o1', center=(c.dx+length/2, c.dy), width=wg_width, orientation=180, layer=LAYER.WG)
-    c.add_port(name='o2', center=(c.dx-length/2, c.dy), width=width, orientation=0, layer=LAYER.WG)
-
-    return c
+    return foundry_cell('SOI220nm_1550nm_TE_STRIP_Grating_Coupler')
 
 @gf.cell
 def SOI220nm_1550nm_TM_STRIP_Grating_Coupler() -> gf.Component:
-    return import_gds(GDS_PATH, cellname='SOI220nm_1550nm_TM_STRIP_Grating_Coupler')
+    return foundry_cell('SOI220nm_1550nm_TM_STRIP_Grating_Coupler')
 
 
 cs_gc_silicon_1550nm = partial(
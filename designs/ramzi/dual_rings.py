@@ -17,6 +17,7 @@ from cornerstone import (
 from pylayout.components import ring, straight_with_filament, attach_grating_coupler, mmi_splitter
 from pylayout.methods import connect_all
 from ..test_structures import ring_and_mzi_heater, single_ring_filament_gssg
+from pylayout.build import maybe_flatten
 
 @gf.cell
 def ramzi_dual_rings(
@@ -70,7 +71,7 @@ def ramzi_dual_rings(
     c.add_port(name="o2", port=rsplitter_ref.ports["o1"])
     c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 if __name__ == "__main__":
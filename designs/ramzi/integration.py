@@ -1,3 +1,5 @@
+import sys
+
 import gdsfactory as gf
 from gdsfactory.typings import CrossSectionSpec
 
@@ -8,6 +10,8 @@ from cornerstone import rib_450, pn_450_with_metal_and_heater, pn_450_with_metal
 
 from .dual_rings import ramzi_dual_rings_gsgsg_gsgsg, ramzi_dual_rings_gsgsg_gssg
 from .one_ring import ramzi_one_ring
+from pylayout.build import maybe_flatten
+from pylayout.stream import StreamWriter
 
 @gf.cell
 def integrate_all_structures(
@@ -150,7 +154,7 @@ def integrate_all_structures(
         com_ref.dymax = 0
         xmax = com_ref.dxmax
 
-    c.flatten()
+    maybe_flatten(c)
     
     return c
 
@@ -179,7 +183,23 @@ if __name__ == "__main__":
     r1, gap1, h1, dy1 = design_vars[0]
     r2, gap2, h2, dy2 = design_vars[1]
 
+    # the die is shown in KLayout by default. With an output file (python -m
+    # designs.ramzi.integration ramzi.oas) every integrated block is written to it as soon
+    # as it is placed and released instead, so the memory does not grow with the number of gaps
+    filepath = sys.argv[1] if len(sys.argv) > 1 else None
+    sink = StreamWriter(filepath, top="RAMZI") if filepath else None
     c = gf.Component()
+
+    def place(com: gf.Component, origin: tuple, release: bool = True) -> gf.kdb.DBox:
+        if sink is not None:
+            return sink.place(com, origin, release=release)
+        ref = c.add_ref(com)
+        ref.dmove(origin)
+        return ref.dbbox()
+
+    def die() -> gf.kdb.DBox:
+        return sink.dbbox() if sink is not None else c.dbbox()
+
     ysizes = []
     ymin = 0
     for g1, g2 in zip(gap1, gap2):
@@ -201,6 +221,8 @@ if __name__ == "__main__":
             singles_length=singles_length,
             spacing=spacing
         )
+        c1_box = place(c1, (0, ymin - spacing - c1.dymax))
+
         c2 = integrate_all_structures(
             wg=wg,
             pn_ring=pn,
@@ -219,27 +241,22 @@ if __name__ == "__main__":
             singles_length=singles_length,
             spacing=spacing
         )
+        place(c2, (c1_box.right + spacing - c2.dxmin, c1_box.top - c2.dymax))
 
-        c1_ref = c.add_ref(c1)
-        c2_ref = c.add_ref(c2)
-        c2_ref.dxmin = c1_ref.dxmax + spacing
-        c1_ref.dymax = ymin - spacing
-        c2_ref.dymax = c1_ref.dymax
-        ymin = c.dymin
-        ysizes.append(c.dysize)
+        ymin = die().bottom
+        ysizes.append(die().height())
 
     # place the marker to the left and right of it
     marker = dice_marker(layer=LAYER.METAL)
-    xmin, xmax = c.dxmin, c.dxmax
-    ymax = c.dymax
+    xmin, xmax = die().left, die().right
+    ymax = die().top
     ysizes.insert(0, 0)
     for i, ysize in enumerate(ysizes):
-        marker1_ref, marker2_ref = [c.add_ref(marker) for _ in range(2)]
-        marker1_ref.dxmax = xmin - marker_spacing
-        marker2_ref.dxmin = xmax + marker_spacing
-        marker1_ref.dymin = ymax + marker_spacing if i == 0 else ymax + marker_spacing - ysize - spacing
-        marker2_ref.dymin = marker1_ref.dymin
-
-    c.show()
-
+        y = ymax + marker_spacing if i == 0 else ymax + marker_spacing - ysize - spacing
+        place(marker, (xmin - marker_spacing - marker.dxmax, y - marker.dymin), release=False)
+        place(marker, (xmax + marker_spacing - marker.dxmin, y - marker.dymin), release=False)
 
+    if sink is not None:
+        sink.close()
+    else:
+        c.show()
@@ -2,6 +2,7 @@ import numpy as np
 rng = np.random.default_rng()
 
 from designs.test_structures.bends import bend_loss, bend_loss_pn
+from designs.test_structures.cutback import cutback, cutback_serpentine
 from designs.test_structures.coupling import cross_coupling
 from designs.test_structures.dummy import dummy_waveguide
 from designs.test_structures.pnring import single_ring_pn
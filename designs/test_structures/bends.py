@@ -1,9 +1,13 @@
 import numpy as np
 import gdsfactory as gf
-from gdsfactory.typings import List, CrossSectionSpec
+from gdsfactory.typings import Component, List, CrossSectionSpec
 
 from . import rng
 from pylayout.components import attach_grating_coupler, ring_pn_section, add_norm_wg
+from pylayout.array import add_array
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude, extrude_straight
+from pylayout.path import PathBuilder
 from cornerstone import rib_450, pn, cs_gc_silicon_1550nm
 from .straight import straight
 
@@ -18,16 +22,59 @@ def _bend_360(radius: float) -> gf.Path:
     Returns:
         360 degree bend.
     """
-    path = gf.Path()
+    path = PathBuilder()
     angles = [90, -90, -90, 90]
     for angle in angles:
         path += gf.path.arc(radius=radius, angle=angle)
-    return path
+    return path.path()
+
+@gf.cell
+def _bend_motif(radius: float, wg: CrossSectionSpec, pn_ring: Component = None, length: float = 0) -> Component:
+    """
+    One period of a bend loss structure: a 360 degree bend followed by a straight of length,
+    with the pn ring section on top of the bend.
+    """
+    c = gf.Component()
+    path = PathBuilder()
+    path += _bend_360(radius)
+    if length:
+        path += gf.path.straight(length=length)
+    ref = c.add_ref(extrude(path.path(), wg))
+    c.add_ports(ref.ports)
+
+    if pn_ring is not None:
+        pn_ring_ref = c.add_ref(pn_ring)
+        pn_ring_ref.mirror_y()
+        pn_ring_ref.dymin = radius
+        pn_ring_ref.dx = 2 * radius
+
+    maybe_flatten(c)
+    return c
+
+def _repeat_motif(motif: Component, no: int, st_len: float, tail: gf.Path, wg: CrossSectionSpec) -> Component:
+    """
+    Straight of st_len, no copies of the motif as one cell array and the tail path, with the
+    ports of the extruded path.
+    """
+    c = gf.Component()
+    pitch = motif.ports["o2"].dx - motif.ports["o1"].dx
+
+    head_ref = c.add_ref(extrude_straight(st_len, wg))
+    if no:
+        add_array(c, motif, origin=(st_len, 0), a=(pitch, 0), na=int(no))
+    tail_ref = c.add_ref(extrude(tail, wg))
+    tail_ref.dmovex(st_len + no * pitch)
+
+    c.add_port("o1", port=head_ref.ports["o1"])
+    c.add_port("o2", port=tail_ref.ports["o2"])
+    # the motif stays one cell placed as an array when the structure is flattened
+    return maybe_flatten(c, shared=[motif])
 
 def bend_loss(
     radius: float,
     no_of_rings: np.ndarray,
     wg: CrossSectionSpec = rib_450,
+    motif: bool = False,
 ) -> List[gf.Component]:
     """
     Bend loss test structures.
@@ -36,6 +83,8 @@ def bend_loss(
         radius: Radius of the ring.
         no_of_rings: List of number of rings.
         cs: Cross section of the ring.
+        motif: Place the 360 degree bends as one cell array of a single bend instead of
+            extruding one path per structure.
     
     Returns:
         List of bend loss test structures.
@@ -46,17 +95,25 @@ def bend_loss(
 
     st_len = 100
     max_length = 4 * radius * max(no_of_rings) + 2 * st_len
+    bend = _bend_360(radius)
     
     for no in no_of_rings:
-        path = gf.Path()
+        if motif:
+            tail = gf.path.straight(length=max_length - st_len - 4 * radius * no)
+            c = _repeat_motif(_bend_motif(radius, wg), no, st_len, tail, wg)
+            c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2"])
+            component_list.append(c)
+            continue
+
+        path = PathBuilder()
         path += gf.path.straight(length=st_len)
         
         for _ in np.arange(no):
-            path += _bend_360(radius)
+            path += bend
         
         path += gf.path.straight(length=max_length - st_len - 4 * radius * no)
         c = gf.Component()
-        path_ref = c.add_ref(path.extrude(wg))
+        path_ref = c.add_ref(path.path().extrude(wg))
         c.add_ports(path_ref.ports)
         c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2"])
         component_list.append(c)
@@ -72,6 +129,7 @@ def bend_loss_pn(
     no_of_rings: np.ndarray = np.array([10]),
     wg: CrossSectionSpec = rib_450,
     pn: CrossSectionSpec = pn,
+    motif: bool = False,
 ) -> List[gf.Component]:
     """
     Bend loss test structures with pn junctions.
@@ -81,6 +139,8 @@ def bend_loss_pn(
         no_of_rings: List of number of rings.
         wg: Cross section of the ring.
         pn: Cross section of the pn junction.
+        motif: Place the doped bends (bend, pn ring section and straight) as one cell array
+            of a single period instead of extruding one path per structure.
     
     Returns:
         List of bend loss test structures with pn junctions.
@@ -95,14 +155,33 @@ def bend_loss_pn(
     length = pn_ring.dxsize/2 - radius + 1
 
     max_length = (4*radius + length)*max(no_of_rings) + 2 * st_len
+    bend = _bend_360(radius)
 
     for i, no in enumerate(no_of_rings):
+        if motif:
+            # undoped bends and the last straight after the array
+            period = _bend_motif(radius, wg, pn_ring, length if radius < pn_ring.dxsize - 1 else 0)
+            tail = PathBuilder()
+            for i in np.arange(max(no_of_rings) - no):
+                angles = [90, -90] if i % 2 == 0 else [-90, 90]
+                for i, angle in enumerate(angles):
+                    tail += gf.path.arc(radius=radius, angle=angle)
+                    if radius < pn_ring.dxsize - 1 and i == 1:
+                        tail += gf.path.straight(length=length)
+            x = st_len + no * (period.ports["o2"].dx - period.ports["o1"].dx) + tail.dsize[0]
+            tail += gf.path.straight(length=max_length - x)
+
+            c = _repeat_motif(period, no, st_len, tail.path(), wg)
+            c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2"])
+            component_list.append(c)
+            continue
+
         c = gf.Component()
-        path = gf.Path()
+        path = PathBuilder()
         path += gf.path.straight(length=st_len)
 
         for i in np.arange(no):
-            path += _bend_360(radius)
+            path += bend
             pn_ring_ref = c.add_ref(pn_ring)
             pn_ring_ref.mirror_y()
             pn_ring_ref.dymin = radius
@@ -122,7 +201,7 @@ def bend_loss_pn(
                     path += gf.path.straight(length=length)
 
         path += gf.path.straight(length=max_length - path.dsize[0])
-        path_ref = c.add_ref(path.extrude(wg))
+        path_ref = c.add_ref(path.path().extrude(wg))
         c.add_ports(path_ref.ports)
         c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2"])
 
@@ -4,6 +4,8 @@ from gdsfactory.typings import Component
 from . import rng
 from pylayout.components import ring_coupler_path
 from cornerstone import rib_450, cs_gc_silicon_1550nm
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude
 
 def cross_coupling(
     radius: float=15,
@@ -69,15 +71,15 @@ def cross_coupling(
     outer_arc.dx = inner_arc.dx
     outer_arc.dymax = inner_arc.dymax + gap + wg.width
 
-    outer_arc_ref = c.add_ref(outer_arc.extrude(wg))
-    inner_arc_ref = c.add_ref(inner_arc.extrude(wg))
+    outer_arc_ref = c.add_ref(extrude(outer_arc, wg))
+    inner_arc_ref = c.add_ref(extrude(inner_arc, wg))
 
     c.add_port(name="o1", port=outer_arc_ref.ports["o1"])
     c.add_port(name="o2", port=inner_arc_ref.ports["o1"])
     c.add_port(name="o3", port=outer_arc_ref.ports["o2"])
     c.add_port(name="o4", port=inner_arc_ref.ports["o2"])
     
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 
@@ -0,0 +1,187 @@
+from math import ceil
+from typing import Iterator
+
+import numpy as np
+import gdsfactory as gf
+from gdsfactory.typings import Component, CrossSectionSpec, List, Tuple
+
+from . import rng
+from pylayout.components import attach_grating_coupler
+from pylayout.extrude import extrude_sections
+from pylayout.path import PathBuilder
+from cornerstone import rib_450, cs_gc_silicon_1550nm
+
+# vertices per polygon, well under the 8190 of GDS
+MAX_POINTS = 4000
+
+def _length(path: gf.Path) -> float:
+    # gf.Path.length is rounded to the nm
+    return float(np.sum(np.hypot(*np.diff(path.points, axis=0).T)))
+
+def serpentine_rows(length: float, radius: float = 10, row_length: float = 1000) -> Tuple[int, float]:
+    """
+    Number of rows and straight length per row of a serpentine of the given total length:
+    the fewest rows of at most row_length, joined by 180 degree bends, all of the same length.
+    The length of the bends is the length of the discretised arc, so the extruded path has
+    the target length.
+
+    Args:
+        length: Total length of the waveguide.
+        radius: Radius of the bends, the rows are 2*radius apart.
+        row_length: Maximum straight length of a row.
+
+    Returns:
+        Number of rows and straight length of a row.
+    """
+    bend = _length(gf.path.arc(radius=radius, angle=180))
+    rows = max(1, ceil((length + bend) / (row_length + bend)))
+    return rows, (length - (rows - 1) * bend) / rows
+
+def serpentine_chunks(
+    length: float,
+    radius: float = 10,
+    row_length: float = 1000,
+    max_points: int = MAX_POINTS,
+) -> Iterator[gf.Path]:
+    """
+    Paths of a serpentine (rows along x joined by bends turning left and right in turn,
+    starting at the origin towards +x), split between segments so that the outline of a
+    chunk has at most max_points vertices. The chunks are generated one at a time.
+
+    Args:
+        length: Total length of the waveguide.
+        radius: Radius of the bends.
+        row_length: Maximum straight length of a row.
+        max_points: Maximum number of vertices of a polygon.
+
+    Returns:
+        Chunks of the serpentine, each starting at the end of the previous one.
+    """
+    rows, row = serpentine_rows(length, radius, row_length)
+    straight = gf.path.straight(length=row)
+    bends = [gf.path.arc(radius=radius, angle=180), gf.path.arc(radius=radius, angle=-180)]
+
+    # the outline goes along both edges of the path
+    budget = max_points // 2
+    if len(bends[0].points) > budget:
+        raise ValueError(f"A bend of radius {radius} has more than {max_points} vertices, increase max_points")
+
+    chunk = PathBuilder()
+    for i in range(rows):
+        for segment in [straight] + ([bends[i % 2]] if i < rows - 1 else []):
+            if len(chunk) + len(segment.points) - 1 > budget:
+                yield chunk.path()
+                chunk = PathBuilder(start=chunk.points[-1].copy(), start_angle=chunk.end_angle)
+            chunk += segment
+    yield chunk.path()
+
+@gf.cell
+def serpentine_waveguide(
+    length: float,
+    wg: CrossSectionSpec = rib_450,
+    radius: float = 10,
+    row_length: float = 1000,
+    max_points: int = MAX_POINTS,
+) -> Component:
+    """
+    Waveguide folded into a serpentine, for centimetre long waveguides. The number of rows
+    and their length are computed from the target length (see serpentine_rows), and every
+    chunk of the path (see serpentine_chunks) is extruded and copied into the cell before
+    the next one is generated.
+
+    Args:
+        length: Total length of the waveguide.
+        wg: Cross section of the waveguide.
+        radius: Radius of the bends.
+        row_length: Maximum straight length of a row.
+        max_points: Maximum number of vertices of a polygon.
+
+    Returns:
+        Serpentine waveguide.
+    """
+    wg = gf.get_cross_section(wg)
+    c = gf.Component()
+    layers = c.kcl.layout.layer_indexes
+
+    ports, total = {}, 0
+    for i, chunk in enumerate(serpentine_chunks(length, radius, row_length, max_points)):
+        part = extrude_sections(chunk, wg)
+        for layer in layers():
+            c.shapes(layer).insert(part.shapes(layer))
+        # input ports of the first chunk, output ports of the last one
+        for sec in wg.sections:
+            for end, name in enumerate(sec.port_names):
+                if name is not None and (end == 1 or i == 0):
+                    ports[name] = part.ports[name].copy()
+        total += _length(chunk)
+        part.delete()
+
+    for name, port in ports.items():
+        c.add_port(name=name, port=port)
+    c.info["length"] = float(np.round(total, 3))
+    return c
+
+@gf.cell
+def cutback_serpentine(
+    length: float,
+    gc: Component,
+    wg: CrossSectionSpec = rib_450,
+    radius: float = 10,
+    row_length: float = 1000,
+    max_points: int = MAX_POINTS,
+) -> Component:
+    """
+    Cutback test structure: serpentine waveguide (see serpentine_waveguide) with grating
+    couplers.
+
+    Args:
+        length: Total length of the waveguide.
+        gc: Grating coupler.
+        wg: Cross section of the waveguide.
+        radius: Radius of the bends.
+        row_length: Maximum straight length of a row.
+        max_points: Maximum number of vertices of a polygon.
+
+    Returns:
+        Cutback waveguide with grating couplers.
+    """
+    c = serpentine_waveguide(length, wg=wg, radius=radius, row_length=row_length, max_points=max_points)
+    return attach_grating_coupler(c, gc, ["o1", "o2"])
+
+def cutback(
+    lengths: np.ndarray,
+    wg: CrossSectionSpec = rib_450,
+    radius: float = 10,
+    row_length: float = 1000,
+) -> List[gf.Component]:
+    """
+    Cutback test structures of the given lengths.
+
+    Args:
+        lengths: Lengths of the waveguides.
+        wg: Cross section of the waveguides.
+        radius: Radius of the bends.
+        row_length: Maximum straight length of a row.
+
+    Returns:
+        List of cutback test structures.
+    """
+    lengths = np.array(lengths, dtype=float)
+    rng.shuffle(lengths)
+    return [cutback_serpentine(length, gc=cs_gc_silicon_1550nm, wg=wg, radius=radius, row_length=row_length) for length in lengths]
+
+def main():
+    lengths = np.array([1e3, 5e3, 1e4, 2e4])
+    component_list = cutback(lengths)
+
+    c = gf.grid(
+        component_list,
+        spacing=50,
+        shape=(len(component_list), 1),
+        align_x="xmin",
+    )
+
+    c.show()
+
+if __name__ == "__main__":
+    main()
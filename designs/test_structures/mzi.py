@@ -5,6 +5,7 @@ import numpy as np
 
 from cornerstone import rib_450, cs_gc_silicon_1550nm
 from pylayout.components import attach_grating_coupler
+from pylayout.build import maybe_flatten
 
 def main():
     
@@ -25,7 +26,7 @@ def main():
             delta_length=0.0,
         )
         mzi = attach_grating_coupler(mzi, gc=cs_gc_silicon_1550nm, ports=["o1", "o2"])
-        mzi.flatten()
+        maybe_flatten(mzi)
         components.append(mzi)
     
     c = gf.grid(
@@ -3,12 +3,14 @@ from gdsfactory.typings import Component
 
 from pylayout.components import attach_grating_coupler
 from pylayout.routing import route_pads_to_ring
+from pylayout.array import grid_array
 from cornerstone import (
     rib_450,
     metal_pad,
     pn_450_with_metal,
     cs_gc_silicon_1550nm
 )
+from pylayout.build import maybe_flatten
 
 @gf.cell
 def single_ring_pn(
@@ -31,8 +33,7 @@ def single_ring_pn(
     c = gf.Component()
     r = gf.get_component(rc)
     
-    pads = [metal_pad, metal_pad, metal_pad]
-    pads = gf.grid(pads, spacing=(pad_spacing, pad_spacing))
+    pads = grid_array(metal_pad, columns=3, spacing=(pad_spacing, pad_spacing))
     routing = {
         "0_0_e4": "METAL_BOT_p2",
         "1_0_e4": "METAL_TOP_p1",
@@ -44,7 +45,7 @@ def single_ring_pn(
     c.add_port(name="o1", port=ring_ref.ports["o1"])
     c.add_port(name="o2", port=ring_ref.ports["o2"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 @gf.cell
@@ -70,7 +71,7 @@ def single_ring_pn_with_gc(
     single_ring = single_ring_pn(rc=r, pad_spacing=pad_spacing)
     c = attach_grating_coupler(single_ring, cs_gc_silicon_1550nm, ["o1", "o2"])
 
-    c.flatten()
+    maybe_flatten(c)
     
     return c
 
@@ -1,18 +1,20 @@
 from functools import partial
 
 import gdsfactory as gf
-from gdsfactory.typings import CrossSectionSpec, Component, List
+from gdsfactory.typings import CrossSectionSpec, Component, ComponentSpec, List
 
 from pylayout.components import ring, attach_grating_coupler, add_norm_wg
 from pylayout.routing import route_pads_to_ring
+from pylayout.array import grid_array
 from pylayout.cross_section import MSpec
 from cornerstone import pn, pn_450_with_metal, pn_450_with_metal_and_heater, rib_450, LAYER, metal_pad, cs_gc_silicon_1550nm
 from cornerstone import Spec
 from ..test_structures import single_ring_pn
+from pylayout.build import maybe_flatten
 
 def single_ring_filament_gsgsg(
     r: Component,
-    pads: Component = gf.grid([metal_pad, metal_pad, metal_pad, metal_pad, metal_pad], spacing=MSpec.pad_spacing),
+    pads: ComponentSpec = partial(grid_array, metal_pad, columns=5, spacing=(MSpec.pad_spacing, MSpec.pad_spacing)),
     dist_to_pad: float = 50
 ) -> Component:
     """
@@ -54,13 +56,13 @@ def single_ring_filament_gsgsg(
     c.add_port(name="o1", port=ring_ref.ports["o1"])
     c.add_port(name="o2", port=ring_ref.ports["o2"])
     
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 @gf.cell
 def single_ring_filament_gssg(
     r: Component,
-    pads: Component = gf.grid([metal_pad, metal_pad, metal_pad, metal_pad], spacing=MSpec.pad_spacing),
+    pads: ComponentSpec = partial(grid_array, metal_pad, columns=4, spacing=(MSpec.pad_spacing, MSpec.pad_spacing)),
     dist_to_pad: float = 50
 ) -> Component:
     """
@@ -101,14 +103,14 @@ def single_ring_filament_gssg(
     c.add_port(name="o1", port=ring_ref.ports["o1"])
     c.add_port(name="o2", port=ring_ref.ports["o2"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 
 @gf.cell
 def single_ring_filament_gs(
     r: Component,
-    pads: Component = gf.grid([metal_pad, metal_pad], spacing=MSpec.pad_spacing),
+    pads: ComponentSpec = partial(grid_array, metal_pad, columns=2, spacing=(MSpec.pad_spacing, MSpec.pad_spacing)),
 ) -> Component:
     c = gf.Component()
     r = gf.get_component(r)
@@ -124,7 +126,7 @@ def single_ring_filament_gs(
     c.add_port(name="o1", port=ring_ref.ports["o1"])
     c.add_port(name="o2", port=ring_ref.ports["o2"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 
@@ -194,8 +196,7 @@ def ring_filament_to_pn_distance(
         dist_y=dist_y,
         max_length=max_length
     )
-    pads = [metal_pad, metal_pad, metal_pad]
-    pads = gf.grid(pads, spacing=(25, 25))
+    pads = grid_array(metal_pad, columns=3, spacing=(25, 25))
     routing = {
         "0_0_e4": "METAL_BOT_p2",
         "1_0_e4": "METAL_TOP_p1",
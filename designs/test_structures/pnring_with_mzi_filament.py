@@ -7,6 +7,7 @@ from pylayout.components import ring, straight_with_filament
 from pylayout.routing import route_pads_to_ring, strategy1, strategy2
 from pylayout.methods import connect_all
 from pylayout.cross_section import MSpec
+from pylayout.build import maybe_flatten
 
 def ring_and_mzi_heater(
     r: Component,
@@ -83,7 +84,7 @@ def ring_and_mzi_heater(
     c.add_port("o1", lst_ref.ports["o1"])
     c.add_port("o2", rst_ref.ports["o2"])
 
-    c.flatten()
+    maybe_flatten(c)
 
     return c
 
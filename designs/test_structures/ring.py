@@ -4,7 +4,7 @@ import numpy as np
 from gdsfactory.cross_section import cross_section, Section
 import gdsfactory as gf
 
-from pylayout.components import ring, attach_grating_coupler, gc_silicon_1550nm
+from pylayout.components import ring_sweep, gc_silicon_1550nm
 from cornerstone import Spec, LAYER, cs_gc_silicon_1550nm
 
 def main():
@@ -44,57 +44,42 @@ def main():
     )
     
     cladding_width = 8
-    
-    
-    ring_lists = []
-    for radii in radius:
-        angle, gaps = gap_dict[radii]
-        gaps = list(reversed(np.round(gaps, 4)))
-        for gap in gaps:
-            ring_wg = partial(
-                cross_section,
-                width=0.45,
-                offset=0,
-                radius_min=Spec.r_min,
-                layer=LAYER.WG,
-                sections=[
-                    Section(
-                        width=radii,
-                        offset= -radii/2,
-                        layer=LAYER.WG_ETCH
-                    ),
-                    Section(
-                        name="ring",
-                        width=cladding_width + width/2,
-                        offset=(cladding_width + width/2) /2,
-                        layer=LAYER.WG_ETCH
-                    ),
-                ]
-            )
-            
-            c = ring(
-                wg=wg,
-                ring_wg=ring_wg,
-                radius=radii,
-                gap=gap,
-                int_angle=angle,
-                max_length=max_length,
-                cladding_rfill=True,
-            )
-            
-            
-            c = attach_grating_coupler(c, grating_coupler, ["o1", "o2"])
-            base = gf.Component()
-            c_ref = base.add_ref(c)
-            c_ref.drotate(90)
-            ring_lists.append(base)
-        
-    ring_lists = list(reversed(ring_lists))
-    c = gf.grid(
-        ring_lists,
-        shape=(len(radius), len(gaps)),
-        spacing = (101, 290),
-        align_x="xmin",
+
+    # the ring cross-section fills the inside of the ring, so it depends on the radius
+    ring_wgs = {
+        radii: partial(
+            cross_section,
+            width=0.45,
+            offset=0,
+            radius_min=Spec.r_min,
+            layer=LAYER.WG,
+            sections=[
+                Section(
+                    width=radii,
+                    offset= -radii/2,
+                    layer=LAYER.WG_ETCH
+                ),
+                Section(
+                    name="ring",
+                    width=cladding_width + width/2,
+                    offset=(cladding_width + width/2) /2,
+                    layer=LAYER.WG_ETCH
+                ),
+            ]
+        ) for radii in radius
+    }
+
+    # one row per radius and one column per gap, the ring bodies and grating couplers are shared
+    c = ring_sweep(
+        radii=list(reversed(radius)),
+        gaps={radii: list(np.round(gap_dict[radii][1], 4)) for radii in radius},
+        wg=wg,
+        ring_wg=ring_wgs,
+        int_angle={radii: gap_dict[radii][0] for radii in radius},
+        max_length=max_length,
+        cladding_rfill=True,
+        gc=grating_coupler,
+        spacing=(101, 290),
     )
     
     c.show()
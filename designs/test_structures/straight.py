@@ -4,6 +4,7 @@ from gdsfactory.typings import List, CrossSectionSpec, Component
 
 from pylayout.components import attach_grating_coupler
 from pylayout.methods import gen_uuid
+from pylayout.extrude import extrude_straight
 from cornerstone import rib_450, cs_gc_silicon_1550nm
 from . import rng
 
@@ -25,8 +26,7 @@ def straight(
     """
     cs = gf.get_cross_section(cs)
 
-    c = gf.path.straight(length=length)
-    c = c.extrude(cs)
+    c = extrude_straight(length, cs)
     c = attach_grating_coupler(c, gc, ["o1", "o2"])
 
     return c
@@ -9,6 +9,7 @@ from cornerstone import (
 )
 from cornerstone import Spec
 from pylayout.components import straight_with_filament, attach_grating_coupler, mmi_splitter
+from pylayout.build import maybe_flatten
 
 @gf.cell
 def waveguide_with_filament(
@@ -64,7 +65,7 @@ def waveguide_with_filament(
 
     c = attach_grating_coupler(c, cs_gc_silicon_1550nm)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 def pack(component_list: List[Component], spacing: float = 25) -> Component:
@@ -0,0 +1,151 @@
+"""
+Cell arrays (AREF records in GDS, repetitions in OASIS) for repeated placements of one
+cell. An array is a single instance however many copies it has, so marker frames and pad
+rows take a few records instead of one reference per copy.
+
+Arrays are added explicitly with add_array, or detected from a list of positions with
+add_placements.
+"""
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.typings import Component, ComponentSpec, List, Tuple
+
+def _runs(values: np.ndarray) -> List[Tuple[int, int, int]]:
+    # split sorted unique values into runs with a constant step: (start, step, count)
+    runs = []
+    i = 0
+    while i < len(values):
+        if i + 1 == len(values):
+            runs.append((int(values[i]), 0, 1))
+            break
+        step = values[i + 1] - values[i]
+        j = i + 1
+        while j + 1 < len(values) and values[j + 1] - values[j] == step:
+            j += 1
+        runs.append((int(values[i]), int(step), j - i + 1))
+        i = j + 1
+    return runs
+
+def regular_arrays(positions: np.ndarray) -> List[Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int], int, int]]:
+    """
+    Group positions on the grid into as few regular arrays as possible: every row (same y) is
+    split into runs with a constant x pitch, and identical runs on a regular y pitch form one
+    2D array. Duplicated positions are placed once.
+
+    Args:
+        positions [np.ndarray]: (N, 2) positions in database units
+
+    Returns:
+        List: arrays as (origin, a, b, na, nb), the copies are at origin + i*a + j*b
+    """
+    points = np.unique(np.asarray(positions, dtype=np.int64).reshape(-1, 2), axis=0)
+
+    rows = {}
+    for y in np.unique(points[:, 1]):
+        for run in _runs(points[points[:, 1] == y, 0]):
+            rows.setdefault(run, []).append(y)
+
+    arrays = []
+    for (x0, dx, nx), ys in rows.items():
+        for y0, dy, ny in _runs(np.array(ys)):
+            arrays.append(((x0, y0), (dx, 0), (0, dy), nx, ny))
+    return arrays
+
+def add_array(
+    c: Component,
+    component: ComponentSpec,
+    origin: Tuple[float, float] = (0, 0),
+    a: Tuple[float, float] = (0, 0),
+    b: Tuple[float, float] = (0, 0),
+    na: int = 1,
+    nb: int = 1,
+    rotation: float = 0,
+    mirror: bool = False,
+):
+    """
+    Add a cell array of a component, with the copies at origin + i*a + j*b.
+
+    Args:
+        c [Component]: component to add the array to
+        component [ComponentSpec]: component to repeat
+        origin [Tuple[float, float]]: position of the first copy in um
+        a [Tuple[float, float]]: step between the columns in um
+        b [Tuple[float, float]]: step between the rows in um
+        na [int]: number of columns
+        nb [int]: number of rows
+        rotation [float]: rotation of every copy in degrees
+        mirror [bool]: mirror every copy at the x axis before rotating
+
+    Returns:
+        Instance: the array instance
+    """
+    component = gf.get_component(component)
+    dbu = c.kcl.dbu
+    trans = gf.kdb.DCplxTrans(1, rotation, mirror, *origin).to_itrans(dbu)
+    a, b = (gf.kdb.Vector(round(v[0] / dbu), round(v[1] / dbu)) for v in (a, b))
+    return c.create_inst(component, trans, a, b, na, nb)
+
+def add_placements(
+    c: Component,
+    component: ComponentSpec,
+    positions: np.ndarray,
+    rotation: float = 0,
+    mirror: bool = False,
+) -> list:
+    """
+    Add copies of a component at the given positions of its origin, as cell arrays wherever
+    the positions are regular.
+
+    Args:
+        c [Component]: component to add the copies to
+        component [ComponentSpec]: component to repeat
+        positions [np.ndarray]: (N, 2) positions in um
+        rotation [float]: rotation of every copy in degrees
+        mirror [bool]: mirror every copy at the x axis before rotating
+
+    Returns:
+        list: the instances
+    """
+    dbu = c.kcl.dbu
+    positions = np.round(np.asarray(positions, dtype=float) / dbu).astype(np.int64)
+    return [
+        add_array(c, component, np.multiply(origin, dbu), np.multiply(a, dbu), np.multiply(b, dbu), na, nb, rotation, mirror)
+        for origin, a, b, na, nb in regular_arrays(positions)
+    ]
+
+@gf.cell
+def grid_array(
+    component: ComponentSpec,
+    columns: int,
+    rows: int = 1,
+    spacing: Tuple[float, float] = (5, 5),
+) -> Component:
+    """
+    Copies of one component on the pitch of gf.grid (size plus spacing) with the same port
+    names ({column}_{row}_{port}), as a single cell array. Only the relative placement
+    matches gf.grid: the first copy is centred on the origin, while gf.grid anchors the grid
+    elsewhere, so position the result by its bounding box or ports.
+
+    Args:
+        component [ComponentSpec]: component to repeat
+        columns [int]: number of columns
+        rows [int]: number of rows
+        spacing [Tuple[float, float]]: space between the copies in x and y
+
+    Returns:
+        Component: the array
+    """
+    c = gf.Component()
+    component = gf.get_component(component)
+    pitch = (component.dxsize + spacing[0], component.dysize + spacing[1])
+    # the first copy is centred on the origin
+    origin = (-component.dx, -component.dy)
+    inst = add_array(c, component, origin, (pitch[0], 0), (0, pitch[1]), columns, rows)
+
+    for i in range(columns):
+        for j in range(rows):
+            trans = inst.trans * gf.kdb.Trans(i * inst.a + j * inst.b)
+            for port in component.ports:
+                c.add_port(f"{i}_{j}_{port.name}", port=port.copy(trans))
+    return c
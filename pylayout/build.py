@@ -0,0 +1,111 @@
+import os
+from contextlib import contextmanager
+
+import gdsfactory as gf
+from gdsfactory.typings import Component, Iterable, List
+
+from pylayout.cache import register_setting
+
+POLICIES = ("flatten", "keep", "auto")
+
+# "flatten" copies every child into its parent (the original behaviour), "keep" keeps the
+# references and "auto" only flattens cells with at most FLATTEN_MAX_POLYGONS polygons
+BUILD_POLICY = os.environ.get("PYLAYOUT_BUILD_POLICY", "flatten")
+FLATTEN_MAX_POLYGONS = int(os.environ.get("PYLAYOUT_FLATTEN_MAX_POLYGONS", 16))
+# the policy changes the content of the cells, so cells built with another one are not read
+# back from the disk cache
+register_setting("build_policy", lambda: BUILD_POLICY)
+register_setting("flatten_max_polygons", lambda: FLATTEN_MAX_POLYGONS)
+
+def set_build_policy(policy: str, max_polygons: int = None) -> None:
+    """
+    Set how components are finished by maybe_flatten. Cells are cached by name, so set it
+    before the cells are built (e.g. at the top of a design script).
+
+    Args:
+        policy [str]: "flatten", "keep" or "auto"
+        max_polygons [int]: in "auto" mode, cells with at most this many polygons are still flattened
+    """
+    global BUILD_POLICY, FLATTEN_MAX_POLYGONS
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown build policy {policy}, should be one of {POLICIES}")
+    BUILD_POLICY = policy
+    if max_polygons is not None:
+        FLATTEN_MAX_POLYGONS = max_polygons
+
+@contextmanager
+def build_policy(policy: str, max_polygons: int = None):
+    """
+    Temporarily set the build policy.
+
+        >> with build_policy("keep"):
+        >>     c = integrate_all_structures(...)
+    """
+    previous = BUILD_POLICY, FLATTEN_MAX_POLYGONS
+    set_build_policy(policy, max_polygons)
+    try:
+        yield
+    finally:
+        set_build_policy(*previous)
+
+def polygon_count(c: Component, limit: int = None) -> int:
+    """
+    Number of polygons of a component including its children, counting stops after limit.
+    """
+    layout = c.kcl.layout
+    shapes = gf.kdb.RecursiveShapeIterator(layout, c._kdb_cell, layout.layer_indexes())
+    count = 0
+    while not shapes.at_end():
+        count += 1
+        if limit is not None and count > limit:
+            break
+        shapes.next()
+    return count
+
+def _flatten(c: Component, shared: set) -> None:
+    # flatten everything but the references to the shared cells, one level at a time so the
+    # shared cells deeper in the hierarchy end up referenced from c. The cells shared by a
+    # flattened child are shared in c too.
+    if not shared:
+        c.flatten()
+        return
+    layout = c.kcl.layout
+    while True:
+        insts = [inst for inst in c._kdb_cell.each_inst() if layout.cell_name(inst.cell_index) not in shared]
+        if not insts:
+            break
+        for inst in insts:
+            shared.update(_shared_cells(c.kcl[inst.cell_index]))
+            inst.flatten(1)
+    c.evaluate_insts()
+
+def _shared_cells(c: Component) -> List[str]:
+    return list(c.info.get("shared_cells", []))
+
+def maybe_flatten(c: Component, shared: Iterable[Component] = ()) -> Component:
+    """
+    Finish a component according to the build policy, use it instead of c.flatten().
+
+    The references to the shared cells are kept whatever the policy, so one copy of their
+    polygons is written however many times they are placed. They are recorded in
+    c.info["shared_cells"] (by name), and kept when the parents of c are flattened too.
+
+    Args:
+        c [Component]: component to be flattened
+        shared [Iterable[Component]]: library cells to be kept as references, e.g. a grating coupler
+
+    Returns:
+        Component: the same component
+    """
+    names = {cell.name for cell in shared} | set(_shared_cells(c))
+    for inst in c._kdb_cell.each_inst():
+        names.update(_shared_cells(c.kcl[inst.cell_index]))
+
+    if BUILD_POLICY == "flatten":
+        _flatten(c, names)
+    elif BUILD_POLICY == "auto" and polygon_count(c, FLATTEN_MAX_POLYGONS) <= FLATTEN_MAX_POLYGONS:
+        _flatten(c, names)
+
+    if names:
+        c.info["shared_cells"] = sorted(names)
+    return c
@@ -0,0 +1,291 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+from collections import OrderedDict
+from enum import Enum
+from functools import partial, wraps
+from pathlib import Path
+from types import CodeType, FunctionType
+
+import numpy as np
+import gdsfactory as gf
+from pydantic import BaseModel
+from gdsfactory.typings import Component, Dict, List
+
+from pylayout.serialization import component_from_dict, component_to_dict, geometry_hash, ports_to_dicts
+
+# the cache is disabled until a directory is given, either here or through PYLAYOUT_CACHE_DIR
+CACHE_DIR = Path(os.environ["PYLAYOUT_CACHE_DIR"]) if os.environ.get("PYLAYOUT_CACHE_DIR") else None
+CACHE_MAX_BYTES = int(float(os.environ.get("PYLAYOUT_CACHE_MAX_MB", 2048)) * 1024**2)
+
+# files and directories whose content is part of every cache key: the package and the
+# specification files at the repository root (specs/metal.yml)
+_DEPENDENCIES: List[Path] = [Path(__file__).parent, Path(__file__).parents[1] / "specs"]
+# digest of the dependencies and the dependencies it was computed for
+_dependency_digest = None
+# module level settings that change the generated geometry, by name
+_SETTINGS: Dict[str, callable] = {}
+
+def set_cache_dir(path: Path = None, max_bytes: int = None) -> None:
+    """
+    Enable (or disable with None) the on-disk component cache.
+
+    Args:
+        path [Path]: directory for the cached cells
+        max_bytes [int]: size limit of the cache directory (cells and DRC verdicts), least recently used entries are evicted first
+    """
+    global CACHE_DIR, CACHE_MAX_BYTES
+    CACHE_DIR = Path(path) if path is not None else None
+    if max_bytes is not None:
+        CACHE_MAX_BYTES = max_bytes
+
+def register_dependency(*paths: Path) -> None:
+    """
+    Add files or directories (e.g. specification files) to the cache key, so that
+    any change to their content invalidates the cached cells.
+
+    Args:
+        paths [Path]: files or directories, directories are scanned for .py and .yml files
+    """
+    global _dependency_digest
+    for path in map(Path, paths):
+        if path not in _DEPENDENCIES:
+            _DEPENDENCIES.append(path)
+    _dependency_digest = None
+
+def register_setting(name: str, getter: callable) -> None:
+    """
+    Add a module level setting to the cache key, so that cells built with a different
+    value are not read back from the cache.
+
+    Args:
+        name [str]: name of the setting
+        getter [callable]: returns the current value of the setting
+    """
+    _SETTINGS[name] = getter
+
+def _dependencies() -> List[Path]:
+    # imported packages list their files in CACHE_DEPENDENCIES (e.g. cornerstone, its code and
+    # cs_spec.yml). They are collected for every key rather than registered when something is
+    # first loaded from the package, so a key computed before e.g. the lazy cornerstone.Spec is
+    # used still depends on the specification.
+    deps = list(_DEPENDENCIES)
+    for name, module in list(sys.modules.items()):
+        if "." not in name and module is not None:
+            deps += [Path(path) for path in vars(module).get("CACHE_DEPENDENCIES", ()) if Path(path) not in deps]
+    return deps
+
+def _dependency_hash() -> str:
+    global _dependency_digest
+    deps = _dependencies()
+    if _dependency_digest is None or _dependency_digest[0] != deps:
+        # every file once, so a file registered again on its own (e.g. by load_spec) or
+        # through its directory gives the same digest
+        files = {}
+        for dep in deps:
+            for f in sorted(
+                f for pattern in ("*.py", "*.yml", "*.yaml") for f in dep.rglob(pattern)
+            ) if dep.is_dir() else [dep]:
+                if f.exists():
+                    # named relative to the outermost registered directory
+                    name = str(f.relative_to(dep.parent))
+                    files[f.resolve()] = max(files.get(f.resolve(), ""), name, key=len)
+        h = hashlib.sha256()
+        for f, name in sorted(files.items(), key=lambda item: str(item[0])):
+            h.update(name.encode())
+            h.update(f.read_bytes())
+        _dependency_digest = deps, h.hexdigest()
+    return _dependency_digest[1]
+
+def canonical(value) -> object:
+    """
+    Convert an argument into a JSON serialisable value that only depends on its content.
+    Lambdas and local functions are keyed by their code, closure and defaults, and objects
+    without a canonical form raise a TypeError rather than sharing a key through their repr.
+    """
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return float(np.round(value, 6))
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.ndarray):
+        # the shape and dtype too, e.g. empty arrays of any shape give the same list
+        return {"ndarray": str(value.dtype), "shape": list(value.shape), "values": canonical(value.tolist())}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, partial):
+        return {
+            "partial": canonical(value.func),
+            "args": canonical(value.args),
+            "kwargs": canonical(value.keywords),
+        }
+    if isinstance(value, gf.Component):
+        # by geometry and ports, so a cell read back from the cache gives the same key
+        return {"component": geometry_hash(value), "ports": canonical(ports_to_dicts(value))}
+    if isinstance(value, gf.CrossSection):
+        return {"cross_section": value.model_dump_json()}
+    if isinstance(value, BaseModel):
+        # e.g. the sections of a cross-section
+        return {type(value).__name__: value.model_dump_json()}
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, Enum):
+        return canonical(value.value)
+    if isinstance(value, FunctionType) and "<" in value.__qualname__:
+        # lambdas and local functions share their name, they are keyed by their code
+        return {"function": f"{value.__module__}.{value.__qualname__}", "code": _code_digest(value.__code__), **canonical({
+            "defaults": value.__defaults__,
+            "kwdefaults": value.__kwdefaults__,
+            "closure": [cell.cell_contents for cell in value.__closure__ or () if cell.cell_contents is not value],
+        })}
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{getattr(value, '__module__', '')}.{value.__qualname__}"
+    raise TypeError(f"{type(value).__name__} has no canonical form for the cache key: {value!r}")
+
+def _code_digest(code: CodeType) -> str:
+    h = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            h.update(_code_digest(const).encode())
+        else:
+            # frozenset constants (e.g. of "x in {...}") iterate in hash order
+            h.update(repr(sorted(map(repr, const)) if isinstance(const, frozenset) else const).encode())
+    h.update(repr(code.co_names).encode())
+    return h.hexdigest()
+
+def cache_key(func: callable, *args, **kwargs) -> str:
+    """
+    Content hash of a cell function call: the function and its source, the arguments,
+    every registered dependency (specification files and package sources) and setting.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = ""
+    payload = json.dumps(
+        [
+            canonical(func), source, canonical(args), canonical(kwargs), _dependency_hash(),
+            {name: canonical(getter()) for name, getter in _SETTINGS.items()},
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _evict(directory: Path, max_bytes: int) -> None:
+    # cells (.oas and their .json sidecar) and DRC verdicts (drc/*.json, see cornerstone.drc)
+    # share the size limit
+    entries = []
+    for oas in directory.glob("*.oas"):
+        sidecar = oas.with_suffix(".json")
+        stat = oas.stat()
+        size = stat.st_size + (sidecar.stat().st_size if sidecar.exists() else 0)
+        entries.append((stat.st_mtime, size, [oas, sidecar]))
+    for verdict in directory.glob("drc/*.json"):
+        stat = verdict.stat()
+        entries.append((stat.st_mtime, stat.st_size, [verdict]))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, files in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        for filepath in files:
+            filepath.unlink(missing_ok=True)
+        total -= size
+
+def _load(key: str) -> Component:
+    oas, sidecar = CACHE_DIR / f"{key}.oas", CACHE_DIR / f"{key}.json"
+    if not (oas.exists() and sidecar.exists()):
+        return None
+    try:
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+        data["oas"] = oas.read_bytes()
+    except (OSError, ValueError):
+        return None
+    os.utime(oas)  # mark as recently used for the LRU eviction
+    return component_from_dict(data)
+
+def _store(key: str, c: Component) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    data = component_to_dict(c)
+    oas_bytes = data.pop("oas")
+
+    # write to temporary files first so that parallel runs never read half written cells
+    for suffix, content in ((".oas", oas_bytes), (".json", json.dumps(canonical(data)).encode())):
+        tmp = CACHE_DIR / f"{key}{suffix}.{os.getpid()}.tmp"
+        tmp.write_bytes(content)
+        os.replace(tmp, CACHE_DIR / f"{key}{suffix}")
+    _evict(CACHE_DIR, CACHE_MAX_BYTES)
+
+def disk_cache(func: callable) -> callable:
+    """
+    Persistent content-addressed cache for cell functions. Use it below @gf.cell, so the
+    in-memory cell cache is checked first and the cell is still named by gdsfactory:
+
+        >> @gf.cell
+        >> @disk_cache
+        >> def ring(...):
+
+    Cached cells are stored as OASIS with their children, with the ports and info of every
+    cell in a JSON sidecar, and read back with the same hierarchy (see component_from_dict).
+    Nothing is read or written unless a cache directory is set.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if CACHE_DIR is None:
+            return func(*args, **kwargs)
+
+        key = cache_key(func, *args, **kwargs)
+        c = _load(key)
+        if c is None:
+            c = func(*args, **kwargs)
+            _store(key, c)
+        return c
+
+    return wrapper
+
+class LRUCache:
+    """
+    Bounded in-memory cache, least recently used entries are evicted first. Used for values
+    that are shared between cells in one run, such as paths.
+
+        >> PATHS = LRUCache(maxsize=128)
+        >> path = PATHS.get(key, lambda: gf.path.arc(radius, angle))
+    """
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, build: callable, valid: callable = None):
+        """
+        Return the cached value of key, built with build() on a miss.
+
+        Args:
+            key: hashable key
+            build [callable]: builds the value
+            valid [callable]: returns False for cached values that can no longer be used (e.g. deleted cells)
+        """
+        if key in self._entries and (valid is None or valid(self._entries[key])):
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        value = self._entries[key] = build()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
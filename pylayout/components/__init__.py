@@ -7,20 +7,25 @@ from .basic import (
     gc_silicon_1550nm,
     medal_shape,
     omega_shape,
+    circle,
     ring_pn_section,
     outline,
     truncated_circle_bool,
     truncated_circle_poly,
+    truncated_circle_analytic,
     mmi_splitter,
     coupler_2x2,
     ring_coupler,
-    ring_coupler_path
+    ring_coupler_path,
+    ring_path,
 )
 
 # complicated components
 from pylayout.components.advanced import (
     place_dice_marker,
     ring,
+    ring_body,
+    ring_sweep,
     straight_with_filament,
     draw_chip_art_from_image,
     add_norm_wg
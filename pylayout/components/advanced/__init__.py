@@ -1,5 +1,5 @@
 from pylayout.components.advanced.place_dice_marker import place_dice_marker
-from pylayout.components.advanced.ring import ring
+from pylayout.components.advanced.ring import ring, ring_body, ring_sweep
 from pylayout.components.advanced.straight_with_filament import straight_with_filament
 from pylayout.components.advanced.chip_art import draw_chip_art_from_image
 from pylayout.components.advanced.add_norm_wg import add_norm_wg
@@ -2,6 +2,8 @@ import gdsfactory as gf
 from gdsfactory.typings import Component, CrossSectionSpec, Tuple
 
 from ..basic.gc import attach_grating_coupler
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude_straight
 
 @gf.cell
 def add_norm_wg(
@@ -10,6 +12,7 @@ def add_norm_wg(
     cs: CrossSectionSpec,
     rpos: float=0,
     sides: str="N",
+    shared: bool=None,
 ) -> Component:
     """
     Add a normalisation waveguide to the component.
@@ -20,6 +23,7 @@ def add_norm_wg(
         cs [CrossSectionSpec]: cross section of the normalisation waveguide
         rpos [float]: relative position
         side [str]: side to place the normalisation waveguide, "N" for top, "S" for bottom, "W" for left, "E" for right
+        shared [bool]: keep the grating coupler as a shared cell (see set_shared_gc), defaults to SHARED_GC
     
     Returns:
         [Component]: component with the normalisation waveguide
@@ -30,8 +34,8 @@ def add_norm_wg(
     ref = cell.add_ref(c)
 
     def place_wg(is_vertical: bool, length: float, coord: Tuple, rotate: bool):
-        wg = gf.path.straight(length=length - gc.dxsize*2).extrude(cs)
-        wg = attach_grating_coupler(wg, gc, ["o1", "o2"])
+        wg = extrude_straight(length - gc.dxsize*2, cs)
+        wg = attach_grating_coupler(wg, gc, ["o1", "o2"], shared=shared)
         wg_ref = cell.add_ref(wg)
         if rotate:
             wg_ref.drotate(90)
@@ -53,6 +57,6 @@ def add_norm_wg(
             is_vertical, length, coord, rotate = side_params.get(side, (False, 0, (0, 0), False))
             place_wg(is_vertical, length, coord, rotate)
 
-    cell.flatten()
+    maybe_flatten(cell)
     return cell
 
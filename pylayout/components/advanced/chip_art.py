@@ -5,6 +5,52 @@ from PIL import Image, ImageOps
 import gdsfactory as gf
 from gdsfactory.typings import Component, LayerSpec
 
+def _load_image(filepath: Path, threshold: int, size: tuple) -> np.ndarray:
+    image = Image.open(filepath)
+    image = ImageOps.grayscale(image)
+    image = ImageOps.autocontrast(image)
+    image = image.point(lambda p: p > threshold and 255)
+    image = image.convert('1')  # Convert to 1-bit pixels
+
+    if size is not None:
+        image = image.resize(size)
+
+    return np.array(image)
+
+def merge_pixels(mask: np.ndarray) -> np.ndarray:
+    """
+    Merge the set pixels of a boolean mask into rectangles. Pixels are first merged
+    into horizontal runs per row, then runs with the same start and end in consecutive
+    rows are merged vertically.
+
+    Args:
+        mask [np.ndarray]: 2D boolean array, True for filled pixels
+
+    Returns:
+        np.ndarray: (N, 4) integer array of rectangles as (row_start, row_end, col_start, col_end), end exclusive
+    """
+    rows, cols = mask.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+
+    # run starts and ends come out in the same row-major order
+    start_row, start_col = np.nonzero(edges == 1)
+    _, end_col = np.nonzero(edges == -1)
+    if start_row.size == 0:
+        return np.empty((0, 4), dtype=np.int64)
+
+    # sort runs by (start, end, row) so that stackable runs are next to each other
+    order = np.lexsort((start_row, end_col, start_col))
+    row, col0, col1 = start_row[order], start_col[order], end_col[order]
+
+    new_rect = np.ones(row.size, dtype=bool)
+    new_rect[1:] = (col0[1:] != col0[:-1]) | (col1[1:] != col1[:-1]) | (row[1:] != row[:-1] + 1)
+    first = np.flatnonzero(new_rect)
+    last = np.append(first[1:], row.size) - 1
+
+    return np.column_stack((row[first], row[last] + 1, col0[first], col1[first]))
+
 @gf.cell
 def draw_chip_art_from_image(
     filepath: Path,
@@ -13,34 +59,32 @@ def draw_chip_art_from_image(
     layer: LayerSpec=(0, 0),
 ) -> Component:
     """
-    Draw chip art from an image
+    Draw chip art from an image. Every pixel is 1 um x 1 um and the black pixels are
+    merged into maximal horizontal/vertical rectangles before being inserted in one go.
 
     Args:
         filepath [Path]: Path: path to the image file
+        threshold [int]: grayscale threshold, pixels at or below it are drawn
+        size [tuple]: optional (width, height) in pixels to resize the image to
+        layer [LayerSpec]: layer of the chip art
 
     Returns:
         Component: chip art component
     """
-    image = Image.open(filepath)
-    image = ImageOps.grayscale(image)
-    image = ImageOps.autocontrast(image)
-    threshold = 200
-    image = image.point(lambda p: p > threshold and 255)
-    image = image.convert('1')  # Convert to 1-bit pixels
+    image_array = _load_image(filepath, threshold, size)
+    rows = image_array.shape[0]
 
-    if size is not None:
-        image = image.resize(size)
+    rects = merge_pixels(image_array == 0)  # Assuming black pixel
+
+    # pixel (row, col) covers x in [col, col + 1] and y in [rows - row, rows - row + 1]
+    scale = int(round(1 / gf.kcl.dbu))
+    xmin, xmax = rects[:, 2] * scale, rects[:, 3] * scale
+    ymin, ymax = (rows + 1 - rects[:, 1]) * scale, (rows + 1 - rects[:, 0]) * scale
 
-    image_array = np.array(image)
-    rows, cols = image_array.shape
+    region = gf.kdb.Region()
+    for box in zip(xmin.tolist(), ymin.tolist(), xmax.tolist(), ymax.tolist()):
+        region.insert(gf.kdb.Box(*box))
 
     c = gf.Component()
-    for row in range(rows):
-        for col in range(cols):
-            temp = gf.Component()
-            if image_array[row, col] == 0:  # Assuming black pixel
-                temp.add_polygon([(0,0),(0,1),(1,1),(1,0)], layer=layer)
-                c.add_ref(temp).dmove([col, rows - row])
-
-    c.flatten()
+    c.add_polygon(region, layer=layer)
     return c
@@ -4,6 +4,8 @@ import gdsfactory as gf
 from gdsfactory.typings import Component, Tuple
 
 from ..basic.marker import dice_marker
+from pylayout.build import maybe_flatten
+from pylayout.array import add_array
 
 @gf.cell
 def place_dice_marker(c: Component, sides: str, spacing: int = 25) -> Component:
@@ -20,14 +22,19 @@ def place_dice_marker(c: Component, sides: str, spacing: int = 25) -> Component:
     marker_spacing = 1180
 
     def place_markers(is_vertical: bool, length: float, coord: Tuple, rotate: bool):
-        num = np.floor(length / (marker_spacing + marker.dxsize))
+        num = int(np.floor(length / (marker_spacing + marker.dxsize)))
+        if num < 1:
+            return
         end_spacing = (length - num * marker_spacing - (num - 1) * marker.dxsize) / 2
-        for i in range(int(num)):
-            mk_ref = packed.add_ref(marker)
-            if rotate:
-                mk_ref.drotate(90)
-            mk_ref.dx = coord[0] if is_vertical else end_spacing + (i + 1) * marker.dxsize + i * marker_spacing
-            mk_ref.dy = end_spacing + (i + 1) * marker.dxsize + i * marker_spacing if is_vertical else coord[1]
+
+        # one cell array per side: the centre of the first marker and the pitch along the side
+        first = end_spacing + marker.dxsize
+        pitch = marker.dxsize + marker_spacing
+        rotation = 90 if rotate else 0
+        center = gf.kdb.DCplxTrans(1, rotation, False, 0, 0) * marker.dbbox().center()
+        x, y = (coord[0], first) if is_vertical else (first, coord[1])
+        step = (0, pitch) if is_vertical else (pitch, 0)
+        add_array(packed, marker, origin=(x - center.x, y - center.y), a=step, na=num, rotation=rotation)
 
     side_params = {
         "N": (False, ref.dxsize, (None, ref.dymax + spacing + marker.dysize / 2), False),
@@ -41,5 +48,5 @@ def place_dice_marker(c: Component, sides: str, spacing: int = 25) -> Component:
             is_vertical, length, coord, rotate = side_params.get(side, (False, 0, (0, 0), False))
             place_markers(is_vertical, length, coord, rotate)
 
-    packed.flatten()
+    maybe_flatten(packed)
     return packed
\ No newline at end of file
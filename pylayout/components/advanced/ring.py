@@ -1,11 +1,15 @@
 import numpy as np
 
 import gdsfactory as gf
-from gdsfactory.typings import CrossSectionSpec, Component, ComponentReference, LayerSpec, Dict, Port, List
+from gdsfactory.typings import CrossSectionSpec, Component, ComponentReference, ComponentSpec, LayerSpec, Dict, Port, List, Tuple
 
+from pylayout.cache import disk_cache
 from pylayout.methods import make_even_number
 from ..basic.pn_section import ring_pn_section
-from ..basic.coupler import ring_coupler_path
+from ..basic.coupler import ring_coupler_path, ring_path
+from ..basic.polygon import circle
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude
 
 def _handle_pn_section(
     c: Component,
@@ -46,7 +50,7 @@ def _handle_pn_section(
     circ_cs = next((x for x in pn.sections if x.name == "METAL_TOP"), None)
     circ_r = radius - circ_cs.offset + circ_cs.width / 2
     ydiff = y - circ_r
-    circ = gf.components.circle(radius=circ_r, layer=metal_layer)
+    circ = circle(radius=circ_r, layer=metal_layer)
     circ_ref = c.add_ref(circ)
 
     ports = {x.name: x for x in pn_section.ports if "metal".upper() in x.name.upper() or "heater".upper() in x.name.upper()}
@@ -121,7 +125,91 @@ def _handle_heater_ports(
     return x
 
 
+def _ring_width(wg: CrossSectionSpec, ring_wg: CrossSectionSpec) -> float:
+    # width of the ring cladding, from the "ring" section of the waveguide or the outer section of the ring
+    return next((x.width for x in wg.sections if x.name == "ring"), ring_wg.sections[-1].width)
+
+@gf.cell
+def ring_body(
+    radius: float = 15,
+    wg: CrossSectionSpec = "rib",
+    ring_wg: CrossSectionSpec = None,
+    ring_angle: float = 360,
+    cladding_rfill: bool = False,
+) -> gf.Component:
+    """
+    Ring waveguide of a ring without its bus, centred in x with its top at y=0, and the fill of
+    its inner cladding. It does not depend on the gap, so every gap of a sweep shares it.
+
+    Args:
+        radius (float): Radius
+        wg (CrossSectionSpec): Waveguide cross section of the bus
+        ring_wg (CrossSectionSpec): Ring waveguide cross section
+        ring_angle (float): Ring angle
+        cladding_rfill (bool): Fill the inner side of the ring cladding
+
+    Returns:
+        gf.Component: Ring body with the ports o3 and o4 if the ring is open
+    """
+    wg = gf.get_cross_section(wg)
+    ring_wg = gf.get_cross_section(ring_wg) if ring_wg else wg
+
+    c = gf.Component()
+    inner_arc_ref = c.add_ref(extrude(ring_path(radius, ring_angle), ring_wg))
+    inner_arc_ref.dx, inner_arc_ref.dymax = 0, 0
+
+    if (r_width := _ring_width(wg, ring_wg)) and cladding_rfill:
+        rfill = gf.components.circle(radius=radius, layer=ring_wg.sections[-1].layer)
+        rfill_ref = c.add_ref(rfill)
+        rfill_ref.dx = inner_arc_ref.dx
+        rfill_ref.dymin = inner_arc_ref.dymin + r_width
+
+    if ring_angle < 360:
+        c.add_port("o3", port=inner_arc_ref.ports["o1"])
+        c.add_port("o4", port=inner_arc_ref.ports["o2"])
+    return c
+
+def _add_ring_waveguides(
+    c: Component,
+    wg: CrossSectionSpec,
+    ring_wg: CrossSectionSpec,
+    radius: float,
+    gap: float,
+    angle: float,
+    ring_angle: float,
+    max_length: float,
+    cladding_rfill: bool,
+) -> tuple:
+    """
+    Add the ring body and the bus to c as references
+
+    Returns:
+        tuple: references of the ring body and of the bus
+    """
+    _, outer_arc = ring_coupler_path(radius, gap, wg, angle, ring_angle)
+
+    if max_length:
+        straight_length = (max_length - outer_arc.dsize[0]) / 2
+        outer_arc = gf.Path(
+            [
+                gf.path.straight(length=straight_length),
+                outer_arc,
+                gf.path.straight(length=straight_length)
+            ]
+        )
+
+    body = ring_body(radius=radius, wg=wg, ring_wg=ring_wg, ring_angle=ring_angle, cladding_rfill=cladding_rfill)
+    body_ref = c.add_ref(body)
+    outer_arc_ref = c.add_ref(extrude(outer_arc, wg))
+    # centred on the ring waveguide (the first instance of the body), which has its top at y=0
+    outer_arc_ref.dx = body.insts[0].dx
+
+    if r_width := _ring_width(wg, ring_wg):
+        outer_arc_ref.dymax = -r_width + ring_wg.width/2 + gap + wg.width/2 + wg.sections[-1].width/2
+    return body_ref, outer_arc_ref
+
 @gf.cell
+@disk_cache
 def ring(
     wg: CrossSectionSpec = "rib",
     ring_wg: CrossSectionSpec = None,
@@ -175,31 +263,8 @@ def ring(
     if angle > 180:
         raise ValueError("Interaction length is too large")
     
-    inner_arc, outer_arc =  ring_coupler_path(radius, gap, wg, angle, ring_angle)
-
-    if max_length:
-        straight_length = (max_length - outer_arc.dsize[0]) / 2
-        outer_arc = gf.Path(
-            [
-                gf.path.straight(length=straight_length),
-                outer_arc,
-                gf.path.straight(length=straight_length)
-            ]
-        )
-
     c = gf.Component()
-    inner_arc_ref = c.add_ref(inner_arc.extrude(ring_wg))
-    outer_arc_ref = c.add_ref(outer_arc.extrude(wg))
-    inner_arc_ref.dx, inner_arc_ref.dymax = 0, 0
-    outer_arc_ref.dx = inner_arc_ref.dx
-    
-    if r_width := next((x.width for x in wg.sections if x.name == "ring"), ring_wg.sections[-1].width):
-        outer_arc_ref.dymax = inner_arc_ref.dymax - r_width + ring_wg.width/2 + gap + wg.width/2 + wg.sections[-1].width/2
-        if cladding_rfill:
-            rfill = gf.components.circle(radius=radius, layer=ring_wg.sections[-1].layer)
-            rfill_ref = c.add_ref(rfill)
-            rfill_ref.dx = inner_arc_ref.dx
-            rfill_ref.dymin = inner_arc_ref.dymin + r_width
+    body_ref, outer_arc_ref = _add_ring_waveguides(c, wg, ring_wg, radius, gap, angle, ring_angle, max_length, cladding_rfill)
 
     if pn:
         _handle_pn_section(c, radius, wg, pn, outer_arc_ref, dist_pn_to_wg, dist_y,
@@ -209,8 +274,93 @@ def ring(
     c.add_port("o2", port=outer_arc_ref.ports["o2"])
 
     if ring_angle < 360:
-        c.add_port("o3", port=inner_arc_ref.ports["o1"])
-        c.add_port("o4", port=inner_arc_ref.ports["o2"])
+        c.add_port("o3", port=body_ref.ports["o3"])
+        c.add_port("o4", port=body_ref.ports["o4"])
     
-    c.flatten()
-    return c
\ No newline at end of file
+    maybe_flatten(c)
+    return c
+
+def _per_radius(value, radius: float):
+    return value[radius] if isinstance(value, dict) else value
+
+@gf.cell
+def _ring_sweep_element(
+    wg: CrossSectionSpec,
+    ring_wg: CrossSectionSpec,
+    radius: float,
+    gap: float,
+    angle: float,
+    max_length: float,
+    cladding_rfill: bool,
+    gc: ComponentSpec,
+) -> gf.Component:
+    # references to the shared ring body and grating coupler, only the bus is specific to the gap
+    c = gf.Component()
+    _, outer_arc_ref = _add_ring_waveguides(c, wg, ring_wg, radius, gap, angle, 360, max_length, cladding_rfill)
+    if gc is None:
+        c.add_ports(outer_arc_ref.ports)
+        return c
+
+    gc = gf.get_component(gc)
+    for port in ["o1", "o2"]:
+        gc_ref = c.add_ref(gc)
+        gc_ref.connect("o1", outer_arc_ref, port)
+    return c
+
+def ring_sweep(
+    radii: List[float],
+    gaps: List[float] | Dict[float, List[float]],
+    wg: CrossSectionSpec = "rib",
+    ring_wg: CrossSectionSpec | Dict[float, CrossSectionSpec] = None,
+    int_angle: float | Dict[float, float] = 20,
+    max_length: float = None,
+    cladding_rfill: bool = False,
+    gc: ComponentSpec = None,
+    spacing: Tuple[float, float] = (101, 290),
+    rotation: int = 90,
+) -> gf.Component:
+    """
+    Matrix of rings with grating couplers, one row per radius and one column per gap. The ring
+    body (with its cladding fill) of each radius and the grating coupler are shared cells,
+    only the bus is built for every gap, and the matrix is made of references.
+
+    Args:
+        radii (List[float]): Radii, one row each
+        gaps (List[float] | Dict[float, List[float]]): Gaps, or the gaps of each radius
+        wg (CrossSectionSpec): Waveguide cross section
+        ring_wg (CrossSectionSpec | Dict[float, CrossSectionSpec]): Ring waveguide cross section, or the one of each radius
+        int_angle (float | Dict[float, float]): Interaction angle, or the one of each radius
+        max_length (float): Length of the bus
+        cladding_rfill (bool): Fill the inner side of the ring cladding
+        gc (ComponentSpec): Grating coupler attached to both ends of the bus, None for none
+        spacing (Tuple[float, float]): Spacing between the columns and the rows
+        rotation (int): Rotation of every ring in degrees
+
+    Returns:
+        gf.Component: Ring matrix
+    """
+    wg = gf.get_cross_section(wg)
+
+    rows = []
+    for radius in radii:
+        ring_wg_r = _per_radius(ring_wg, radius)
+        ring_wg_r = gf.get_cross_section(ring_wg_r) if ring_wg_r else wg
+        rows.append([
+            _ring_sweep_element(
+                wg=wg, ring_wg=ring_wg_r, radius=radius, gap=gf.snap.snap_to_grid(gap, nm=1, grid_factor=1),
+                angle=_per_radius(int_angle, radius), max_length=max_length, cladding_rfill=cladding_rfill, gc=gc,
+            ) for gap in _per_radius(gaps, radius)
+        ])
+
+    c = gf.Component()
+    y = 0
+    for row in rows:
+        refs = [c.add_ref(element) for element in row]
+        for ref in refs:
+            ref.drotate(rotation)
+        x = 0
+        for ref in refs:
+            ref.dxmin, ref.dymax = x, y
+            x = ref.dxmax + spacing[0]
+        y = min(ref.dymin for ref in refs) - spacing[1]
+    return c
@@ -1,5 +1,7 @@
 import gdsfactory as gf
 from gdsfactory.typings import CrossSectionSpec, Component, ComponentReference
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude_sections, extrude_straight
 
 @gf.cell
 def straight_with_filament(
@@ -31,17 +33,17 @@ def straight_with_filament(
 
     wg, filament = map(gf.get_cross_section, [wg, filament])
 
-    waveguide = gf.path.straight(length=length).extrude(wg)
+    waveguide = extrude_straight(length, wg)
     waveguide_ref = c.add_ref(waveguide)
 
     extra_heater_length = 1
-    h = gf.Path([
+    h = extrude_sections(gf.Path([
         gf.path.straight(length=extra_heater_length),
         gf.path.arc(radius=filament.width, angle=-90),
         gf.path.straight(length=filament_length),
         gf.path.arc(radius=filament.width, angle=-90),
         gf.path.straight(length=extra_heater_length)
-    ]).extrude(filament)
+    ]), filament)
     heater_ref = c.add_ref(h)
     heater_ref.drotate(90)
     heater_ref.dx, heater_ref.dymax = waveguide_ref.dx, waveguide_ref.dy + filament.width/2
@@ -58,7 +60,7 @@ def straight_with_filament(
             gf.path.arc(radius=(metal_cs.width / 2 + 10), angle=90),
             gf.path.straight(length=20)
         ])
-        metal_path = metal_path.extrude(metal_cs)
+        metal_path = extrude_sections(metal_path, metal_cs)
 
         lmetal_ref = c.add_ref(metal_path).mirror_x()
         place_metal(lmetal_ref, heater_ref.dxmin - metal_cs.width/2 + lmetal_ref.dxsize/2,
@@ -73,5 +75,5 @@ def straight_with_filament(
     c.add_port("e1", port=heater_ref.ports["e1"])
     c.add_port("e2", port=heater_ref.ports["e2"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -3,8 +3,9 @@ from pylayout.components.basic.marker import dice_marker
 from pylayout.components.basic.gc import attach_grating_coupler, gc_silicon_1550nm
 from pylayout.components.basic.medal import medal_shape
 from pylayout.components.basic.omega import omega_shape
+from pylayout.components.basic.polygon import circle
 from pylayout.components.basic.pn_section import ring_pn_section
 from pylayout.components.basic.frame import outline
-from pylayout.components.basic.truncated_circle import truncated_circle_bool, truncated_circle_poly
+from pylayout.components.basic.truncated_circle import truncated_circle_bool, truncated_circle_poly, truncated_circle_analytic
 from pylayout.components.basic.splitter import mmi_splitter, coupler_2x2
-from pylayout.components.basic.coupler import ring_coupler, ring_coupler_path
\ No newline at end of file
+from pylayout.components.basic.coupler import ring_coupler, ring_coupler_path, ring_path
\ No newline at end of file
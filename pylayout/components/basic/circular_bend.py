@@ -1,5 +1,7 @@
 import gdsfactory as gf
 from gdsfactory.typings import CrossSectionSpec
+from pylayout.build import maybe_flatten
+from pylayout.path import PathBuilder
 
 @gf.cell
 def circular_bend_180(radius: float, cs: CrossSectionSpec):
@@ -19,7 +21,7 @@ def circular_bend_180(radius: float, cs: CrossSectionSpec):
     c.add_ref(path)
     c.add_ports(path.ports)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 @gf.cell
@@ -32,13 +34,13 @@ def circular_bend_360(radius, cs: CrossSectionSpec):
     """
     c = gf.Component()
 
-    path = gf.Path()
+    path = PathBuilder()
     angles = [90, -90, -90, 90]
     for angle in angles:
         path += gf.path.arc(radius=radius, angle=angle)
-    path = path.extrude(cs)
+    path = path.path().extrude(cs)
     c.add_ref(path)
     c.add_ports(path.ports)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -1,5 +1,12 @@
+import os
+
 import gdsfactory as gf
-from gdsfactory.typings import CrossSectionSpec
+from gdsfactory.typings import CrossSectionSpec, Tuple
+from pylayout.build import maybe_flatten
+from pylayout.cache import LRUCache
+from pylayout.extrude import extrude
+
+PATH_CACHE = LRUCache(maxsize=int(os.environ.get("PYLAYOUT_PATH_CACHE_SIZE", 256)))
 
 def ring_coupler_path(
     radius: float = 15,
@@ -7,8 +14,42 @@ def ring_coupler_path(
     wg: CrossSectionSpec = "rib",
     angle: float = 20,
     ring_angle: float = 360,
-):
-    outer_radius = radius + gap + wg.width
+) -> Tuple[gf.Path, gf.Path]:
+    """
+    Paths of the ring and of the outer bus (three arcs of the same radius, extended with
+    straights to the diameter of the ring). The paths are memoized in PATH_CACHE, every call
+    returns new copies that can be modified.
+
+    Args:
+        radius [float]: radius of the ring
+        gap [float]: gap between the ring and the bus
+        wg [CrossSectionSpec]: waveguide cross-section of the bus
+        angle [float]: angle of the coupling arc
+        ring_angle [float]: angle of the ring
+
+    Returns:
+        Tuple[gf.Path, gf.Path]: inner and outer paths
+    """
+    wg = gf.get_cross_section(wg)
+    # the ring does not depend on the gap, so it is shared by every gap of a sweep
+    inner_arc = ring_path(radius, ring_angle)
+    outer_arc = PATH_CACHE.get(("bus", radius, gap, angle, wg.width), lambda: _bus_path(radius, radius + gap + wg.width, angle))
+    return inner_arc, outer_arc.copy()
+
+def ring_path(radius: float = 15, ring_angle: float = 360) -> gf.Path:
+    """
+    Path of the ring, memoized in PATH_CACHE. Every call returns a new copy.
+
+    Args:
+        radius [float]: radius of the ring
+        ring_angle [float]: angle of the ring
+
+    Returns:
+        gf.Path: ring path
+    """
+    return PATH_CACHE.get(("ring", radius, ring_angle), lambda: gf.path.arc(radius, angle=ring_angle)).copy()
+
+def _bus_path(radius: float, outer_radius: float, angle: float) -> gf.Path:
     outer_arc = gf.Path([
         gf.path.arc(outer_radius, angle / 2),
         gf.path.arc(outer_radius, -angle),
@@ -23,9 +64,7 @@ def ring_coupler_path(
             outer_arc,
             gf.path.straight(length=straight_segment_length / 2)
         ])
-
-    inner_arc = gf.path.arc(radius, angle=ring_angle)
-    return inner_arc, outer_arc
+    return outer_arc
 
 
 @gf.cell
@@ -61,10 +100,10 @@ def ring_coupler(
     inner_arc, outer_arc = ring_coupler_path(radius, gap, wg, angle, ring_angle)
 
     # Add the arcs to the component and align them
-    outer_arc_ref = c.add_ref(outer_arc, name="outer_arc")
-    inner_arc_ref = c.add_ref(inner_arc, name="inner_arc")
+    outer_arc_ref = c.add_ref(extrude(outer_arc, wg), name="outer_arc")
+    inner_arc_ref = c.add_ref(extrude(inner_arc, wg), name="inner_arc")
     outer_arc_ref.dx = inner_arc_ref.dx
     outer_arc_ref.dymax = inner_arc_ref.dymax + gap + wg.width
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
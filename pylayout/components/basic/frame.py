@@ -1,5 +1,6 @@
 import gdsfactory as gf
 from gdsfactory.typings import LayerSpec
+from pylayout.build import maybe_flatten
 
 @gf.cell
 def outline(width: float=11470, height: float=4900, layer: LayerSpec=(0.0)) -> gf.Component:
@@ -15,5 +16,5 @@ def outline(width: float=11470, height: float=4900, layer: LayerSpec=(0.0)) -> g
         layer=layer,
         centered=True
     )
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -1,13 +1,70 @@
+import os
 from functools import partial
 
 import numpy as np
 
 import gdsfactory as gf
 from gdsfactory.typings import List, Component, LayerSpec, CrossSectionSpec
-from gdsfactory.components.grating_coupler_elliptical import grating_tooth_points
-from gdsfactory.functions import DEG2RAD
+from gdsfactory.functions import DEG2RAD, RAD2DEG
+
+from pylayout.cache import disk_cache, register_setting
+from pylayout.array import add_placements
+from pylayout.build import maybe_flatten
+
+# keep the attached grating couplers as one shared cell, see set_shared_gc
+SHARED_GC = os.environ.get("PYLAYOUT_SHARED_GC", "0").lower() in ("1", "true", "yes")
+register_setting("shared_gc", lambda: SHARED_GC)
+
+def _grating_teeth(
+    a: np.ndarray,
+    b: np.ndarray,
+    x: np.ndarray,
+    width: float,
+    taper_angle: float,
+    angle_step: float = 1.0,
+) -> np.ndarray:
+    """
+    Outlines of all the teeth at once, one row per tooth. Same points as
+    gdsfactory's grating_tooth_points (spiked elliptical arcs), computed over the period index.
+
+    Args:
+        a [np.ndarray]: semi-major axes of the teeth
+        b [np.ndarray]: semi-minor axes of the teeth
+        x [np.ndarray]: x offsets of the teeth
+        width [float]: width of the teeth
+        taper_angle [float]: angle of the arcs in degrees
+        angle_step [float]: angle step of the arcs in degrees
+
+    Returns:
+        np.ndarray: (teeth, points, 2) outlines
+    """
+    theta = np.arange(-taper_angle / 2, taper_angle / 2 + angle_step, angle_step) * DEG2RAD
+    xs = gf.snap.snap_to_grid(a[:, None] * np.cos(theta) + x[:, None])
+    ys = gf.snap.snap_to_grid(b[:, None] * np.sin(theta))
+    points = np.stack([xs, ys], axis=-1)
+
+    # mitred offset of the backbone with spiked ends, as in gf.functions.extrude_path
+    following = np.roll(points, -1, axis=1)
+    angles = np.arctan2(following[..., 1] - points[..., 1], following[..., 0] - points[..., 0])
+    start_angle = angles[:, 0] * RAD2DEG + 180
+    end_angle = angles[:, -2] * RAD2DEG
+
+    a2 = angles * 0.5
+    a1 = np.roll(a2, 1, axis=1)
+    a2[:, -1] = end_angle * DEG2RAD - a2[:, -2]
+    a1[:, 0] = start_angle * DEG2RAD - a1[:, 1]
+    a_plus = a2 + a1
+    cos_a_min = np.cos(a2 - a1)
+    offsets = np.stack((-np.sin(a_plus) / cos_a_min, np.cos(a_plus) / cos_a_min), axis=-1) * (0.5 * width)
+
+    spike = width / 3
+    start = points[:, 0] + spike * np.column_stack((np.cos(start_angle * DEG2RAD), np.sin(start_angle * DEG2RAD)))
+    end = points[:, -1] + spike * np.column_stack((np.cos(end_angle * DEG2RAD), np.sin(end_angle * DEG2RAD)))
+    outlines = np.concatenate((start[:, None], points + offsets, end[:, None], (points - offsets)[:, ::-1]), axis=1)
+
+    grid = gf.kcl.dbu
+    return np.round(outlines / grid) * grid
 
-@gf.cell
 def grating_coupler_elliptical_trenches(
     polarization: str = "te",
     taper_length: float = 16.6,
@@ -30,6 +87,9 @@ def grating_coupler_elliptical_trenches(
     Some foundries define the grating coupler by a shallow etch step (trenches)
     Others define the slab that they keep (see grating_coupler_elliptical)
 
+    The cell is cached by its physical parameters: the cross-section and the layer are
+    resolved first, so every spec that gives the same grating shares one cell.
+
     Args:
         polarization: 'te' or 'tm'.
         taper_length: taper length from straight I/O.
@@ -58,7 +118,41 @@ def grating_coupler_elliptical_trenches(
         WG  o1  ______________|
 
     """
-    xs = gf.get_cross_section(cross_section, **kwargs)
+    return _grating_coupler_elliptical_trenches(
+        polarization=polarization,
+        taper_length=taper_length,
+        taper_angle=taper_angle,
+        trenches_extra_angle=trenches_extra_angle,
+        wavelength=wavelength,
+        fiber_angle=fiber_angle,
+        grating_line_width=grating_line_width,
+        neff=neff,
+        ncladding=ncladding,
+        layer_trench=gf.get_layer(layer_trench),
+        p_start=p_start,
+        n_periods=n_periods,
+        end_straight_length=end_straight_length,
+        xs=gf.get_cross_section(cross_section, **kwargs),
+    )
+
+@gf.cell(basename="grating_coupler_elliptical_trenches")
+@disk_cache
+def _grating_coupler_elliptical_trenches(
+    polarization: str,
+    taper_length: float,
+    taper_angle: float,
+    trenches_extra_angle: float,
+    wavelength: float,
+    fiber_angle: float,
+    grating_line_width: float,
+    neff: float,
+    ncladding: float,
+    layer_trench: LayerSpec,
+    p_start: int,
+    n_periods: int,
+    end_straight_length: float,
+    xs: gf.CrossSection,
+) -> Component:
     wg_width = xs.width
     layer = xs.layer
 
@@ -78,16 +172,11 @@ def grating_coupler_elliptical_trenches(
 
     c = gf.Component()
 
-    # Make each grating line
-    for p in range(p_start, p_start + n_periods + 1):
-        pts = grating_tooth_points(
-            p * a1,
-            p * b1,
-            p * x1,
-            width=trench_line_width,
-            taper_angle=taper_angle + trenches_extra_angle,
-        )
-        c.add_polygon(pts, layer_trench)
+    # Make all the grating lines at once
+    p = np.arange(p_start, p_start + n_periods + 1)
+    teeth = _grating_teeth(p * a1, p * b1, p * x1, width=trench_line_width, taper_angle=taper_angle + trenches_extra_angle)
+    region = gf.kdb.Region([gf.kdb.Polygon(tooth) for tooth in np.round(teeth / c.kcl.dbu).astype(np.int64).tolist()])
+    c.add_polygon(region, layer=layer_trench)
 
     # Make the taper
     p_taper = p_start - 1
@@ -151,27 +240,48 @@ gc_silicon_1550nm = partial(
     end_straight_length=0,
 )
 
-def attach_grating_coupler(obj: Component, gc: Component, ports: List[str]=None) -> Component:
+def set_shared_gc(shared: bool) -> None:
+    """
+    Keep the grating couplers attached by attach_grating_coupler (and add_norm_wg) as one
+    shared cell placed by reference, instead of copying their polygons into every structure
+    when it is flattened. Cells are cached by name, so set it before the cells are built.
+
+    Args:
+        shared [bool]: True to share the grating coupler cells
+    """
+    global SHARED_GC
+    SHARED_GC = shared
+
+def attach_grating_coupler(obj: Component, gc: Component, ports: List[str]=None, shared: bool=None) -> Component:
     """
     Attach grating couplers to the component
 
     Args:
         obj [gf.Component]: gf.Component: component to attach the grating couplers
         ports [list]: list: list of ports of the component
+        shared [bool]: keep the grating coupler as a shared cell (see set_shared_gc), defaults to SHARED_GC
 
     Returns:
         gf.Component: component with the grating couplers attached
     """
     if ports is None:
         ports = [x.name for x in obj.ports]
+    if shared is None:
+        shared = SHARED_GC
 
     c = gf.Component()
     gc = gf.get_component(gc)
     obj_ref = c.add_ref(obj)
 
+    # o1 of the coupler faces each port: port * R180 * o1^-1, grouped by orientation so the
+    # couplers are placed as arrays where the ports are regular
+    o1 = gc.ports["o1"].dcplx_trans.inverted()
+    placements = {}
     for port in ports:
-        gc_ref = c.add_ref(gc)
-        gc_ref.connect("o1", obj_ref, port)
+        trans = obj_ref.ports[port].dcplx_trans * gf.kdb.DCplxTrans.R180 * o1
+        placements.setdefault((trans.angle, trans.is_mirror()), []).append((trans.disp.x, trans.disp.y))
+    for (rotation, mirror), positions in placements.items():
+        add_placements(c, gc, positions, rotation=rotation, mirror=mirror)
 
-    c.flatten()
-    return c
\ No newline at end of file
+    maybe_flatten(c, shared=[gc] if shared else [])
+    return c
@@ -1,5 +1,7 @@
 import gdsfactory as gf
 from gdsfactory.typings import LayerSpec
+from pylayout.build import maybe_flatten
+from pylayout.array import add_array
 
 @gf.cell
 def dice_marker(
@@ -24,25 +26,21 @@ def dice_marker(
     """
     c = gf.Component()
 
-    rect = gf.cross_section.ComponentAlongPath(
-        component=gf.c.rectangle(size=(width, width), centered=True, layer=layer),
-        spacing=spacing + width,
-        padding=0,
-        offset=-width
-    )
+    # a line with a row of squares above it, the squares are one cell array placed like
+    # gf.path.along_path would place them
+    pitch = spacing + width
+    number = int(length // pitch) + 1
+    first = (length - (number - 1) * pitch) / 2
 
-    x = gf.CrossSection(
-        sections=[gf.Section(width=width, offset=0, layer=layer)],
-        components_along_path=[rect]
-    )
+    mark = gf.Component()
+    mark.add_polygon([(0, -width/2), (length, -width/2), (length, width/2), (0, width/2)], layer=layer)
+    square = gf.c.rectangle(size=(width, width), centered=True, layer=layer)
+    add_array(mark, square, origin=(first, width), a=(pitch, 0), na=number)
 
-    path = gf.Path()
-    path += gf.path.straight(length=length)
-
-    mark1_ref, mark2_ref = [c.add_ref(path.extrude(x)) for _ in range(2)]
+    mark1_ref, mark2_ref = [c.add_ref(mark) for _ in range(2)]
     mark2_ref.mirror_y()
     mark2_ref.dx = mark1_ref.dx
     mark2_ref.dymin = mark1_ref.dymax + marker_gap
     
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -3,7 +3,8 @@ import numpy as np
 import gdsfactory as gf
 from gdsfactory.typings import LayerSpec
 
-from .polygon import regular_polygon
+from .polygon import regular_polygon, arc_max_error
+from pylayout.build import maybe_flatten
 
 @gf.cell
 def medal_shape(
@@ -14,6 +15,7 @@ def medal_shape(
     midrect_height: float,
     radius: float,
     layer: LayerSpec=(0,0),
+    max_error: float=None,
 ):
     """
     This create a medal shape structure. If this is for a metal layer, then please also specify a via layer
@@ -41,13 +43,15 @@ def medal_shape(
         trap_height [float]: height of the trapezium part
         midrect_height [float]: height of the middle rectangular part
         radius [float]: radius of the circular part
+        max_error [float]: maximum chord error of the circular part, by default the one set for the layer
     """
     c = gf.Component()
 
     circ_y = - rect_height - trap_height - midrect_height - np.sqrt(radius**2 - (trap_short_width/2)**2)
     half_ang = np.arcsin((trap_short_width/2)/radius)
     
-    poly_pts = regular_polygon(x=rect_width/2, y=circ_y, radius=radius, angle=-2*(np.pi-half_ang), start_angle=np.pi/2-half_ang)
+    max_error = arc_max_error(layer) if max_error is None else max_error
+    poly_pts = regular_polygon(x=rect_width/2, y=circ_y, radius=radius, angle=-2*(np.pi-half_ang), start_angle=np.pi/2-half_ang, max_error=max_error)
     
     points = [
         [0, 0],
@@ -65,5 +69,5 @@ def medal_shape(
     ]
     c.add_polygon(points, layer=layer)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -1,5 +1,7 @@
 import gdsfactory as gf
 from gdsfactory.typings import Component, CrossSectionSpec
+from pylayout.build import maybe_flatten
+from pylayout.path import PathBuilder
 
 @gf.cell
 def omega_shape(
@@ -26,14 +28,14 @@ def omega_shape(
         (long_st, -180), (short_st, 180), (const_length, 0)
     ]
 
-    path = gf.Path()
+    path = PathBuilder()
     for length, angle in path_list:
         path += gf.path.straight(length=length)
         if angle:
             path += gf.path.arc(radius=10, angle=angle)
 
-    ref = c.add_ref(path.extrude(cs))
+    ref = c.add_ref(path.path().extrude(cs))
     c.add_ports(ref.ports)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
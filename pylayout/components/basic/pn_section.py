@@ -1,44 +1,103 @@
+import numpy as np
+
 import gdsfactory as gf
-from gdsfactory.typings import CrossSectionSpec, Component
+from gdsfactory.typings import CrossSectionSpec, Component, Dict, List
+
+from pylayout.cache import disk_cache
+from .polygon import arc_max_error
+from .truncated_circle import truncated_annulus, truncated_radii
+
+def _heater_arc(radius: float, width: float, heater_percent: float) -> np.ndarray:
+    # same points as gf.path.arc(...).extrude(), offset radially around the ring centre
+    angle = heater_percent*360
+    start_angle = 90 + (1 - heater_percent)*180
+    npoints = abs(int(angle / 360 * radius / gf.get_active_pdk().bend_points_distance / 2))
+    npoints = max(npoints, int(360 / angle) + 1)
+    t = np.radians(np.linspace(start_angle, start_angle + angle, npoints))
+    arc = np.column_stack((np.cos(t), np.sin(t)))
+
+    # extrude offsets the inner points along the bisector, keeping the edges width/2 from the
+    # chords, and the end points by width/2
+    offset = np.full(npoints, width/2)
+    offset[1:-1] /= np.cos((t[1] - t[0])/2)
+    outer = (radius + offset)[:, None] * arc
+    inner = (radius - offset)[:, None] * arc
 
-from .truncated_circle import truncated_circle_bool
+    # the path is drawn around (0, radius) and snapped to the grid there
+    points = np.concatenate((outer, inner[::-1])) + (0, radius)
+    return points, t
 
 @gf.cell
+@disk_cache
 def ring_pn_section(
     radius: float,
     pn: CrossSectionSpec,
     y: float, # distance from the center of the ring to the straight arc
     heater_percent: float=0.7,
 ) -> Component:
+    """
+    Doping, via, metal and heater rings of a PN cross-section around a ring centred at the
+    origin. The rings of every section are computed directly and inserted per layer in one go,
+    with the arc settings of their layer (see set_arc_max_error).
+
+    Args:
+        radius [float]: radius of the ring
+        pn [CrossSectionSpec]: PN cross-section
+        y [float]: y coordinate where the rings are cut
+        heater_percent [float]: fraction of the ring covered by the heater
+
+    Returns:
+        Component: component with the ports {section}_p1/p2 and HEATER_p1/p2
+    """
     c = gf.Component()
+    dbu = c.kcl.dbu
+    regions: Dict[int, gf.kdb.Region] = {}
+    ports: List[dict] = []
 
     for sec in pn.sections:
-        temp_y = y
-        if gf.get_layer(sec.layer) == 3 \
-            or gf.get_layer(sec.layer) == 5:
+        layer = gf.get_layer(sec.layer)
+        if layer == 3 or layer == 5:
             continue
 
         # need to exclude heater metal
         if "heater_metal".upper() in sec.name.upper():
             continue
 
+        region = regions.setdefault(layer, gf.kdb.Region())
+
+        if "heater".upper() in sec.name.upper():
+            points, t = _heater_arc(radius, sec.width, heater_percent)
+            polygon = gf.kdb.DPolygon([gf.kdb.DPoint(*p) for p in points]).to_itype(dbu)
+            # placed by its bounding box like the extruded arc: centred in x, bottom at -radius-width/2
+            box = polygon.bbox()
+            shift = gf.kdb.Vector(-round(box.center().x), round((-radius - sec.width/2)/dbu) - box.bottom)
+            region.insert(polygon.moved(shift))
+
+            # the heater runs counter-clockwise, HEATER_p2 is the start and HEATER_p1 the end
+            for name, angle, orientation in [("HEATER_p2", t[0], np.degrees(t[0]) + 270), ("HEATER_p1", t[-1], np.degrees(t[-1]) + 90)]:
+                center = np.round(radius*np.array([np.cos(angle), np.sin(angle) + 1]) / dbu) + [shift.x, shift.y]
+                ports.append(dict(
+                    name=name, center=tuple(center*dbu), width=sec.width,
+                    orientation=orientation % 360, layer=sec.layer, port_type="electrical",
+                ))
+            continue
+
         outer_r = radius - sec.offset + sec.width/2
         inner_r = radius - sec.offset - sec.width/2
+        inner_r, outer_r, width = truncated_radii(inner_r, outer_r, y)
+        polygon = truncated_annulus(inner_r, outer_r, y, max_error=arc_max_error(sec.layer))
+        if polygon is not None:
+            region.insert(polygon.to_itype(dbu))
 
-        # life is too hard...too disgusting...
-        if "heater".upper() in sec.name.upper():
-            arc = gf.path.arc(radius=radius, angle=heater_percent*360, start_angle=90+(1-heater_percent)*180)
-            # make crossection from a section
-            cs = gf.cross_section.CrossSection(sections=[sec])
-            arc = arc.extrude(cs)
-            ref = c.add_ref(arc)
-            ref.dx, ref.dymin = 0, -radius-sec.width/2
-            c.add_port("HEATER_p2", ref.ports["e1"])
-            c.add_port("HEATER_p1", ref.ports["e2"])
-        else:
-            pn_ring = truncated_circle_bool(inner_r, outer_r, temp_y, sec.layer, port_prefix=sec.name)
-            ref = c.add_ref(pn_ring)
-            c.add_ports(ref.ports)
-
-    c.flatten()
-    return c
\ No newline at end of file
+        if width is not None:
+            x_center = (np.sqrt(outer_r**2 - y**2) + np.sqrt(inner_r**2 - y**2)) / 2
+            for name, x in [(f"{sec.name}_p1", x_center), (f"{sec.name}_p2", -x_center)]:
+                ports.append(dict(
+                    name=name, center=(x, y), width=width, orientation=90, layer=sec.layer, port_type="electrical",
+                ))
+
+    for layer, region in regions.items():
+        c.add_polygon(region, layer=layer)
+    for port in ports:
+        c.add_port(**port)
+    return c
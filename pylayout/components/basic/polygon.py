@@ -1,6 +1,79 @@
 import numpy as np
 
-def regular_polygon(x: float, y: float, radius: float, angle: float, angle_resolution: float=2.5, start_angle: float=0) -> np.ndarray:
+import gdsfactory as gf
+from gdsfactory.typings import Component, Dict, LayerSpec
+
+from pylayout import cache
+
+DESIGN_GRID = 1e-3
+
+# maximum distance between an arc and its chords (sagitta) in um, per layer with None as the
+# default for every other layer. An empty registry keeps the fixed angle resolution.
+ARC_MAX_ERROR: Dict[object, float] = {}
+# the arc settings change the geometry, so they are part of the disk cache keys
+cache.register_setting("arc_max_error", lambda: ARC_MAX_ERROR)
+
+def set_arc_max_error(max_error: float = DESIGN_GRID, layer: LayerSpec = None) -> None:
+    """
+    Derive the number of points of arcs from a maximum chord error instead of a fixed angle
+    resolution. Cells are cached by name, so set it before the cells are built.
+
+        >> set_arc_max_error()                            # 1 nm everywhere
+        >> set_arc_max_error(10e-3, layer=(41, 0))        # 10 nm on the metal pads
+
+    The number of points never exceeds the one of the fixed angle resolution, so arcs get
+    fewer points where the fixed resolution is finer than max_error and keep theirs otherwise.
+
+    Args:
+        max_error [float]: maximum chord error in um, None removes the setting
+        layer [LayerSpec]: layer it applies to, None for every layer without its own setting
+    """
+    key = None if layer is None else gf.get_layer(layer)
+    if max_error is None:
+        ARC_MAX_ERROR.pop(key, None)
+    else:
+        ARC_MAX_ERROR[key] = max_error
+
+def arc_max_error(layer: LayerSpec = None) -> float:
+    """
+    Maximum chord error of the arcs on a layer, None if the fixed angle resolution is used.
+    """
+    if layer is not None and gf.get_layer(layer) in ARC_MAX_ERROR:
+        return ARC_MAX_ERROR[gf.get_layer(layer)]
+    return ARC_MAX_ERROR.get(None)
+
+def arc_num_points(radius: float, angle: float, max_error: float, angle_resolution: float=2.5) -> int:
+    """
+    Number of points of an arc so that its chords stay within max_error of the arc, but never
+    more than the fixed angle resolution gives: large arcs keep their points (their chord error
+    is then larger than max_error) and arcs finer than max_error get fewer. The error is never
+    taken below half a grid point, as the snapping to the grid is already that far off.
+
+    Args:
+        radius [float]: radius of the arc.
+        angle [float]: angle of the arc in radians.
+        max_error [float]: maximum distance between the arc and its chords.
+        angle_resolution [float]: angle resolution in degrees that bounds the number of points.
+
+    Returns:
+        int: number of points, including both ends.
+    """
+    max_error = max(max_error, DESIGN_GRID/2)
+    step = 2*np.arccos(1 - max_error/radius) if max_error < radius else np.pi
+    # at least 8 segments on a full circle
+    segments = max(int(np.ceil(abs(angle) / min(step, np.pi/4))), 1)
+    fixed = max(int(np.ceil(np.degrees(abs(angle)) / angle_resolution - 1e-9)), 1)
+    return min(segments, fixed) + 1
+
+def regular_polygon(
+    x: float,
+    y: float,
+    radius: float,
+    angle: float,
+    angle_resolution: float=2.5,
+    start_angle: float=0,
+    max_error: float=None,
+) -> np.ndarray:
     """
     Returns the points of a regular polygon.
 
@@ -11,11 +84,37 @@ def regular_polygon(x: float, y: float, radius: float, angle: float, angle_resol
         angle [float]: angle of the polygon.
         angle_resolution [float]: angle resolution.
         start_angle [float]: starting angle.
+        max_error [float]: maximum chord error, with at most the points of angle_resolution.
 
     Returns:
         np.ndarray: points of the regular polygon.
     """
-    num_points = int(360 / angle_resolution) + 1
+    if max_error is None:
+        num_points = int(360 / angle_resolution) + 1
+    else:
+        num_points = arc_num_points(radius, angle, max_error, angle_resolution)
     angles = np.linspace(start_angle, start_angle + angle, num_points)
     points = np.column_stack((x + radius * np.cos(angles), y + radius * np.sin(angles)))
-    return points
\ No newline at end of file
+    return points
+
+@gf.cell
+def circle(radius: float, layer: LayerSpec, angle_resolution: float=2.5, max_error: float=None) -> Component:
+    """
+    Same as gf.components.circle, with the number of points from the arc settings of the layer.
+
+    Args:
+        radius [float]: radius of the circle.
+        layer [LayerSpec]: layer of the circle.
+        angle_resolution [float]: angle resolution in degrees.
+        max_error [float]: maximum chord error, by default the one set for the layer.
+
+    Returns:
+        Component: circle.
+    """
+    if radius <= 0:
+        raise ValueError(f"radius={radius} must be > 0")
+    max_error = arc_max_error(layer) if max_error is None else max_error
+
+    c = gf.Component()
+    c.add_polygon(regular_polygon(0, 0, radius, 2*np.pi, angle_resolution, max_error=max_error), layer=layer)
+    return c
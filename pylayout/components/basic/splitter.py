@@ -4,6 +4,8 @@ import gdsfactory as gf
 from gdsfactory.typings import Component, CrossSectionSpec
 
 from . import circular_bend_180
+from pylayout.build import maybe_flatten
+from pylayout.extrude import extrude_straight
 
 @gf.cell
 def mmi_splitter(
@@ -29,7 +31,7 @@ def mmi_splitter(
     wg = gf.get_cross_section(wg)
 
     mmi_ref = c.add_ref(gf.get_component(mmi))
-    st_ref = c.add_ref(gf.path.straight(length=st_length).extrude(wg))
+    st_ref = c.add_ref(extrude_straight(st_length, wg))
 
     mmi_arm_gap = abs(mmi_ref.ports["o2"].dy - mmi_ref.ports["o3"].dy) - wg.width
     bend_radius = (arm_distance - mmi_arm_gap) / 4
@@ -45,7 +47,7 @@ def mmi_splitter(
     for name, port in zip(("o1", "o2", "o3"), (st_ref.ports["o1"], tbend_ref.ports["o2"], bbend_ref.ports["o2"])):
         c.add_port(name=name, port=port)
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 @gf.cell
@@ -60,7 +62,7 @@ def coupler_2x2(
     cs = gf.get_cross_section(cs)
     splitter = gf.components.coupler(gap=gap, length=float(length), dx=1.5*(arm_distance-gap)/2, cross_section=cs, dy=arm_distance+cs.width)
     splitter_ref = c.add_ref(splitter)
-    st = gf.path.straight(length=st_length).extrude(cs)
+    st = extrude_straight(st_length, cs)
     ltst_ref, lbst_ref = [c.add_ref(st) for _ in range(2)]
 
     ltst_ref.connect("o2", splitter_ref.ports["o1"])
@@ -71,7 +73,7 @@ def coupler_2x2(
     c.add_port(name="o3", port=splitter_ref.ports["o3"])
     c.add_port(name="o4", port=splitter_ref.ports["o4"])
 
-    c.flatten()
+    maybe_flatten(c)
     return c
 
 
@@ -90,7 +92,7 @@ def main():
         lists = []
         for length in lengths:
             c = gf.Component()
-            st = gf.path.straight(length=50).extrude(rib_450)
+            st = extrude_straight(50, rib_450)
             coupler = coupler_2x2(gap=gap, length=length, arm_distance=120, cs=rib_450)
             st_ref1 = c.add_ref(st)
             st_ref2 = c.add_ref(st)
@@ -103,7 +105,7 @@ def main():
             c.add_port(name="o3", port=st_ref1["o2"])
             c.add_port(name="o4", port=st_ref2["o2"])
             c = attach_grating_coupler(c, cs_gc_silicon_1550nm, ["o1", "o2", "o3", "o4"])
-            c.flatten()
+            maybe_flatten(c)
             lists.append(c)
 
         c = gf.grid(
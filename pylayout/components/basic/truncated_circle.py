@@ -1,13 +1,14 @@
 import numpy as np
 
 import gdsfactory as gf
-from gdsfactory.typings import LayerSpec, Component
+from gdsfactory.typings import LayerSpec, Component, Tuple
 
 from pylayout.methods import make_even_number
-from .polygon import regular_polygon
+from .polygon import regular_polygon, arc_max_error, arc_num_points
+from pylayout.build import maybe_flatten
 
 @gf.cell
-def truncated_circle_poly(inner_r: float, outer_r: float, y: float, layer: LayerSpec) -> Component:
+def truncated_circle_poly(inner_r: float, outer_r: float, y: float, layer: LayerSpec, max_error: float=None) -> Component:
     """
     Create a truncated circle using polygons.
 
@@ -16,13 +17,15 @@ def truncated_circle_poly(inner_r: float, outer_r: float, y: float, layer: Layer
         outer_r [float]: outer radius of the circle.
         y [float]: y coordinate of the truncation point.
         layer [LayerSpec]: layer of the circle.
+        max_error [float]: maximum chord error, by default the one set for the layer.
 
     Returns:
         Component: truncated circle.
     """
     if outer_r < inner_r:
         raise ValueError("Outer radius must be larger than inner radius")
-    
+    max_error = arc_max_error(layer) if max_error is None else max_error
+
     if inner_r > y and outer_r > y:
         width = make_even_number(np.sqrt(outer_r**2 - y**2) - np.sqrt(inner_r**2 - y**2))
         outer_r = np.sqrt((width + np.sqrt(inner_r**2 - y**2))**2 + y**2)
@@ -35,15 +38,143 @@ def truncated_circle_poly(inner_r: float, outer_r: float, y: float, layer: Layer
 
     def create_polygon(r, theta, layer):
         phi = 2 * np.pi - theta
-        points = regular_polygon(0, 0, r, phi, start_angle=np.pi/2 + theta/2)
-        return gf.Component().add_polygon(points, layer=layer)
+        points = regular_polygon(0, 0, r, phi, start_angle=np.pi/2 + theta/2, max_error=max_error)
+        polygon = gf.Component()
+        polygon.add_polygon(points, layer=layer)
+        return polygon
 
     outer_polygon = create_polygon(outer_r, outer_theta, layer)
     inner_polygon = create_polygon(inner_r, inner_theta, layer)
 
     c = gf.boolean(outer_polygon, inner_polygon, operation="-", layer1=layer, layer2=layer, layer=layer)
 
-    c.flatten()
+    maybe_flatten(c)
+    return c
+
+def _clip_below(points: np.ndarray, y: float) -> np.ndarray:
+    """
+    Clip a convex counter-clockwise polygon to the half-plane below y. The result starts at
+    the left crossing of y and ends at the right one, so the edge along y is the closing edge.
+    """
+    below = points[:, 1] < y
+    if below.all():
+        return points
+    if not below.any():
+        return np.empty((0, 2))
+
+    nxt = np.roll(points, -1, axis=0)
+    crossing = below != np.roll(below, -1)
+    t = (y - points[crossing, 1]) / (nxt[crossing, 1] - points[crossing, 1])
+    cuts = points[crossing] + t[:, None] * (nxt[crossing] - points[crossing])
+
+    # vertices below y, each followed by the crossing of its outgoing edge (if any)
+    counts = below.astype(int) + crossing
+    out = np.repeat(points, counts, axis=0)
+    ends = np.cumsum(counts) - 1
+    out[ends[crossing]] = cuts
+
+    # start at the left crossing, where the polygon enters the half-plane
+    return np.roll(out, -ends[crossing & ~below][0], axis=0)
+
+def _unit_circle(radius: float, angle_resolution: float, max_error: float) -> np.ndarray:
+    if max_error is None:
+        num_points = int(360 / angle_resolution) + 1
+    else:
+        num_points = arc_num_points(radius, 2*np.pi, max_error, angle_resolution)
+    t = np.linspace(0, 2*np.pi, num_points)[:-1]
+    return np.column_stack((np.cos(t), np.sin(t)))
+
+def truncated_annulus(inner_r: float, outer_r: float, y: float, angle_resolution: float=2.5, max_error: float=None) -> gf.kdb.DPolygon:
+    """
+    Vertices of an annulus cut at y (everything above y is removed), computed directly from the
+    circle vertices of gf.components.circle with the same angle resolution.
+
+    Args:
+        inner_r [float]: inner radius, 0 for a full disk.
+        outer_r [float]: outer radius.
+        y [float]: y coordinate of the truncation line.
+        angle_resolution [float]: angle resolution in degrees.
+        max_error [float]: maximum chord error, with at most the points of angle_resolution.
+
+    Returns:
+        gf.kdb.DPolygon: truncated annulus, None if it is empty.
+    """
+    outer = _clip_below(outer_r * _unit_circle(outer_r, angle_resolution, max_error), y)
+    if outer.size == 0:
+        return None
+    if inner_r <= 0:
+        return gf.kdb.DPolygon([gf.kdb.DPoint(*p) for p in outer])
+
+    circle = _unit_circle(inner_r, angle_resolution, max_error)
+    inner = _clip_below(inner_r * circle, y)
+    if inner.size == 0:
+        return gf.kdb.DPolygon([gf.kdb.DPoint(*p) for p in outer])
+    if len(inner) == len(circle):
+        # the inner circle is fully below the cut and stays a hole
+        polygon = gf.kdb.DPolygon([gf.kdb.DPoint(*p) for p in outer])
+        polygon.insert_hole([gf.kdb.DPoint(*p) for p in inner])
+        return polygon
+
+    # both arcs run from the left crossing to the right one, walk back along the inner one
+    points = np.concatenate((outer, inner[::-1]))
+    return gf.kdb.DPolygon([gf.kdb.DPoint(*p) for p in points])
+
+def truncated_radii(inner_r: float, outer_r: float, y: float) -> Tuple[float, float, float]:
+    """
+    Correct the outer radius so that the width of the ring at the cut is an even number of
+    grid points, as done in truncated_circle_bool.
+
+    Returns:
+        Tuple[float, float, float]: inner radius, outer radius and the width at the cut (None if the ring is not cut)
+    """
+    width = None
+    if inner_r > y and outer_r > y:
+        width = make_even_number(np.sqrt(outer_r**2 - y**2) - np.sqrt(inner_r**2 - y**2))
+        rin_x = np.sqrt(inner_r**2 - y**2)
+        outer_r = np.sqrt((width + rin_x)**2 + y**2)
+    inner_r, outer_r = map(np.round, [inner_r, outer_r], [3, 3])
+    return inner_r, outer_r, width
+
+@gf.cell
+def truncated_circle_analytic(
+    inner_r: float,
+    outer_r: float,
+    y: float,
+    layer: LayerSpec,
+    port_prefix: str = None
+) -> gf.Component:
+    """
+    Same as truncated_circle_bool, but the truncated circle is computed as a single polygon
+    instead of with boolean operations, with the arc settings of the layer.
+
+    Args:
+        inner_r [float]: inner radius of the circle.
+        outer_r [float]: outer radius of the circle.
+        y [float]: y coordinate of the truncation point.
+        layer [LayerSpec]: layer of the circle.
+        port_prefix [str]: prefix of the ports.
+
+    Returns:
+        gf.Component: truncated circle.
+    """
+    if outer_r < inner_r:
+        raise ValueError("Outer radius must be larger than inner radius")
+    if outer_r <= 0:
+        raise ValueError("Outer radius should be >= 0")
+
+    c = gf.Component()
+
+    inner_r, outer_r, width = truncated_radii(inner_r, outer_r, y)
+    polygon = truncated_annulus(inner_r, outer_r, y, max_error=arc_max_error(layer))
+    if polygon is not None:
+        c.add_polygon(polygon, layer=layer)
+
+    if width is not None:
+        x_center = (np.sqrt(outer_r**2 - y**2) + np.sqrt(inner_r**2 - y**2)) / 2
+
+        c.add_port(name=f"{port_prefix}_p1", center=(x_center, y), width=width, orientation=90, layer=layer, port_type="electrical")
+        c.add_port(name=f"{port_prefix}_p2", center=(-x_center, y), width=width, orientation=90, layer=layer, port_type="electrical")
+
     return c
 
 @gf.cell
@@ -103,5 +234,5 @@ def truncated_circle_bool(
         c.add_port(name=f"{port_prefix}_p1", center=(x_center, y), width=width, orientation=90, layer=layer, port_type="electrical")
         c.add_port(name=f"{port_prefix}_p2", center=(-x_center, y), width=width, orientation=90, layer=layer, port_type="electrical")
 
-    c.flatten()
+    maybe_flatten(c)
     return c
\ No newline at end of file
@@ -1,3 +1,4 @@
+from .memo import XS_CACHE, memoize_cross_section
 from .pn import _pn
 from .heater import _heater
 
@@ -31,11 +32,25 @@ class MetalSpecs:
     pad_height: float = 75
     pad_spacing: float = 100
 
-import yaml
-import os
+from functools import cache
 from pathlib import Path
 
-with open(os.curdir / Path(r'specs/metal.yml'), 'r', encoding="utf-8") as f:
-    data = yaml.safe_load(f)
+import yaml
+
+from pylayout.cache import register_dependency
+
+# specs/metal.yml at the repository root, independent of the working directory
+metal_spec_path = Path(__file__).parents[2] / 'specs' / 'metal.yml'
+
+@cache
+def load_metal_spec(path: Path = metal_spec_path) -> MetalSpecs:
+    with open(path, 'r', encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    register_dependency(path)
+    return MetalSpecs(**data)
 
-MSpec = MetalSpecs(**data)
\ No newline at end of file
+def __getattr__(name: str):
+    # MSpec is only parsed when it is first used
+    if name == "MSpec":
+        return load_metal_spec()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
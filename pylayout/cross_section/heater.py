@@ -1,6 +1,9 @@
 from gdsfactory.typings import LayerSpec, LayerSpecs, Floats
 from gdsfactory.cross_section import Section, cross_section
 
+from .memo import memoize_cross_section
+
+@memoize_cross_section
 def _heater(
     width: float = 0.45,
     width_slab: float = 7.0,
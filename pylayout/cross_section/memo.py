@@ -0,0 +1,46 @@
+import json
+import os
+from functools import wraps
+
+from pylayout.cache import LRUCache, canonical
+
+# CrossSection objects are frozen, so one object is shared by every call with the same spec
+XS_CACHE = LRUCache(maxsize=int(os.environ.get("PYLAYOUT_XS_CACHE_SIZE", 256)))
+
+def _freeze(value):
+    # hashable key of an argument, with the type of the atoms so that e.g. LAYER.WG and (1, 0)
+    # give their own cross-section
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        # by content (e.g. arrays, whose repr is truncated), objects without a canonical form
+        # raise a TypeError instead of being keyed by their repr
+        return type(value).__name__, json.dumps(canonical(value), sort_keys=True)
+    return type(value).__name__, value
+
+def spec_key(func: callable, *args, **kwargs) -> tuple:
+    """
+    Key of a cross-section function call: the function and its arguments, order of the
+    keyword arguments excluded. Partials with the same arguments give the same key.
+    Unhashable arguments are keyed by their content (see pylayout.cache.canonical), and
+    raise a TypeError if they have none.
+    """
+    return f"{func.__module__}.{func.__qualname__}", _freeze(args), _freeze(kwargs)
+
+def memoize_cross_section(func: callable) -> callable:
+    """
+    Return the same CrossSection object for the same arguments instead of building it again,
+    e.g. for the cornerstone partials resolved by gf.get_cross_section in every cell.
+
+        >> @memoize_cross_section
+        >> def _pn(...) -> CrossSection:
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return XS_CACHE.get(spec_key(func, *args, **kwargs), lambda: func(*args, **kwargs))
+
+    return wrapper
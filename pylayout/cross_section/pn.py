@@ -1,6 +1,9 @@
 from gdsfactory.cross_section import cross_section, CrossSection
 from gdsfactory.cross_section import Section, LayerSpec, Floats, LayerSpecs
 
+from .memo import memoize_cross_section
+
+@memoize_cross_section
 def _pn(
     width: float = 0.45,
     layer: LayerSpec = "WG",
@@ -0,0 +1,141 @@
+"""
+Path extrusion. extrude_sections computes the offset outlines of every section of a
+cross-section at once, and the cell function extrude is named by the geometry of the path
+and the cross-section, so e.g. the ring of every gap of a sweep is only extruded once and
+shared as one cell. extrude_straight draws straight waveguides as one rectangle per section.
+"""
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.cross_section import CrossSection
+from gdsfactory.typings import Component, CrossSectionSpec
+
+def _batchable(xs) -> bool:
+    # constant width and offset sections without insets or simplification, anything else is
+    # left to gdsfactory
+    if not isinstance(xs, CrossSection) or xs.components_along_path:
+        return False
+    return all(
+        isinstance(sec.width, (int, float)) and isinstance(sec.offset, (int, float))
+        and sec.width_function is None and sec.offset_function is None
+        and (not sec.insets or tuple(sec.insets) == (0, 0)) and not sec.simplify
+        for sec in xs.sections
+    )
+
+def extrude_sections(path: gf.Path, cross_section: CrossSectionSpec) -> Component:
+    """
+    Same as path.extrude(cross_section), with the tangents and mitre factors of the path
+    computed once and the two edges of every section (cladding included) offset in one
+    NumPy operation. Cross-sections with
+    transitions, width/offset functions, insets, simplification or components along the
+    path fall back to path.extrude.
+
+    Args:
+        path [gf.Path]: path to be extruded
+        cross_section [CrossSectionSpec]: cross-section
+
+    Returns:
+        Component: extruded path
+    """
+    xs = gf.get_cross_section(cross_section)
+    if not _batchable(xs):
+        return path.extrude(xs)
+
+    c = gf.Component()
+    points = path.points
+    start_angle, end_angle = np.radians(path.start_angle), np.radians(path.end_angle)
+
+    # same offset curve as gf.Path._centerpoint_offset_curve: along the bisector of the
+    # segments, scaled by 1/sin of half the internal angle, and normal to the end angles
+    theta = np.arctan2(np.diff(points[:, 1]), np.diff(points[:, 0]))
+    theta = np.concatenate([theta[:1], theta, theta[-1:]])
+    theta_mid = (np.pi + theta[1:] + theta[:-1]) / 2
+    scale = 1 / np.sin((np.pi + theta[:-1] - theta[1:]) / 2)
+    direction = np.column_stack((np.cos(theta_mid), np.sin(theta_mid)))
+
+    sections = xs.sections
+    # (sections, 2) distances of the two edges, (sections, 2, points, 2) edges
+    distances = np.array([(sec.offset + sec.width / 2, sec.offset - sec.width / 2) for sec in sections])
+    d = distances[..., None] * scale
+    edges = points - d[..., None] * direction
+    edges[:, :, 0] = points[0] + d[..., :1] * (np.sin(start_angle), -np.cos(start_angle))
+    edges[:, :, -1] = points[-1] + d[..., -1:] * (np.sin(end_angle), -np.cos(end_angle))
+
+    if path.length() > 1e-3:
+        # float hulls as gdsfactory inserts them, so that the polygons (vertex order of
+        # closed paths included) are the same
+        outlines = np.concatenate((edges[:, 0], edges[:, 1, ::-1]), axis=1)
+        for sec, outline in zip(sections, outlines):
+            if not sec.hidden:
+                polygon = gf.kdb.DPolygon()
+                polygon.assign_hull(outline.tolist())
+                c.shapes(gf.get_layer(sec.layer)).insert(polygon)
+
+    for sec, (edge1, edge2) in zip(sections, edges):
+        for i, (name, port_type, orientation) in enumerate(
+            zip(sec.port_names, sec.port_types, ((path.start_angle + 180) % 360, path.end_angle % 360))
+        ):
+            if name is not None:
+                end = 0 if i == 0 else -1
+                c.add_port(
+                    name=name, layer=sec.layer, port_type=port_type, width=sec.width,
+                    orientation=orientation, center=(edge1[end] + edge2[end]) / 2, cross_section=xs,
+                )
+
+    c.info["length"] = float(np.round(path.length(), 3))
+    return c
+
+@gf.cell(check_ports=False)
+def extrude(path: gf.Path, cross_section: CrossSectionSpec) -> Component:
+    """
+    Same as path.extrude(cross_section) (see extrude_sections), as a cell named by the
+    geometry hash of the path and the cross-section.
+
+    Args:
+        path [gf.Path]: path to be extruded
+        cross_section [CrossSectionSpec]: cross-section
+
+    Returns:
+        Component: extruded path
+    """
+    return extrude_sections(path, cross_section)
+
+def _straight(length: float, xs: CrossSection) -> Component:
+    c = gf.Component()
+    # same outlines and ports as extrude_sections on gf.path.straight(length)
+    if length > 1e-3:
+        for sec in xs.sections:
+            if not sec.hidden:
+                y1, y2 = -(sec.offset + sec.width / 2), -(sec.offset - sec.width / 2)
+                polygon = gf.kdb.DPolygon()
+                polygon.assign_hull([(0, y1), (length, y1), (length, y2), (0, y2)])
+                c.shapes(gf.get_layer(sec.layer)).insert(polygon)
+
+    for sec in xs.sections:
+        for name, port_type, x, orientation in zip(sec.port_names, sec.port_types, (0, length), (180, 0)):
+            if name is not None:
+                c.add_port(
+                    name=name, layer=sec.layer, port_type=port_type, width=sec.width,
+                    orientation=orientation, center=(x, -sec.offset), cross_section=xs,
+                )
+
+    c.info["length"] = float(np.round(length, 3))
+    return c
+
+@gf.cell(check_ports=False)
+def extrude_straight(length: float, cross_section: CrossSectionSpec) -> Component:
+    """
+    Same as gf.path.straight(length).extrude(cross_section), drawn as one rectangle per
+    section without building the path, as a cell named by the length and the cross-section.
+
+    Args:
+        length [float]: length of the waveguide
+        cross_section [CrossSectionSpec]: cross-section
+
+    Returns:
+        Component: straight waveguide
+    """
+    xs = gf.get_cross_section(cross_section)
+    if not _batchable(xs):
+        return extrude_sections(gf.path.straight(length=length), xs)
+    return _straight(float(length), xs)
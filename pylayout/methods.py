@@ -1,10 +1,14 @@
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 import numpy as np
 import gdsfactory as gf
 from gdsfactory.technology import LayerLevel
 from gdsfactory.typings import List, Union
 
+from pylayout.serialization import component_from_dict, component_to_dict
+
 def micro(val: float) -> float:
     return val*1e+3
 
@@ -29,8 +33,14 @@ def find_outer_and_inner_r(rout: float, rin: float, y: float) -> Union[float, fl
         rout = np.round(np.sqrt((width + rin_x)**2 + y**2), 3)
     return rout, rin
 
+def _build_serialized(func: callable, spec: dict) -> dict:
+    # runs inside the worker process, only picklable data goes back to the parent
+    return component_to_dict(gf.get_component(func(**spec)))
+
 def gen_objects(
     func: callable,
+    *,
+    processes: int = None,
     **specs: dict,
 ) -> List[gf.Component]:
     """
@@ -38,11 +48,11 @@ def gen_objects(
 
     Args:
         func [callable]: callable: function to be called
-        number [int]: int: number of objects to be generated
+        processes [int]: int: number of worker processes. None or 1 builds the objects serially in this process. Otherwise the specifications are built across a process pool and the geometry is sent back as OASIS bytes, so func and the specifications have to be picklable (module level functions or partials of them).
         specs [dict]: dict: specifications for the objects. The specifications should be a dictionary with the keys as the arguments of the function and the values can be a list or  a single value. If it is a value, the value will be applied to all the objects. If it is a list, the values will be applied to the objects in the order of the list.
 
     Returns:
-        List[gf.Component]: list of generated objects
+        List[gf.Component]: list of generated objects, in the same order as the specifications
 
     Example:
         >> obj_list = Methods.gen_objects(
@@ -50,7 +60,8 @@ def gen_objects(
         >>    gap=gap,
         >>    dx=5,
         >>    dy=5,
-        >>    cross_section=cs
+        >>    cross_section=cs,
+        >>    processes=8,
         >> )
     """
     # error checking if all lists have the same length
@@ -64,15 +75,74 @@ def gen_objects(
         for i in range(max_len)
     ]
 
-    objects = [func(**spec) for spec in specs_list]
+    if processes is None or processes <= 1 or max_len <= 1:
+        objects = [func(**spec) for spec in specs_list]
+        return objects
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        chunksize = max(1, max_len // (4 * processes))
+        results = list(executor.map(_build_serialized, repeat(func), specs_list, chunksize=chunksize))
+
+    # a cell of this process with the same name is only reused if it has the same content (e.g.
+    # the same spec built twice), otherwise the result gets a new name
+    objects = [component_from_dict(data, name=data["name"]) for data in results]
     return objects
 
+def _sizing_pairs(layer_from, layer_to) -> List:
+    if isinstance(layer_from, list) != isinstance(layer_to, list):
+        raise ValueError("layer_from and layer_to should both be a layer or both be a list of layers")
+    if not isinstance(layer_from, list):
+        return [(layer_from, layer_to)]
+    if len(layer_from) != len(layer_to):
+        raise ValueError("layer_from and layer_to should have the same length")
+    return list(zip(layer_from, layer_to))
+
+def _tiled_sizing(com: gf.Component, layer: int, sizes: List[float], threads: int, tile_size: float) -> gf.kdb.Region:
+    dbu = com.kcl.dbu
+    tp = gf.kdb.TilingProcessor()
+    tp.input("a", com.begin_shapes_rec(layer))
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    # the border has to hold everything that can grow into a tile
+    border = sum(abs(size) for size in sizes) * dbu
+    tp.tile_border(border, border)
+    tp.threads = threads
+
+    region = gf.kdb.Region()
+    tp.output("o", region)
+    tp.var("d1", sizes[0])
+    tp.var("d2", sizes[1])
+    tp.queue("_output(o, a.sized(d1).sized(d2))")
+    tp.execute("offsetting")
+    return region.merged()
+
+def _own_hierarchy(com: gf.Component, suffix: str) -> None:
+    # the child cells are shared (and locked) library cells: com is pointed to variants of
+    # them, named after the cell and the suffix, so that they can be modified in place
+    layout = com.kcl.layout
+    variants = {}
+    for ci in com._kdb_cell.called_cells():
+        cell = layout.cell(ci)
+        variant = gf.Component(name=layout.unique_cell_name(f"{cell.name}_{suffix}"))
+        variant._kdb_cell.copy_shapes(cell)
+        variant._kdb_cell.copy_instances(cell)
+        variant.add_ports(gf.kcl[ci].ports)
+        variant.info.update(dict(gf.kcl[ci].info))
+        variants[ci] = variant.cell_index()
+
+    for cell in [com._kdb_cell, *map(layout.cell, variants.values())]:
+        for inst in list(cell.each_inst()):
+            inst.cell_index = variants[inst.cell_index]
+
 def offsetting(
         com: gf.Component,
-        layer_from: LayerLevel,
-        layer_to: LayerLevel,
+        layer_from: LayerLevel | List[LayerLevel],
+        layer_to: LayerLevel | List[LayerLevel],
         offset: float=5,
-        dilation: float=0
+        dilation: float=0,
+        deep: bool=False,
+        threads: int=None,
+        tile_size: float=1000,
     ) -> gf.Component:
     """
     Generate an offset between two layers. This should always be called after a complete construction
@@ -80,17 +150,46 @@ def offsetting(
 
     Args:
         com [gf.Component]: gf.Component: component to be offset
-        layer_from [LayerLevel]: LayerLevel: layer to be offset from
-        layer_to [LayerLevel]: LayerLevel: layer to be offset to
+        layer_from [LayerLevel]: LayerLevel: layer to be offset from, or a list of layers
+        layer_to [LayerLevel]: LayerLevel: layer to be offset to, or a list of layers paired with layer_from
         offset [float]: float: offset value in um
-    """
-    polygons = com.get_polygons()[layer_from]
+        dilation [float]: float: extra sizing in database units
+        deep [bool]: bool: size the cell hierarchy with KLayout deep regions instead of flattening it. Each unique cell is sized once and the result is written back per cell. The child cells of com are replaced by variants named <cell>_offset<offset>_<dilation>, so the (shared) library cells are left unchanged.
+        threads [int]: int: number of threads. In flat mode the component is processed in tiles of tile_size.
+        tile_size [float]: float: tile size in um for the multithreaded flat mode
 
-    # for polygon in polygons:
-    region = gf.kdb.Region(polygons)
-    region = region.sized(offset*1E+03 + dilation)
-    region = region.sized(dilation)
-    com.add_polygon(region, layer=layer_to)
+    Returns:
+        gf.Component: com with the offset layers
+    """
+    sizes = [offset*1E+03 + dilation, dilation]
+    pairs = [(gf.get_layer(lf), gf.get_layer(lt)) for lf, lt in _sizing_pairs(layer_from, layer_to)]
+
+    if deep:
+        _own_hierarchy(com, f"offset{offset:g}_{dilation:g}".replace(".", "p").replace("-", "m"))
+        dss = gf.kdb.DeepShapeStore()
+        if threads:
+            dss.threads = threads
+        regions = {}
+        for lf, lt in pairs:
+            if lf not in regions:
+                regions[lf] = gf.kdb.Region(com.begin_shapes_rec(lf), dss)
+            region = regions[lf].sized(sizes[0]).sized(sizes[1])
+            # written back into the cells of com (variants are added where the result depends
+            # on the context of a cell)
+            region.insert_into(com.kcl.layout, com.cell_index(), lt)
+        return com
+
+    for lf, lt in pairs:
+        if threads:
+            region = _tiled_sizing(com, lf, sizes, threads, tile_size)
+        else:
+            polygons = com.get_polygons()[lf]
+
+            # for polygon in polygons:
+            region = gf.kdb.Region(polygons)
+            region = region.sized(sizes[0])
+            region = region.sized(sizes[1])
+        com.add_polygon(region, layer=lt)
 
     return com
 
@@ -0,0 +1,104 @@
+"""
+Path builder for long chains of segments. gf.Path.append concatenates the whole point array
+for every segment, so a path of n segments costs O(n^2); PathBuilder copies each segment into
+a growing buffer and materializes the gf.Path once.
+
+    >> builder = PathBuilder()
+    >> builder += gf.path.straight(length=100)
+    >> for _ in range(no_of_rings):
+    >>     builder += bend
+    >> path = builder.path()
+"""
+from math import cos, pi, sin
+
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.typings import Tuple
+
+class PathBuilder:
+    """
+    Append segments like gf.Path.append (rotated to continue from the end angle and
+    translated to the last point) into a preallocated buffer that doubles when it is full.
+    path() gives the same points and angles as appending the segments to gf.Path().
+
+    Args:
+        capacity [int]: number of points allocated up front
+        start [Tuple[float, float]]: first point, e.g. the end of the previous part of a path
+        start_angle [float]: direction at the first point in degrees
+    """
+    def __init__(self, capacity: int = 1024, start: Tuple[float, float] = (0, 0), start_angle: float = 0):
+        self._points = np.zeros((max(capacity, 1), 2), dtype=np.float64)
+        self._points[0] = start
+        self._n = 1
+        self.start_angle = self.end_angle = start_angle
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iadd__(self, path) -> "PathBuilder":
+        return self.append(path)
+
+    @property
+    def points(self) -> np.ndarray:
+        """
+        Points appended so far (a view on the buffer).
+        """
+        return self._points[:self._n]
+
+    @property
+    def dsize(self) -> np.ndarray:
+        """
+        Size of the bounding box of the points, as gf.Path.dsize.
+        """
+        points = self.points
+        return points.max(axis=0) - points.min(axis=0)
+
+    def _reserve(self, n: int) -> None:
+        if self._n + n > len(self._points):
+            points = np.zeros((max(2 * len(self._points), self._n + n), 2), dtype=np.float64)
+            points[:self._n] = self._points[:self._n]
+            self._points = points
+
+    def append(self, path) -> "PathBuilder":
+        """
+        Append a segment.
+
+        Args:
+            path [gf.Path]: gf.Path, array-like[N][2] or a list of these
+
+        Returns:
+            PathBuilder: self
+        """
+        if isinstance(path, (list, tuple)) and not (path and np.ndim(path[0]) == 1):
+            for p in path:
+                self.append(p)
+            return self
+        if not isinstance(path, gf.Path):
+            path = gf.Path(path)
+
+        # same operations as gf.Path.append (and _rotate_points) so that the points are identical
+        points, origin = path.points, np.zeros(2)
+        angle = self.end_angle - path.start_angle
+        if angle != 0:
+            angle = angle * pi / 180
+            points = (points - origin) * cos(angle) + (points - origin)[:, ::-1] * np.array((-sin(angle), sin(angle))) + origin
+        points = points + (self._points[self._n - 1] - points[0])
+        self.end_angle = np.mod(path.end_angle + self.end_angle - path.start_angle, 360)
+
+        self._reserve(len(points) - 1)
+        self._points[self._n:self._n + len(points) - 1] = points[1:]
+        self._n += len(points) - 1
+        return self
+
+    def path(self) -> gf.Path:
+        """
+        Materialize the gf.Path.
+
+        Returns:
+            gf.Path: path of the appended segments
+        """
+        path = gf.Path()
+        path.points = self.points.copy()
+        path.start_angle, path.end_angle = self.start_angle, self.end_angle
+        return path
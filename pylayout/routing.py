@@ -3,6 +3,9 @@ import numpy as np
 import gdsfactory as gf
 from gdsfactory.typings import List, Component, CrossSectionSpec, Port
 
+from pylayout.cache import disk_cache
+from pylayout.build import maybe_flatten
+
 def strategy1(
     c: Component,
     start_x: float,
@@ -94,6 +97,7 @@ def strategy2(
 
 
 @gf.cell
+@disk_cache
 def route_pads_to_ring(
     ring: Component,
     pads: Component,
@@ -143,6 +147,6 @@ def route_pads_to_ring(
     c.add_port("o1", port=ring.ports["o1"])
     c.add_port("o2", port=ring.ports["o2"])
 
-    c.flatten()
+    maybe_flatten(c)
 
     return c
\ No newline at end of file
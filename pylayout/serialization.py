@@ -0,0 +1,182 @@
+import hashlib
+
+import gdsfactory as gf
+from gdsfactory.typings import Component, Dict, List
+
+def _layer_tuple(layer_index: int) -> tuple[int, int]:
+    info = gf.kcl.get_info(layer_index)
+    return info.layer, info.datatype
+
+def ports_to_dicts(c: Component) -> List[Dict]:
+    """
+    Ports of a component as JSON serialisable dictionaries.
+    """
+    return [
+        {
+            "name": port.name,
+            "center": tuple(port.dcenter),
+            "width": port.dwidth,
+            "orientation": port.orientation,
+            "layer": _layer_tuple(port.layer),
+            "port_type": port.port_type,
+        }
+        for port in c.ports
+    ]
+
+def _ports(ports: List[Dict]) -> List[Dict]:
+    # the stored ports as ports_to_dicts gives them (JSON turns the tuples into lists)
+    return [dict(port, center=tuple(port["center"]), layer=tuple(port["layer"])) for port in ports]
+
+def _add_ports(c: Component, ports: List[Dict]) -> None:
+    for port in _ports(ports):
+        c.add_port(**port)
+
+def _digest(layout: gf.kdb.Layout, cell: gf.kdb.Cell, digests: Dict[int, str]) -> str:
+    # independent of the representation: the shapes and instances are sorted and arrays are
+    # expanded, since OASIS may store them in another order and join placements into arrays
+    if cell.cell_index() in digests:
+        return digests[cell.cell_index()]
+    h = hashlib.sha256()
+    layers = {(layout.get_info(li).layer, layout.get_info(li).datatype): li for li in layout.layer_indexes()}
+    for layer, layer_index in sorted(layers.items()):
+        shapes = cell.shapes(layer_index)
+        if shapes.is_empty():
+            continue
+        h.update(str(layer).encode())
+        # merged, since OASIS has no holes and splits the polygons with holes
+        for value in sorted(polygon.hash() for polygon in gf.kdb.Region(shapes).merged().each()):
+            h.update(value.to_bytes(8, "big", signed=value < 0))
+        for text in sorted(str(shape.text) for shape in shapes.each(gf.kdb.Shapes.STexts)):
+            h.update(text.encode())
+    placements = []
+    for inst in cell.each_inst():
+        child = _digest(layout, layout.cell(inst.cell_index), digests)
+        placements += [f"{child} {trans}" for trans in inst.cell_inst.each_cplx_trans()]
+    for placement in sorted(placements):
+        h.update(placement.encode())
+    digests[cell.cell_index()] = h.hexdigest()
+    return digests[cell.cell_index()]
+
+def geometry_hash(c: Component) -> str:
+    """
+    Hash of the geometry of a component and its children, independent of the cell names, the
+    order and split of the shapes and how the placements are grouped into arrays. A component read
+    back with component_from_dict has the same hash.
+
+    Args:
+        c [Component]: component
+
+    Returns:
+        str: hex digest
+    """
+    return _digest(c.kcl.layout, c._kdb_cell, {})
+
+def component_to_dict(c: Component) -> Dict:
+    """
+    Serialise a component into a picklable dictionary. The cell and its children are stored
+    as OASIS bytes, and the ports/info of every cell are stored next to it, so the component
+    can be rebuilt with its hierarchy in another process or read back from disk.
+
+    Args:
+        c [Component]: component to be serialised
+
+    Returns:
+        Dict: dictionary with the keys "name", "oas", "ports", "info", "polygons" (polygons with holes) and "cells" (the same for the children by name)
+    """
+    # a copy of the tree, without the polygons with holes: OASIS has none, and the writer
+    # would split them along rounded cut lines, so they are stored exactly next to it
+    layout = gf.kdb.Layout()
+    layout.dbu = c.kcl.dbu
+    top = layout.create_cell(c.name)
+    top.copy_tree(c._kdb_cell)
+
+    def polygons_with_holes(cell: gf.kdb.Cell) -> List:
+        polygons = []
+        for layer_index in layout.layer_indexes():
+            shapes = [shape for shape in cell.shapes(layer_index).each(gf.kdb.Shapes.SPolygons) if shape.polygon.holes()]
+            info = layout.get_info(layer_index)
+            polygons += [(info.layer, info.datatype, str(shape.polygon)) for shape in shapes]
+            for shape in shapes:
+                cell.shapes(layer_index).erase(shape)
+        return polygons
+
+    cells = {}
+    for ci in top.called_cells():
+        child = gf.kcl[c.kcl.layout.cell_by_name(layout.cell_name(ci))]
+        cells[child.name] = {"ports": ports_to_dicts(child), "info": dict(child.info), "polygons": polygons_with_holes(layout.cell(ci))}
+
+    options = gf.kdb.SaveLayoutOptions()
+    options.format = "OASIS"
+    options.oasis_compression_level = 2
+    return {
+        "name": c.name,
+        "oas": layout.write_bytes(options),
+        "ports": ports_to_dicts(c),
+        "info": dict(c.info),
+        "polygons": polygons_with_holes(top),
+        "cells": cells,
+    }
+
+def _unique_name(name: str) -> str:
+    i = 1
+    while gf.kcl.layout.has_cell(f"{name}${i}"):
+        i += 1
+    return f"{name}${i}"
+
+def component_from_dict(data: Dict, name: str = None) -> Component:
+    """
+    Rebuild a component from the dictionary created by component_to_dict, with its hierarchy.
+    Cells of the current layout with the name, geometry and ports of a stored cell are reused
+    (e.g. shared library cells), the other cells are created, under a new name if theirs is taken
+    by a cell with other content. The children are locked like the cells built by gf.cell.
+
+    Args:
+        data [Dict]: serialised component
+        name [str]: name of the new component, left unnamed if not given
+
+    Returns:
+        Component: rebuilt component with the same ports and info
+    """
+    layout = gf.kdb.Layout()
+    layout.read_bytes(data["oas"])
+    top = layout.cell(data["name"]) or layout.top_cell()
+    cells = data.get("cells", {})
+    for cell in [top, *map(layout.cell, top.called_cells())]:
+        stored = data if cell.cell_index() == top.cell_index() else cells.get(cell.name, {})
+        for layer, datatype, polygon in stored.get("polygons", []):
+            cell.shapes(layout.layer(layer, datatype)).insert(gf.kdb.Polygon.from_s(polygon))
+    layers = {li: gf.kcl.layout.layer(layout.get_info(li).layer, layout.get_info(li).datatype) for li in layout.layer_indexes()}
+
+    tree = {top.cell_index(), *top.called_cells()}
+    # stored cell index -> cell index in the current layout
+    mapping, digests, current = {}, {}, {}
+    for ci in layout.each_cell_bottom_up():
+        if ci not in tree:
+            continue
+        cell = layout.cell(ci)
+        cell_name = name if ci == top.cell_index() else cell.name
+        stored = data if ci == top.cell_index() else cells.get(cell.name, {})
+        if cell_name is not None and gf.kcl.layout.has_cell(cell_name):
+            existing = gf.kcl.layout.cell(cell_name)
+            if (
+                _digest(layout, cell, digests) == _digest(gf.kcl.layout, existing, current)
+                and ports_to_dicts(gf.kcl[existing.cell_index()]) == _ports(stored.get("ports", []))
+            ):
+                mapping[ci] = existing.cell_index()
+                continue
+            cell_name = _unique_name(cell_name)
+
+        c = gf.Component(name=cell_name) if cell_name else gf.Component()
+        for layer_index, shapes in layers.items():
+            c.shapes(shapes).insert(cell.shapes(layer_index))
+        for inst in cell.each_inst():
+            placement = inst.cell_inst.dup()
+            placement.cell_index = mapping[inst.cell_index]
+            c._kdb_cell.insert(placement)
+        _add_ports(c, stored.get("ports", []))
+        c.info.update(stored.get("info", {}))
+        if ci != top.cell_index():
+            c._locked = True
+        mapping[ci] = c.cell_index()
+
+    return gf.kcl[mapping[top.cell_index()]]
@@ -0,0 +1,233 @@
+"""
+Streaming layout writer for die level assemblies. Sub-assemblies are written to an open GDS
+stream as soon as they are placed and are then deleted from the layout, so the memory of a
+die build does not grow with the number of structures. The top cell is written last.
+
+    >> with StreamWriter("die.gds", top="DIE") as sink:
+    >>     for gap in gaps:
+    >>         c = integrate_all_structures(gap=gap, ...)
+    >>         sink.place(c, (0, sink.dbbox().bottom - spacing - c.dymax))
+"""
+import os
+from pathlib import Path
+
+import gdsfactory as gf
+from gdsfactory.typings import Component, Dict, List, Tuple, Union
+
+from pylayout.array import regular_arrays
+
+# GDSII record types
+_BGNSTR = 0x05
+_STRNAME = 0x06
+_ENDSTR = 0x07
+_ENDLIB = 0x04
+
+def _records(data: bytes):
+    i = 0
+    while i < len(data):
+        length = int.from_bytes(data[i:i + 2], "big")
+        if length == 0: # padding at the end of the stream
+            break
+        yield data[i + 2], data[i:i + length]
+        i += length
+
+def _split_library(data: bytes) -> Tuple[bytes, List[Tuple[str, bytes]]]:
+    """
+    Split a GDS stream into its header (up to the first structure) and its structures.
+    """
+    header, structures, current, name = [], [], None, None
+    for rtype, record in _records(data):
+        if rtype == _BGNSTR:
+            current = [record]
+        elif current is None:
+            if rtype != _ENDLIB:
+                header.append(record)
+        else:
+            current.append(record)
+            if rtype == _STRNAME:
+                name = record[4:].rstrip(b"\0").decode()
+            elif rtype == _ENDSTR:
+                structures.append((name, b"".join(current)))
+                current = None
+    return b"".join(header), structures
+
+class StreamWriter:
+    """
+    Write a top cell to GDS while it is being assembled, see the module docstring.
+    Layout files ending with .oas are streamed to a temporary GDS first and converted
+    to OASIS when the writer is closed.
+
+    Args:
+        filepath [Path]: output file (.gds or .oas)
+        top [str]: name of the top cell
+    """
+    def __init__(self, filepath: Union[Path, str], top: str = "TOP"):
+        self.filepath = Path(filepath)
+        self.top = top
+        self._gds_path = self.filepath.with_suffix(".gds.tmp") if self.filepath.suffix == ".oas" else self.filepath
+        self._file = open(self._gds_path, "wb")
+        self._header_written = False
+        self._written: set[str] = set()
+        # cells written under each name, to tell a cell placed again from a new cell reusing
+        # the name of a released one
+        self._cells: Dict[str, gf.kdb.Cell] = {}
+        self._placements: List[Tuple[str, gf.kdb.DCplxTrans]] = []
+        self._bbox = gf.kdb.DBox()
+        self._dbu = gf.kcl.dbu
+
+    def __enter__(self) -> "StreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def dbbox(self) -> gf.kdb.DBox:
+        """
+        Bounding box of everything placed so far, in um.
+        """
+        return gf.kdb.DBox(self._bbox)
+
+    def _emit(self, data: bytes) -> None:
+        header, structures = _split_library(data)
+        if not self._header_written:
+            self._file.write(header)
+            self._header_written = True
+        for name, structure in structures:
+            if name not in self._written:
+                self._file.write(structure)
+                self._written.add(name)
+
+    def _rename_clashes(self, cell: gf.kdb.Cell) -> None:
+        # cached cells keep their name when they are rebuilt after a release, so a known name
+        # means the same content. Anonymous cells may reuse a released name and are renamed,
+        # unless they are the written cell itself (placed again without a release).
+        for ci in [cell.cell_index(), *cell.called_cells()]:
+            kcell = gf.kcl[ci]
+            written = self._cells.get(kcell.name)
+            if kcell.name not in self._written or kcell._locked or (written is not None and not written.destroyed() and written.cell_index() == ci):
+                continue
+            name, i = kcell.name, len(self._written)
+            while f"{name}${i}" in self._written or kcell.kcl.layout.has_cell(f"{name}${i}"):
+                i += 1
+            kcell.name = f"{name}${i}"
+
+    def write(self, c: Component) -> None:
+        """
+        Write a component and every cell below it that has not been written yet.
+        """
+        self._rename_clashes(c._kdb_cell)
+        options = gf.kdb.SaveLayoutOptions()
+        options.format = "GDS2"
+        options.write_context_info = False
+        options.clear_cells()
+        options.add_cell(c.cell_index())
+        self._emit(c.kcl.layout.write_bytes(options))
+        for ci in [c.cell_index(), *c._kdb_cell.called_cells()]:
+            self._cells.setdefault(c.kcl.layout.cell_name(ci), c.kcl.layout.cell(ci))
+
+    def release(self, c: Component, keep: List[Component] = ()) -> None:
+        """
+        Delete a written component and the cells below it that nothing else uses anymore.
+        Cached cells are rebuilt by their cell functions if they are requested again.
+
+        Args:
+            c [Component]: component to be deleted
+            keep [List[Component]]: components (with their children) that must stay in the layout
+        """
+        layout = c.kcl.layout
+        root = c.cell_index()
+        protected = set()
+        for k in keep:
+            protected.add(k.cell_index())
+            protected.update(k._kdb_cell.called_cells())
+
+        subtree = set(c._kdb_cell.called_cells())
+        deletable = {root}
+        for ci in layout.each_cell_top_down():
+            if ci not in subtree or ci in protected:
+                continue
+            if all(parent in deletable for parent in layout.cell(ci).each_parent_cell()):
+                deletable.add(ci)
+        c.kcl.delete_cells(list(deletable))
+
+    def place(
+        self,
+        c: Component,
+        origin: Tuple[float, float] = (0, 0),
+        rotation: float = 0,
+        mirror: bool = False,
+        release: bool = True,
+    ) -> gf.kdb.DBox:
+        """
+        Place a component in the top cell. It is written immediately and, unless release is
+        False, deleted from the layout afterwards, so it must not be used after this call.
+
+        Args:
+            c [Component]: component to be placed
+            origin [Tuple[float, float]]: position of the component origin in um
+            rotation [float]: rotation in degrees
+            mirror [bool]: mirror at the x axis before rotating
+            release [bool]: delete the component after writing it (keep it e.g. for markers placed many times)
+
+        Returns:
+            gf.kdb.DBox: bounding box of the placed component
+        """
+        trans = gf.kdb.DCplxTrans(1, rotation, mirror, *origin)
+        bbox = c.dbbox().transformed(trans)
+        self._bbox += bbox
+
+        # an anonymous cell reusing the name of a released one is renamed before it is
+        # looked up, otherwise the placement would point to the released structure
+        self._rename_clashes(c._kdb_cell)
+        if c.name not in self._written:
+            self.write(c)
+        self._placements.append((c.name, trans))
+        if release:
+            self.release(c)
+        return bbox
+
+    def close(self) -> None:
+        """
+        Write the top cell, finish the stream and convert it to OASIS if needed.
+        """
+        if self._file.closed:
+            return
+
+        # the placed cells are empty placeholders here, their structures are already written
+        layout = gf.kdb.Layout()
+        layout.dbu = self._dbu
+        top = layout.create_cell(self.top)
+        # placements of the same cell with the same orientation become cell arrays where they
+        # are regular (e.g. the marker columns)
+        groups: Dict[tuple, list] = {}
+        for name, trans in self._placements:
+            itrans = trans.to_itrans(self._dbu)
+            key = (name, itrans.angle, itrans.is_mirror(), itrans.mag)
+            groups.setdefault(key, []).append((itrans.disp.x, itrans.disp.y))
+
+        cells: Dict[str, int] = {}
+        for (name, angle, mirror, mag), positions in groups.items():
+            if name not in cells:
+                cells[name] = layout.create_cell(name).cell_index()
+            for origin, a, b, na, nb in regular_arrays(positions):
+                trans = gf.kdb.ICplxTrans(mag, angle, mirror, *origin)
+                if na * nb == 1:
+                    top.insert(gf.kdb.CellInstArray(cells[name], trans))
+                else:
+                    top.insert(gf.kdb.CellInstArray(cells[name], trans, gf.kdb.Vector(*a), gf.kdb.Vector(*b), na, nb))
+
+        options = gf.kdb.SaveLayoutOptions()
+        options.format = "GDS2"
+        options.write_context_info = False
+        self._emit(layout.write_bytes(options))
+        self._file.write(b"\x00\x04\x04\x00") # ENDLIB
+        self._file.close()
+
+        if self._gds_path != self.filepath:
+            layout = gf.kdb.Layout()
+            layout.read(str(self._gds_path))
+            layout.write(str(self.filepath))
+            os.remove(self._gds_path)